@@ -0,0 +1,138 @@
+# benchmarks/render_fps.py
+
+"""
+Mede os quadros por segundo dos gráficos em cada backend de desenho.
+
+Cenários:
+  - ao vivo: MultiPanelCanvas com vários sensores recebendo um bloco por quadro;
+  - comparação: um PlotWidget com várias voltas densas sob o LodController.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/render_fps.py [--backend all|raster|opengl|software_gl]
+                                    [--panels 16] [--laps 20] [--points 50000] [--frames 200]
+
+Em uma máquina sem servidor gráfico, o OpenGL por software precisa de um
+display virtual (por exemplo, xvfb-run); sem ele, o modo OpenGL cai para o
+raster e o resultado é informado como tal.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.render_backend import (  # noqa: E402
+    RENDER_RASTER, RENDER_OPENGL, RENDER_BACKENDS, prepare_render_backend, resolve_render_backend,
+    apply_render_backend
+)
+
+
+def measure_fps(view, frame, frames):
+    """
+    Executa `frame()` e redesenha a view `frames` vezes; retorna os quadros por segundo.
+    """
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame()
+        view.viewport().repaint()
+    return frames / (time.perf_counter() - start)
+
+
+def close_view(view):
+    """
+    Fecha a view e a destrói já, com o contexto OpenGL ainda válido, em vez de
+    deixá-la para o coletor de lixo na saída do interpretador.
+    """
+    from PySide6.QtCore import QCoreApplication, QEvent
+
+    view.close()
+    view.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def live_scenario(backend, panels, frames):
+    from gui.multi_panel_canvas import MultiPanelCanvas
+
+    canvas = MultiPanelCanvas()
+    apply_render_backend(canvas, backend)
+    canvas.resize(1600, 1000)
+    canvas.show()
+    plots = canvas.set_sensors([f"Sensor {index}" for index in range(panels)])
+    block = np.arange(100) / 1000.0
+    state = {"t": 0.0}
+
+    def frame():
+        # 100 amostras por sensor a cada quadro (1 kHz a 10 quadros/s de dados)
+        t = state["t"] + block
+        for index, plot in enumerate(plots.values()):
+            plot.add_data_points(t, np.sin(t + index))
+        state["t"] = t[-1] + block[1]
+
+    fps = measure_fps(canvas, frame, frames)
+    close_view(canvas)
+    return fps
+
+
+def comparison_scenario(backend, laps, points, frames):
+    import pyqtgraph as pg
+    from gui.lod_controller import LodController
+
+    plot_widget = pg.PlotWidget()
+    apply_render_backend(plot_widget, backend)
+    plot_widget.resize(1600, 800)
+    plot_widget.show()
+    lod = LodController(plot_widget)
+    x = np.linspace(0, 90, points)
+    for lap in range(laps):
+        curve = plot_widget.plot(x, np.sin(x * (1 + lap / 50)) + lap * 0.1, pen=pg.intColor(lap, laps))
+        curve.x_data, curve.y_data = x, curve.yData
+        lod.add_curve(curve)
+    view_box = plot_widget.getViewBox()
+    state = {"offset": 0.0}
+
+    def frame():
+        # Pan contínuo, como ao arrastar o gráfico
+        state["offset"] = (state["offset"] + 0.5) % 60
+        view_box.setXRange(state["offset"], state["offset"] + 30, padding=0)
+
+    fps = measure_fps(plot_widget, frame, frames)
+    close_view(plot_widget)
+    return fps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="all", choices=("all",) + RENDER_BACKENDS)
+    parser.add_argument("--panels", type=int, default=16)
+    parser.add_argument("--laps", type=int, default=20)
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    backends = [RENDER_RASTER, RENDER_OPENGL] if args.backend == "all" else [args.backend]
+    # Os atributos de OpenGL valem para toda a aplicação e precisam vir antes dela
+    prepared = prepare_render_backend(backends[-1])
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    print(f"Plataforma Qt: {app.platformName()}")
+    for requested in backends:
+        backend = resolve_render_backend(prepared if requested != RENDER_RASTER else requested)
+        label = requested if backend == requested else f"{requested} -> {backend}"
+        live_fps = live_scenario(backend, args.panels, args.frames)
+        comparison_fps = comparison_scenario(backend, args.laps, args.points, args.frames)
+        print(f"[{label}] ao vivo ({args.panels} sensores): {live_fps:.1f} FPS | "
+              f"comparação ({args.laps} voltas x {args.points} pontos): {comparison_fps:.1f} FPS")
+
+    # Encerra a QApplication explicitamente, antes da coleta de lixo da saída
+    app.shutdown()
+    del app
+
+
+if __name__ == "__main__":
+    main()
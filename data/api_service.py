@@ -2,15 +2,124 @@ from PySide6.QtCore import QObject, QThread, Signal
 import requests
 import time
 import json
+import numpy as np
+
+from data.sample_block import SampleBlock, parse_batch_payload, RECEIVED_AT_KEY
+
+def parse_stream_line(line):
+    """
+    Parse one line of a newline-delimited JSON or server-sent events stream.
+    Returns the decoded payload, or None for blank lines, SSE comments and
+    non-data SSE fields.
+    """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    line = line.strip()
+    if not line or line.startswith(":"):
+        return None
+    if line.startswith("data:"):
+        line = line[len("data:"):].strip()
+    elif line.split(":", 1)[0] in ("event", "id", "retry"):
+        return None
+    return json.loads(line)
+
+class StructDecoder:
+    """
+    Decode a body made of fixed-size little-endian records, one per sample:
+    seq (uint64), timestamp (float64), then one value per channel (value_dtype).
+    """
+    
+    def __init__(self, channels, value_dtype="<f4"):
+        self.channels = list(channels)
+        self.dtype = np.dtype(
+            [("seq", "<u8"), ("timestamp", "<f8")] + [(channel, value_dtype) for channel in self.channels]
+        )
+    
+    def decode(self, body, received_at=None):
+        """Return a SampleBlock viewing the records straight from the buffer."""
+        usable = len(body) - len(body) % self.dtype.itemsize
+        if usable != len(body):
+            print(f"Discarding {len(body) - usable} trailing bytes of a partial record")
+        records = np.frombuffer(body, dtype=self.dtype, count=usable // self.dtype.itemsize)
+        return SampleBlock(
+            records["timestamp"],
+            {channel: records[channel] for channel in self.channels},
+            records["seq"].astype(np.int64),
+            received_at,
+        )
+
+class ColumnarDecoder:
+    """
+    Decode a packed columnar body: a uint32 sample count followed by the seq
+    column (uint64), the timestamp column (float64) and one column per channel
+    (value_dtype), all little-endian. Every column is read with np.frombuffer
+    straight from the body, without creating Python objects per value.
+    """
+    
+    def __init__(self, channels, value_dtype="<f4"):
+        self.channels = list(channels)
+        self.value_dtype = np.dtype(value_dtype)
+    
+    def decode(self, body, received_at=None):
+        """Return a SampleBlock with one np.frombuffer view per column."""
+        if len(body) < 4:
+            # Empty body: nothing new since the cursor
+            return SampleBlock(
+                np.empty(0, dtype="<f8"),
+                {channel: np.empty(0, dtype=self.value_dtype) for channel in self.channels},
+                np.empty(0, dtype=np.int64),
+                received_at,
+            )
+        count = int(np.frombuffer(body, dtype="<u4", count=1)[0])
+        offset = 4
+        sequence = np.frombuffer(body, dtype="<u8", count=count, offset=offset)
+        offset += sequence.nbytes
+        timestamps = np.frombuffer(body, dtype="<f8", count=count, offset=offset)
+        offset += timestamps.nbytes
+        channels = {}
+        for channel in self.channels:
+            channels[channel] = np.frombuffer(body, dtype=self.value_dtype, count=count, offset=offset)
+            offset += channels[channel].nbytes
+        return SampleBlock(timestamps, channels, sequence.astype(np.int64), received_at)
+
+WIRE_DECODERS = {
+    "struct": StructDecoder,
+    "columnar": ColumnarDecoder,
+}
+
+def build_decoder(config):
+    """
+    Build the binary decoder described by a config dict ("wire_format",
+    "channels" and optionally "value_dtype"). Returns None for JSON.
+    """
+    wire_format = config.get("wire_format", "json")
+    if wire_format == "json":
+        return None
+    if wire_format not in WIRE_DECODERS:
+        raise ValueError(f"Unknown wire format: {wire_format}")
+    return WIRE_DECODERS[wire_format](config["channels"], config.get("value_dtype", "<f4"))
 
 class APIService(QObject):
     data_generated = Signal(dict)
+    block_generated = Signal(object)  # SampleBlock (batch mode)
+    
+    # Query parameter used to ask the endpoint for samples after a cursor
+    CURSOR_PARAM = "since"
     
-    def __init__(self, api_url, update_rate=0.1, retry_delay=1.0, parent=None):
+    # Seconds without any data before a stream connection is considered dead
+    STREAM_READ_TIMEOUT = 5.0
+    
+    def __init__(self, api_url, update_rate=0.1, retry_delay=1.0, batch_mode=False, transport="poll",
+                 decoder=None, parent=None):
         super().__init__(parent)
         self.api_url = api_url
         self.update_rate = update_rate
         self.retry_delay = retry_delay
+        self.batch_mode = batch_mode
+        self.transport = transport  # "poll" or "stream"
+        self.decoder = decoder  # Binary decoder for the poll transport; None means JSON
+        self.cursor = None
+        self.stream_response = None
         self.running = False
         self.session = requests.Session()
     
@@ -24,28 +133,118 @@ class APIService(QObject):
     
     def run(self):
         """Main loop that fetches data from the API."""
+        if self.transport == "stream":
+            self.run_stream()
+            return
+        
         while self.running:
             try:
-                # Fetch data from the API
-                response = self.session.get(self.api_url)
-                response.raise_for_status()  # Raise an exception for bad status codes
-                
-                # Parse the JSON response
-                data = response.json()
-                
-                # Emit the data through the signal
-                self.data_generated.emit(data)
+                if self.decoder is not None:
+                    self.fetch_binary()
+                elif self.batch_mode:
+                    self.fetch_batch()
+                else:
+                    # Fetch data from the API
+                    response = self.session.get(self.api_url)
+                    response.raise_for_status()  # Raise an exception for bad status codes
+                    
+                    # Parse the JSON response and stamp the arrival time on this thread
+                    data = response.json()
+                    data[RECEIVED_AT_KEY] = time.time()
+                    
+                    # Emit the data through the signal
+                    self.data_generated.emit(data)
                 
                 # Wait for the configured update rate before next request
                 time.sleep(self.update_rate)
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, ValueError) as e:
                 print(f"Error fetching data from API: {e}")
                 time.sleep(self.retry_delay)  # Wait for the configured retry delay before retrying
     
+    def fetch_batch(self):
+        """
+        Fetch every sample produced since the last cursor and emit them as a
+        single columnar SampleBlock.
+        """
+        params = {self.CURSOR_PARAM: self.cursor} if self.cursor is not None else None
+        response = self.session.get(self.api_url, params=params)
+        response.raise_for_status()
+        
+        block, cursor = parse_batch_payload(response.json(), received_at=time.time())
+        if cursor is not None:
+            self.cursor = cursor
+        if len(block):
+            self.block_generated.emit(block)
+    
+    def fetch_binary(self):
+        """
+        Fetch a binary body and decode it straight into NumPy arrays with the
+        configured decoder, emitting the result as one SampleBlock.
+        """
+        params = {self.CURSOR_PARAM: self.cursor} if self.cursor is not None else None
+        response = self.session.get(self.api_url, params=params)
+        response.raise_for_status()
+        
+        block = self.decoder.decode(response.content, received_at=time.time())
+        if len(block):
+            self.cursor = int(block.sequence[-1])
+            self.block_generated.emit(block)
+    
+    def run_stream(self):
+        """
+        Hold one long-lived connection and emit samples as soon as each line
+        arrives (newline-delimited JSON or server-sent events). The server is
+        expected to use chunked transfer encoding. Dropped connections are
+        reopened after retry_delay.
+        """
+        while self.running:
+            try:
+                params = {self.CURSOR_PARAM: self.cursor} if self.cursor is not None else None
+                with self.session.get(self.api_url, params=params, stream=True,
+                                      timeout=(self.retry_delay + 5.0, self.STREAM_READ_TIMEOUT)) as response:
+                    response.raise_for_status()
+                    self.stream_response = response
+                    for line in response.iter_lines():
+                        if not self.running:
+                            break
+                        payload = parse_stream_line(line)
+                        if payload is not None:
+                            self.dispatch_payload(payload)
+                
+                if self.running:
+                    print("API stream closed by the server, reconnecting...")
+                    time.sleep(self.retry_delay)
+                
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if self.running:
+                    print(f"Error reading API stream: {e}")
+                    time.sleep(self.retry_delay)
+            finally:
+                self.stream_response = None
+    
+    def dispatch_payload(self, payload):
+        """
+        Emit a decoded streaming payload: a single sample dict goes out through
+        data_generated, a batch ({"samples": [...]} or a list) through block_generated.
+        """
+        if isinstance(payload, dict) and "samples" not in payload and not self.batch_mode:
+            payload[RECEIVED_AT_KEY] = time.time()
+            self.data_generated.emit(payload)
+            return
+        if isinstance(payload, dict) and "samples" not in payload:
+            payload = [payload]
+        block, cursor = parse_batch_payload(payload, received_at=time.time())
+        if cursor is not None:
+            self.cursor = cursor
+        if len(block):
+            self.block_generated.emit(block)
+    
     def stop(self):
         """Stop the API service."""
         self.running = False
+        if self.stream_response is not None:
+            self.stream_response.close()  # Unblock a stream waiting for data
         if hasattr(self, 'thread') and self.thread.isRunning():
             self.thread.quit()
             self.thread.wait()
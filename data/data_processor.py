@@ -1,18 +1,111 @@
 # data/data_processor.py
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+import numpy as np
+
+from data.sample_block import SampleBlock
+from data.sequence_tracker import SequenceTracker
 
 class DataProcessor(QObject):
-    data_updated = Signal(dict)
-    
-    def __init__(self, parent=None):
+    """
+    Etapa entre a ingestão (APIService/IngestEngine) e os gráficos. Cada bloco
+    passa pelo rastreador de sequência e depois, em ordem, pelas etapas
+    vetorizadas do pipeline (conversão de unidade, calibração, filtros, decimação,
+    canais derivados).
+
+    Após start(), o processamento roda em uma thread própria: os sinais da
+    ingestão chegam por fila e apenas os arrays prontos para desenhar são
+    enviados à thread da interface.
+    """
+    data_updated = Signal(object)  # SampleBlock com os dados processados
+    stats_updated = Signal(dict)  # Cópia dos contadores, feita na thread do processador
+
+    def __init__(self, stages=None, parent=None):
         super().__init__(parent)
-    
+        self.stages = list(stages or [])
+        self.sequence_trackers = {}  # Um rastreador de sequência por origem (ECU)
+        self.last_latency = np.nan  # Latência média de transporte do último bloco (s)
+
+    def start(self):
+        """
+        Move o processador para uma thread separada com seu próprio loop de eventos.
+        """
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Encerra a thread de processamento.
+        """
+        if hasattr(self, 'thread') and self.thread.isRunning():
+            self.thread.quit()
+            self.thread.wait()
+
+    @Slot(dict)
     def process_data(self, raw_data):
         """
-        Processa os dados brutos e emite um sinal com os dados processados.
+        Processa uma amostra única (dict) recebida da API.
+        """
+        self.process_block(SampleBlock.from_records([raw_data]))
+
+    @Slot(object)
+    def process_block(self, block):
+        """
+        Processa um bloco de amostras e emite um sinal com os dados processados.
+        O horário do carro e o número de sequência são preservados; amostras
+        duplicadas são descartadas e lacunas são contabilizadas antes das etapas do pipeline.
         """
-        # Aqui você pode adicionar lógica de processamento dos dados
-        # Para simplificar, vamos emitir os dados brutos diretamente
-        processed_data = raw_data  # Substitua por processamento real se necessário
-        self.data_updated.emit(processed_data)
+        tracker = self.sequence_trackers.setdefault(block.source, SequenceTracker())
+        missing_before = tracker.missing
+        block = tracker.filter(block)
+        if tracker.missing > missing_before:
+            origin = f" ({block.source})" if block.source else ""
+            print(f"Lacuna na telemetria{origin}: {tracker.missing - missing_before} amostra(s) perdida(s).")
+        if len(block) == 0:
+            self.stats_updated.emit(self.stats())
+            return
+
+        block = block.copy()  # O bloco bruto também é consumido pelo gravador de sessão
+        for stage in self.stages:
+            block = stage.process(block)
+
+        latency = block.latency
+        if np.isfinite(latency).any():
+            self.last_latency = float(np.nanmean(latency))
+        self.data_updated.emit(block)
+        self.stats_updated.emit(self.stats())
+
+    def add_stage(self, stage):
+        """
+        Adiciona uma etapa ao final do pipeline.
+        """
+        self.stages.append(stage)
+
+    def reset(self):
+        """
+        Reinicia o estado dos filtros e dos rastreadores de sequência.
+        """
+        for stage in self.stages:
+            stage.reset()
+        self.sequence_trackers.clear()
+
+    def stats(self):
+        """
+        Retorna uma cópia dos contadores (latência, amostras perdidas e duplicadas).
+        Deve ser chamada na thread do processador, que é a única a alterar os
+        rastreadores; a interface recebe a cópia pelo sinal stats_updated.
+        """
+        return {
+            "latency": self.last_latency,
+            "missing": self.missing_samples,
+            "duplicates": self.duplicate_samples,
+        }
+
+    @property
+    def missing_samples(self):
+        return sum(tracker.missing for tracker in self.sequence_trackers.values())
+
+    @property
+    def duplicate_samples(self):
+        return sum(tracker.duplicates for tracker in self.sequence_trackers.values())
@@ -0,0 +1,130 @@
+# data/history_store.py
+
+import bisect
+
+import numpy as np
+
+# Janela de retenção padrão do histórico dos gráficos ao vivo (segundos)
+DEFAULT_RETENTION = 600.0
+# Limite rígido de amostras guardadas por gráfico (memória = limite x colunas x 8 bytes)
+DEFAULT_MAX_SAMPLES = 1_000_000
+# Amostras por bloco de memória
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class ChunkedHistoryStore:
+    """
+    Histórico em memória dividido em blocos de tamanho fixo, indexado pelo
+    tempo (primeira coluna, crescente).
+
+    As amostras são escritas no bloco ativo; quando ele enche, é selado e
+    entra na lista de blocos. Blocos mais antigos que `retention` segundos (em
+    relação à amostra mais nova) ou que excedam `max_samples` são descartados,
+    e seus arrays são reaproveitados como próximo bloco ativo. Assim a memória
+    fica limitada a cerca de `max_samples` amostras, independentemente da
+    duração da sessão, e não há realocações em regime permanente.
+
+    Consultas por intervalo de tempo usam busca binária sobre o primeiro
+    instante de cada bloco e só tocam os blocos envolvidos.
+    """
+
+    def __init__(self, retention=DEFAULT_RETENTION, max_samples=DEFAULT_MAX_SAMPLES,
+                 chunk_size=DEFAULT_CHUNK_SIZE, columns=2, dtype=np.float64):
+        if chunk_size <= 0 or max_samples < chunk_size:
+            raise ValueError("O limite de amostras deve comportar pelo menos um bloco.")
+        self.retention = retention
+        self.max_samples = int(max_samples)
+        self.chunk_size = int(chunk_size)
+        self.columns = int(columns)
+        self.dtype = dtype
+        self.chunks = []  # Blocos selados, do mais antigo ao mais novo
+        self.chunk_starts = []  # Primeiro instante de cada bloco selado
+        self.spare = None  # Array de um bloco descartado, reaproveitado
+        self.active = np.empty((self.columns, self.chunk_size), dtype=dtype)
+        self.fill = 0
+
+    def __len__(self):
+        return len(self.chunks) * self.chunk_size + self.fill
+
+    @property
+    def memory_bytes(self):
+        allocated = len(self.chunks) + 1 + (self.spare is not None)
+        return allocated * self.active.nbytes
+
+    def clear(self):
+        self.chunks.clear()
+        self.chunk_starts.clear()
+        self.fill = 0
+
+    def append(self, *values):
+        """
+        Adiciona uma amostra (um valor por coluna).
+        """
+        self.active[:, self.fill] = values
+        self.fill += 1
+        if self.fill == self.chunk_size:
+            self.seal()
+
+    def extend(self, *columns):
+        """
+        Adiciona um bloco de amostras (um array por coluna, todos do mesmo tamanho).
+        """
+        data = np.asarray(columns, dtype=self.dtype)
+        size = data.shape[1]
+        written = 0
+        while written < size:
+            count = min(size - written, self.chunk_size - self.fill)
+            self.active[:, self.fill:self.fill + count] = data[:, written:written + count]
+            self.fill += count
+            written += count
+            if self.fill == self.chunk_size:
+                self.seal()
+
+    def seal(self):
+        """
+        Fecha o bloco ativo, aplica a política de descarte e prepara um novo bloco.
+        """
+        self.chunks.append(self.active)
+        self.chunk_starts.append(self.active[0, 0])
+        newest = self.active[0, -1]
+        self.active = self.spare if self.spare is not None else np.empty_like(self.active)
+        self.spare = None
+        self.fill = 0
+
+        while self.chunks and (
+            len(self.chunks) * self.chunk_size > self.max_samples
+            or newest - self.chunks[0][0, -1] > self.retention
+        ):
+            self.spare = self.chunks.pop(0)
+            self.chunk_starts.pop(0)
+
+    def oldest(self):
+        """Instante da amostra mais antiga ainda guardada (ou None)."""
+        if self.chunks:
+            return self.chunks[0][0, 0]
+        return self.active[0, 0] if self.fill else None
+
+    def newest(self):
+        """Instante da amostra mais nova (ou None)."""
+        if self.fill:
+            return self.active[0, self.fill - 1]
+        return self.chunks[-1][0, -1] if self.chunks else None
+
+    def range(self, start, stop):
+        """
+        Retorna as colunas das amostras com tempo em [start, stop] (uma amostra a
+        mais de cada lado, para a linha continuar até a borda do gráfico).
+        """
+        first = max(bisect.bisect_left(self.chunk_starts, start) - 1, 0)
+        last = bisect.bisect_right(self.chunk_starts, stop)
+        parts = self.chunks[first:last]
+        if self.fill and self.active[0, 0] <= stop:
+            parts = parts + [self.active[:, :self.fill]]
+        if not parts:
+            return np.empty((self.columns, 0), dtype=self.dtype)
+
+        data = np.concatenate(parts, axis=1) if len(parts) > 1 else parts[0].copy()
+        times = data[0]
+        begin = max(int(np.searchsorted(times, start, side='left')) - 1, 0)
+        end = min(int(np.searchsorted(times, stop, side='right')) + 1, len(times))
+        return data[:, begin:end]
@@ -0,0 +1,167 @@
+# data/ingest_engine.py
+
+from PySide6.QtCore import QObject, QThread, Signal
+import asyncio
+import time
+import aiohttp
+
+from data.api_service import parse_stream_line, build_decoder
+from data.sample_block import SampleBlock, parse_batch_payload, RECEIVED_AT_KEY
+
+
+class IngestEngine(QObject):
+    """
+    Motor de ingestão baseado em asyncio: uma única thread em segundo plano
+    consulta (ou recebe em stream) vários endpoints ao mesmo tempo, cada um com
+    sua própria taxa, compartilhando um pool de conexões HTTP. Todas as amostras
+    saem como SampleBlock pelo mesmo sinal, identificadas pela origem.
+
+    Cada endpoint é um dict com as chaves:
+        name, url, update_rate (s), transport ("poll" ou "stream"),
+        prefix (prefixo opcional para os nomes dos canais) e, para formatos
+        binários consultados, wire_format/channels/value_dtype (ver build_decoder).
+    Respostas JSON com uma amostra única ou em lote ({"samples": [...]}) são aceitas.
+    """
+    block_generated = Signal(object)  # SampleBlock
+
+    # Parâmetro de consulta usado para pedir amostras após um cursor
+    CURSOR_PARAM = "since"
+
+    # Segundos sem dados antes de considerar uma conexão de stream morta
+    STREAM_READ_TIMEOUT = 5.0
+
+    def __init__(self, endpoints, retry_delay=1.0, max_connections=10, parent=None):
+        super().__init__(parent)
+        self.endpoints = [dict(endpoint) for endpoint in endpoints]
+        self.decoders = {endpoint["name"]: build_decoder(endpoint) for endpoint in self.endpoints}
+        self.retry_delay = retry_delay
+        self.max_connections = max_connections
+        self.cursors = {}
+        self.running = False
+        self.loop = None
+        self.tasks = []
+
+    def start(self):
+        """
+        Inicia o loop asyncio em uma thread separada.
+        """
+        self.running = True
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.thread.started.connect(self.run)
+        self.thread.start()
+
+    def run(self):
+        """
+        Executa o loop asyncio até que stop() seja chamado.
+        """
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self.run_endpoints())
+        finally:
+            self.loop.close()
+            self.loop = None
+
+    async def run_endpoints(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            for endpoint in self.endpoints:
+                if endpoint.get("transport", "poll") == "stream":
+                    self.tasks.append(asyncio.create_task(self.stream_endpoint(session, endpoint)))
+                else:
+                    self.tasks.append(asyncio.create_task(self.poll_endpoint(session, endpoint)))
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def poll_endpoint(self, session, endpoint):
+        """
+        Consulta periodicamente um endpoint na taxa configurada para ele.
+        """
+        name = endpoint["name"]
+        decoder = self.decoders[name]
+        while self.running:
+            try:
+                async with session.get(endpoint["url"], params=self.cursor_params(name)) as response:
+                    response.raise_for_status()
+                    if decoder is not None:
+                        body = await response.read()
+                    else:
+                        payload = await response.json(content_type=None)
+                if decoder is not None:
+                    block = decoder.decode(body, received_at=time.time())
+                    if len(block):
+                        self.cursors[name] = int(block.sequence[-1])
+                    self.emit_block(endpoint, block)
+                else:
+                    self.dispatch_payload(endpoint, payload, time.time())
+                await asyncio.sleep(endpoint.get("update_rate", 0.1))
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                print(f"Erro ao consultar o endpoint '{name}': {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    async def stream_endpoint(self, session, endpoint):
+        """
+        Mantém uma conexão longa com o endpoint e processa cada linha assim que chega.
+        """
+        name = endpoint["name"]
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=self.STREAM_READ_TIMEOUT)
+        while self.running:
+            try:
+                async with session.get(endpoint["url"], params=self.cursor_params(name),
+                                       timeout=timeout) as response:
+                    response.raise_for_status()
+                    async for line in response.content:
+                        payload = parse_stream_line(line)
+                        if payload is not None:
+                            self.dispatch_payload(endpoint, payload, time.time())
+                if self.running:
+                    print(f"Stream do endpoint '{name}' encerrado pelo servidor, reconectando...")
+                    await asyncio.sleep(self.retry_delay)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                print(f"Erro no stream do endpoint '{name}': {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    def cursor_params(self, name):
+        cursor = self.cursors.get(name)
+        return {self.CURSOR_PARAM: cursor} if cursor is not None else None
+
+    def dispatch_payload(self, endpoint, payload, received_at):
+        """
+        Converte a resposta de um endpoint em SampleBlock e a emite.
+        """
+        name = endpoint["name"]
+        if isinstance(payload, dict) and "samples" not in payload:
+            payload.setdefault(RECEIVED_AT_KEY, received_at)
+            block = SampleBlock.from_records([payload])
+        else:
+            block, cursor = parse_batch_payload(payload, received_at=received_at)
+            if cursor is not None:
+                self.cursors[name] = cursor
+        self.emit_block(endpoint, block)
+
+    def emit_block(self, endpoint, block):
+        """
+        Aplica o prefixo e a origem do endpoint ao bloco e o emite.
+        """
+        if not len(block):
+            return
+        prefix = endpoint.get("prefix", "")
+        if prefix:
+            block.channels = {prefix + channel: values for channel, values in block.channels.items()}
+        block.source = endpoint["name"]
+        self.block_generated.emit(block)
+
+    def stop(self):
+        """
+        Interrompe todos os endpoints e encerra a thread.
+        """
+        self.running = False
+        loop = self.loop
+        if loop is not None:
+            for task in self.tasks:
+                try:
+                    loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass  # O loop já foi encerrado
+        if hasattr(self, 'thread') and self.thread.isRunning():
+            self.thread.quit()
+            self.thread.wait()
@@ -0,0 +1,207 @@
+# data/lap_alignment.py
+
+import numpy as np
+
+from data.lap_segmentation import LATITUDE_CHANNEL, LONGITUDE_CHANNEL, EARTH_RADIUS
+
+# Canal de velocidade das rodas (km/h), integrado para obter a distância percorrida
+SPEED_CHANNEL = "Velocidade"
+# Fator de conversão da velocidade para m/s
+SPEED_SCALE = 1 / 3.6
+
+# Eixos de comparação disponíveis
+AXIS_TIME = "time"
+AXIS_DISTANCE = "distance"
+AXIS_FRACTION = "fraction"
+
+# Resolução da grade comum (metros no modo distância, segundos no modo tempo,
+# pontos no modo fração)
+DEFAULT_DISTANCE_STEP = 1.0
+DEFAULT_TIME_STEP = 0.01
+DEFAULT_FRACTION_POINTS = 2000
+
+
+def distance_from_speed(timestamps, speed, scale=SPEED_SCALE):
+    """
+    Distância acumulada (m) integrando a velocidade pela regra do trapézio.
+    Amostras sem velocidade contam como parado.
+    """
+    speed = np.nan_to_num(np.asarray(speed, dtype=np.float64) * scale, nan=0.0)
+    steps = np.diff(timestamps) * (speed[1:] + speed[:-1]) / 2
+    return np.concatenate(([0.0], np.cumsum(np.maximum(steps, 0.0))))
+
+
+def distance_from_gps(latitude, longitude):
+    """
+    Distância acumulada (m) somando os trechos entre posições GPS consecutivas
+    (aproximação equirretangular, suficiente para os poucos metros entre amostras).
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    dx = np.diff(lon) * np.cos((lat[1:] + lat[:-1]) / 2)
+    dy = np.diff(lat)
+    steps = np.nan_to_num(np.hypot(dx, dy) * EARTH_RADIUS, nan=0.0)
+    return np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def resample(position, values, grid):
+    """
+    Reamostra `values` (medidos nas posições crescentes `position`) na grade
+    comum, por interpolação linear. Pontos da grade fora da volta recebem NaN.
+    """
+    return np.interp(grid, position, values, left=np.nan, right=np.nan)
+
+
+def fit_to_grid(values, size):
+    """
+    Recorta ou completa com NaN um array alinhado para o tamanho da grade.
+    """
+    if len(values) >= size:
+        return values[:size]
+    return np.concatenate((values, np.full(size - len(values), np.nan)))
+
+
+class LapAligner:
+    """
+    Alinha voltas de uma sessão em um eixo comum para comparação: distância
+    percorrida (velocidade integrada ou GPS) ou fração da volta (0 a 1).
+
+    A posição de cada volta e seus canais reamostrados ficam em cache; ao trocar
+    a volta de referência, os arrays alinhados são apenas recortados para a
+    nova grade, sem nova interpolação.
+    """
+
+    def __init__(self, reader, distance_step=DEFAULT_DISTANCE_STEP,
+                 fraction_points=DEFAULT_FRACTION_POINTS, speed_scale=SPEED_SCALE):
+        self.reader = reader
+        self.distance_step = distance_step
+        self.fraction_points = fraction_points
+        self.speed_scale = speed_scale
+        self.distances = {}  # {(linha inicial, linha final): distância acumulada}
+        self.aligned = {}  # {(linhas da volta, canal, eixo): valores na grade da volta}
+
+    def distance_source(self):
+        """
+        Retorna a origem da distância disponível na sessão ("speed", "gps" ou None).
+        """
+        if SPEED_CHANNEL in self.reader.columns:
+            return "speed"
+        if LATITUDE_CHANNEL in self.reader.columns and LONGITUDE_CHANNEL in self.reader.columns:
+            return "gps"
+        return None
+
+    def lap_distance(self, lap_number):
+        """
+        Distância acumulada (m) em cada amostra da volta, ou None sem fonte de distância.
+        """
+        bounds = self.reader.lap_slice(lap_number)
+        source = self.distance_source()
+        if bounds is None or source is None:
+            return None
+        if bounds not in self.distances:
+            start, stop = bounds
+            if source == "speed":
+                distance = distance_from_speed(self.reader.timestamps(start, stop),
+                                               self.reader.channel(SPEED_CHANNEL, start, stop), self.speed_scale)
+            else:
+                distance = distance_from_gps(self.reader.channel(LATITUDE_CHANNEL, start, stop),
+                                             self.reader.channel(LONGITUDE_CHANNEL, start, stop))
+            self.distances[bounds] = distance
+        return self.distances[bounds]
+
+    def lap_position(self, lap_number, axis):
+        """
+        Posição de cada amostra da volta no eixo pedido. Sem fonte de distância,
+        o modo fração usa a fração do tempo de volta.
+        """
+        if axis == AXIS_DISTANCE:
+            return self.lap_distance(lap_number)
+        if axis == AXIS_FRACTION:
+            position = self.lap_distance(lap_number)
+            if position is None:
+                position = self.reader.lap_times(lap_number)
+            if position is None or len(position) < 2 or position[-1] <= 0:
+                return None
+            return position / position[-1]
+        return self.reader.lap_times(lap_number)
+
+    def lap_grid(self, lap_number, axis):
+        """
+        Grade própria da volta: de 0 ao fim da volta com o passo do eixo. As
+        grades de todas as voltas são prefixos umas das outras, então qualquer
+        volta alinhada pode ser recortada ou completada para a grade da referência.
+        """
+        if axis == AXIS_FRACTION:
+            return np.linspace(0.0, 1.0, self.fraction_points)
+        position = self.lap_position(lap_number, axis)
+        if position is None or len(position) == 0:
+            return None
+        step = self.distance_step if axis == AXIS_DISTANCE else DEFAULT_TIME_STEP
+        return np.arange(0.0, position[-1] + step / 2, step)
+
+    def grid(self, reference_lap, axis):
+        """
+        Grade comum definida pela volta de referência: de 0 ao comprimento dela
+        (modo distância) ou de 0 a 1 (modo fração).
+        """
+        return self.lap_grid(reference_lap, axis)
+
+    def aligned_lap(self, lap_number, channel, axis):
+        """
+        Canal da volta reamostrado na grade própria da volta (em cache). O canal
+        especial "time" traz o tempo de volta em cada ponto da grade.
+        """
+        bounds = self.reader.lap_slice(lap_number)
+        if bounds is None:
+            return None
+        key = (bounds, channel, axis)
+        if key not in self.aligned:
+            position = self.lap_position(lap_number, axis)
+            if position is None:
+                return None
+            if channel == "time":
+                values = self.reader.lap_times(lap_number)
+            elif channel in self.reader.columns:
+                values = self.reader.channel(channel, *bounds)
+            else:
+                return None
+            self.aligned[key] = resample(position, values, self.lap_grid(lap_number, axis))
+        return self.aligned[key]
+
+    def align(self, lap_numbers, channels, reference_lap, axis):
+        """
+        Reamostra os canais das voltas na grade da volta de referência.
+        Retorna (grade, {(volta, canal): valores}). Como cada volta fica em cache
+        na própria grade, trocar a referência só recorta/completa arrays.
+        """
+        grid = self.grid(reference_lap, axis)
+        aligned = {}
+        if grid is None:
+            return None, aligned
+        for lap_number in lap_numbers:
+            for channel in channels:
+                values = self.aligned_lap(lap_number, channel, axis)
+                if values is not None:
+                    aligned[(lap_number, channel)] = fit_to_grid(values, len(grid))
+        return grid, aligned
+
+    def delta(self, lap_numbers, reference_lap, axis):
+        """
+        Diferença de tempo acumulada (s) de cada volta em relação à referência,
+        em cada ponto da grade comum: positivo onde a volta está atrás da referência.
+        Retorna (grade, {volta: delta}).
+        """
+        grid, aligned = self.align(list(lap_numbers) + [reference_lap], ["time"], reference_lap, axis)
+        if grid is None or (reference_lap, "time") not in aligned:
+            return grid, {}
+        laps = [lap for lap in lap_numbers if lap != reference_lap and (lap, "time") in aligned]
+        if not laps:
+            return grid, {}
+        # Uma única operação vetorizada para todas as voltas
+        times = np.vstack([aligned[(lap, "time")] for lap in laps])
+        deltas = times - aligned[(reference_lap, "time")]
+        return grid, dict(zip(laps, deltas))
+
+    def clear(self):
+        self.distances.clear()
+        self.aligned.clear()
@@ -0,0 +1,197 @@
+# data/lap_index.py
+
+import json
+import os
+
+import numpy as np
+
+# Canal com o contador de voltas enviado pelo carro
+LAP_CHANNEL = "Volta"
+# Canal com o setor atual da pista (opcional)
+SECTOR_CHANNEL = "Setor"
+# Arquivo do índice de voltas, gravado ao lado das colunas da sessão
+LAP_INDEX_FILE = "laps.json"
+
+
+class LapIndex:
+    """
+    Índice de voltas de uma sessão: número da volta -> linhas inicial/final,
+    horários, tempo de volta e parciais de setor. A busca por número é O(1).
+
+    Cada volta é um dict com as chaves lap, start, stop, start_time, end_time,
+    lap_time, sectors (tempos parciais em segundos) e complete (False para a
+    volta em andamento quando a gravação terminou).
+    """
+
+    def __init__(self, laps=None):
+        self.laps = []
+        self.by_number = {}
+        for lap in laps or []:
+            self.add(lap)
+
+    def __len__(self):
+        return len(self.laps)
+
+    def __iter__(self):
+        return iter(self.laps)
+
+    def add(self, lap):
+        self.laps.append(lap)
+        self.by_number[lap["lap"]] = lap
+
+    def get(self, lap_number):
+        return self.by_number.get(lap_number)
+
+    def numbers(self):
+        return [lap["lap"] for lap in self.laps]
+
+    def truncated(self, row_count):
+        """
+        Retorna uma cópia do índice limitada às `row_count` linhas válidas da sessão
+        (após uma queda, o índice pode apontar além do fim das colunas).
+        """
+        laps = []
+        for lap in self.laps:
+            if lap["start"] >= row_count:
+                break
+            if lap["stop"] > row_count:
+                lap = dict(lap, stop=row_count, complete=False)
+            laps.append(lap)
+        return LapIndex(laps)
+
+    def save(self, session_path):
+        """
+        Grava o índice de forma atômica (arquivo temporário + rename).
+        """
+        path = os.path.join(session_path, LAP_INDEX_FILE)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"laps": self.laps}, f, ensure_ascii=False, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, session_path):
+        """
+        Lê o índice da sessão; retorna None se a sessão não tiver índice.
+        """
+        path = os.path.join(session_path, LAP_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["laps"])
+
+
+class LapIndexBuilder:
+    """
+    Monta o LapIndex incrementalmente durante a gravação, a partir dos blocos
+    gravados em sequência. As mudanças dos canais de volta e de setor são
+    localizadas de forma vetorizada; apenas essas posições são visitadas.
+
+    Se o carro não envia o canal de volta, um LapSegmenter (data/lap_segmentation.py)
+    pode numerar as voltas a partir do beacon ou do GPS.
+    """
+
+    def __init__(self, lap_channel=LAP_CHANNEL, sector_channel=SECTOR_CHANNEL, segmenter=None):
+        self.lap_channel = lap_channel
+        self.sector_channel = sector_channel
+        self.segmenter = segmenter
+        self.index = LapIndex()
+        self.current = None  # Volta em andamento
+        self.sector_start = None
+        self.last_sector = None
+        self.last_timestamp = None
+        self.rows = 0
+
+    def add_block(self, row_offset, timestamps, channels):
+        """
+        Processa um bloco gravado a partir da linha `row_offset`.
+        Retorna True se alguma volta foi concluída neste bloco.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        size = len(timestamps)
+        if size == 0:
+            return False
+        self.rows = row_offset + size
+
+        lap_numbers = channels.get(self.lap_channel)
+        if lap_numbers is None and self.segmenter is not None:
+            lap_numbers = self.segmenter.lap_numbers(timestamps, channels)
+        lap_changes = self.changes(lap_numbers, self.current["lap"] if self.current is not None else np.nan)
+        sector_changes = self.changes(channels.get(self.sector_channel), self.last_sector)
+        if sector_changes:
+            self.last_sector = float(channels[self.sector_channel][sector_changes[-1]])
+
+        completed = False
+        lap_rows = set(lap_changes)
+        for i in sorted(lap_rows.union(sector_changes)):
+            row, timestamp = row_offset + int(i), float(timestamps[i])
+            if i in lap_rows:
+                if self.current is not None:
+                    self.close_lap(row, timestamp)
+                    completed = True
+                self.current = {
+                    "lap": int(lap_numbers[i]),
+                    "start": row,
+                    "start_time": timestamp,
+                    "sectors": [],
+                }
+                self.sector_start = timestamp
+            elif self.current is not None:
+                self.current["sectors"].append(timestamp - self.sector_start)
+                self.sector_start = timestamp
+
+        self.last_timestamp = float(timestamps[-1])
+        return completed
+
+    @staticmethod
+    def changes(values, previous):
+        """
+        Posições em que um canal muda de valor em relação à última amostra válida
+        (amostras NaN são ignoradas). `previous` é o último valor do bloco anterior.
+        """
+        if values is None:
+            return []
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.flatnonzero(np.isfinite(values))
+        if len(valid) == 0:
+            return []
+        valid_values = values[valid]
+        before = np.concatenate(([np.nan if previous is None else previous], valid_values[:-1]))
+        return valid[valid_values != before].tolist()
+
+    def close_lap(self, stop_row, end_time, complete=True):
+        lap = self.current
+        lap["stop"] = int(stop_row)
+        lap["end_time"] = float(end_time)
+        lap["lap_time"] = float(end_time - lap["start_time"])
+        if complete and lap["sectors"]:
+            # O último setor termina na linha de chegada
+            lap["sectors"].append(float(end_time - self.sector_start))
+        lap["complete"] = complete
+        self.index.add(lap)
+        self.current = None
+
+    def finish(self):
+        """
+        Fecha a volta em andamento (marcada como incompleta) e retorna o índice final.
+        """
+        if self.current is not None:
+            self.close_lap(self.rows, self.last_timestamp, complete=False)
+        return self.index
+
+    def snapshot(self):
+        """
+        Retorna o índice com as voltas concluídas mais a volta em andamento (incompleta),
+        sem alterar o estado do construtor.
+        """
+        index = LapIndex(self.index.laps)
+        if self.current is not None:
+            lap = dict(self.current, sectors=list(self.current["sectors"]))
+            lap["stop"] = int(self.rows)
+            lap["end_time"] = float(self.last_timestamp)
+            lap["lap_time"] = float(self.last_timestamp - lap["start_time"])
+            lap["complete"] = False
+            index.add(lap)
+        return index
@@ -0,0 +1,266 @@
+# data/lap_segmentation.py
+
+import numpy as np
+
+from data.lap_index import LapIndex
+
+# Canal do sensor de passagem (beacon) na linha de chegada
+BEACON_CHANNEL = "Beacon"
+LATITUDE_CHANNEL = "Latitude"
+LONGITUDE_CHANNEL = "Longitude"
+
+# Raio médio da Terra, usado na projeção local das coordenadas GPS
+EARTH_RADIUS = 6371000.0
+# Tempo mínimo entre duas passagens para contar uma volta nova (evita repiques)
+DEFAULT_MIN_LAP_TIME = 10.0
+
+
+class StartFinishLine:
+    """
+    Linha de chegada (ou de setor) definida por dois pontos GPS (lat, lon).
+    As posições do carro são projetadas em um plano local em metros, centrado
+    na linha, e uma passagem é a troca de lado entre duas amostras consecutivas
+    com o ponto de cruzamento dentro do segmento.
+    """
+
+    def __init__(self, lat1, lon1, lat2, lon2):
+        self.origin = ((lat1 + lat2) / 2.0, (lon1 + lon2) / 2.0)
+        self.a = self.project(lat1, lon1)
+        self.b = self.project(lat2, lon2)
+
+    def project(self, lat, lon):
+        """
+        Projeção equirretangular em metros em torno da origem da linha.
+        """
+        lat0, lon0 = np.radians(self.origin)
+        x = (np.radians(lon) - lon0) * np.cos(lat0) * EARTH_RADIUS
+        y = (np.radians(lat) - lat0) * EARTH_RADIUS
+        return np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+
+    def crossings(self, lat, lon):
+        """
+        Retorna (anteriores, índices, frações) das passagens: a passagem ocorre
+        entre as amostras `anterior` e `índice`, na fração indicada do intervalo.
+        Só conta o sentido em que o carro passa da direita para a esquerda da
+        linha orientada de A para B. Amostras sem posição (NaN, falha do GPS) são
+        ignoradas: a passagem é interpolada entre as amostras válidas em volta da falha.
+        """
+        x, y = self.project(lat, lon)
+        valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        x, y = x[valid], y[valid]
+        ax, ay = self.a
+        bx, by = self.b
+        dx, dy = bx - ax, by - ay
+        # Lado de cada amostra em relação à linha (produto vetorial)
+        side = dx * (y - ay) - dy * (x - ax)
+        before, after = side[:-1], side[1:]
+        candidates = np.flatnonzero((before < 0) & (after >= 0))
+        if len(candidates) == 0:
+            return candidates, candidates, np.empty(0)
+
+        fraction = before[candidates] / (before[candidates] - after[candidates])
+        # Ponto de cruzamento precisa estar entre A e B
+        cross_x = x[candidates] + fraction * (x[candidates + 1] - x[candidates])
+        cross_y = y[candidates] + fraction * (y[candidates + 1] - y[candidates])
+        along = ((cross_x - ax) * dx + (cross_y - ay) * dy) / (dx * dx + dy * dy)
+        inside = (along >= 0) & (along <= 1)
+        candidates = candidates[inside]
+        return valid[candidates], valid[candidates + 1], fraction[inside]
+
+    def to_config(self):
+        lat1, lon1 = self.unproject(*self.a)
+        lat2, lon2 = self.unproject(*self.b)
+        return [lat1, lon1, lat2, lon2]
+
+    def unproject(self, x, y):
+        lat0, lon0 = np.radians(self.origin)
+        return (float(np.degrees(y / EARTH_RADIUS + lat0)),
+                float(np.degrees(x / (np.cos(lat0) * EARTH_RADIUS) + lon0)))
+
+
+def beacon_crossings(values, threshold=0.5):
+    """
+    Índices das bordas de subida do canal de beacon (primeira amostra acima do
+    limiar). Amostras sem valor (NaN) são ignoradas, comparando cada amostra
+    válida com a anterior válida.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(np.isfinite(values))
+    active = values[valid] >= threshold
+    return valid[np.flatnonzero(active[1:] & ~active[:-1]) + 1]
+
+
+def debounce(rows, times, min_lap_time):
+    """
+    Descarta passagens a menos de `min_lap_time` segundos da última passagem aceita.
+    """
+    if len(rows) < 2 or min_lap_time <= 0:
+        return rows, times
+    # Caso comum (nenhum repique): verificação vetorizada
+    if np.all(np.diff(times) >= min_lap_time):
+        return rows, times
+    keep = [0]
+    for i in range(1, len(times)):
+        if times[i] - times[keep[-1]] >= min_lap_time:
+            keep.append(i)
+    return rows[keep], times[keep]
+
+
+class LapSegmenter:
+    """
+    Detecta passagens pela linha de chegada a partir do canal de beacon ou da
+    posição GPS. Pode segmentar uma sessão inteira de uma só vez (segment) ou
+    funcionar incrementalmente no fluxo ao vivo (lap_numbers), mantendo a última
+    amostra do bloco anterior para detectar passagens entre blocos.
+    """
+
+    def __init__(self, beacon_channel=None, start_line=None, sector_lines=None,
+                 min_lap_time=DEFAULT_MIN_LAP_TIME, threshold=0.5):
+        if beacon_channel is None and start_line is None:
+            beacon_channel = BEACON_CHANNEL
+        self.beacon_channel = beacon_channel
+        self.start_line = StartFinishLine(*start_line) if start_line is not None else None
+        self.sector_lines = [StartFinishLine(*line) for line in sector_lines or []]
+        self.min_lap_time = min_lap_time
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        """
+        Reinicia o estado incremental (número da volta atual e última amostra válida vista).
+        """
+        self.lap = 1
+        self.last_crossing_time = None
+        self.last_sample = None
+
+    def to_config(self):
+        """
+        Configuração no formato de "lap_detection" (ver build_segmenter), gravada
+        no meta.json da sessão para que a leitura use o mesmo segmentador.
+        """
+        config = {"min_lap_time": self.min_lap_time, "threshold": self.threshold}
+        if self.start_line is not None:
+            config["start_line"] = self.start_line.to_config()
+        else:
+            config["beacon_channel"] = self.beacon_channel
+        if self.sector_lines:
+            config["sector_lines"] = [line.to_config() for line in self.sector_lines]
+        return config
+
+    def required_channels(self):
+        if self.start_line is not None:
+            return [LATITUDE_CHANNEL, LONGITUDE_CHANNEL]
+        return [self.beacon_channel]
+
+    def crossings(self, timestamps, channels, line=None):
+        """
+        Retorna (linhas, horários) das passagens no trecho. No modo GPS o horário
+        é interpolado entre as duas amostras em volta da linha.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        line = line or self.start_line
+        if line is not None:
+            lat = np.asarray(channels[LATITUDE_CHANNEL], dtype=np.float64)
+            lon = np.asarray(channels[LONGITUDE_CHANNEL], dtype=np.float64)
+            previous, rows, fraction = line.crossings(lat, lon)
+            times = timestamps[previous] + fraction * (timestamps[rows] - timestamps[previous])
+            return rows, times
+        rows = beacon_crossings(channels[self.beacon_channel], self.threshold)
+        return rows, timestamps[rows]
+
+    def segment(self, timestamps, channels, row_offset=0, first_lap=1):
+        """
+        Segmenta um trecho completo (por exemplo, a sessão inteira lida por memmap)
+        e retorna um LapIndex. O trecho antes da primeira passagem é a volta 1
+        (volta de saída, incompleta), assim como o trecho após a última passagem.
+        Com `first_lap` > 1, o trecho começa no início dessa volta.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        size = len(timestamps)
+        index = LapIndex()
+        if size == 0:
+            return index
+
+        rows, times = debounce(*self.crossings(timestamps, channels), self.min_lap_time)
+        starts = np.concatenate(([0], rows))
+        stops = np.append(rows, size)
+        start_times = np.concatenate(([timestamps[0]], times))
+        end_times = np.append(times, timestamps[-1])
+
+        # Parciais: cada passagem por uma linha de setor é atribuída à volta em que ocorreu
+        sector_times = [[] for _ in range(len(starts))]
+        if self.sector_lines:
+            events = np.concatenate([self.crossings(timestamps, channels, line)[1] for line in self.sector_lines])
+            events.sort()
+            owners = np.searchsorted(start_times, events, side="right") - 1
+            for owner, time in zip(owners, events):
+                sector_times[owner].append(float(time))
+
+        for i in range(len(starts)):
+            if starts[i] == stops[i]:
+                continue
+            complete = (i > 0 or first_lap > 1) and i < len(starts) - 1
+            sectors = []
+            if sector_times[i]:
+                marks = [start_times[i]] + sector_times[i] + ([end_times[i]] if complete else [])
+                sectors = np.diff(marks).tolist()
+            index.add({
+                "lap": first_lap + i,
+                "start": row_offset + int(starts[i]),
+                "stop": row_offset + int(stops[i]),
+                "start_time": float(start_times[i]),
+                "end_time": float(end_times[i]),
+                "lap_time": float(end_times[i] - start_times[i]),
+                "sectors": sectors,
+                "complete": complete,
+            })
+        return index
+
+    def lap_numbers(self, timestamps, channels):
+        """
+        Modo incremental: retorna o número da volta de cada amostra do bloco.
+        Blocos sem os canais necessários recebem a volta atual.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        size = len(timestamps)
+        if any(channels.get(name) is None for name in self.required_channels()):
+            return np.full(size, float(self.lap))
+
+        columns = {name: np.asarray(channels[name], dtype=np.float64) for name in self.required_channels()}
+        offset = 0
+        if self.last_sample is not None:
+            # Inclui a última amostra do bloco anterior para detectar passagens na emenda
+            last_time, last_values = self.last_sample
+            timestamps = np.concatenate(([last_time], timestamps))
+            columns = {name: np.concatenate(([last_values[name]], values)) for name, values in columns.items()}
+            offset = 1
+
+        rows, times = self.crossings(timestamps, columns)
+        if self.last_crossing_time is not None:
+            recent = times - self.last_crossing_time >= self.min_lap_time
+            rows, times = rows[recent], times[recent]
+        rows, times = debounce(rows, times, self.min_lap_time)
+
+        increments = np.zeros(len(timestamps), dtype=np.float64)
+        np.add.at(increments, rows, 1.0)
+        numbers = self.lap + np.cumsum(increments)
+        if len(times):
+            self.lap += len(times)
+            self.last_crossing_time = times[-1]
+        # Guarda a última amostra válida; um bloco sem nenhuma mantém a anterior
+        valid = np.flatnonzero(np.logical_and.reduce([np.isfinite(values) for values in columns.values()]))
+        if len(valid):
+            last = valid[-1]
+            self.last_sample = (timestamps[last], {name: values[last] for name, values in columns.items()})
+        return numbers[offset:]
+
+
+def build_segmenter(config):
+    """
+    Cria o segmentador a partir da configuração "lap_detection", por exemplo:
+    {"beacon_channel": "Beacon"} ou {"start_line": [lat1, lon1, lat2, lon2]}.
+    Retorna None se a detecção automática não estiver configurada.
+    """
+    if not config:
+        return None
+    return LapSegmenter(**config)
@@ -0,0 +1,90 @@
+# data/lod_pyramid.py
+
+import numpy as np
+
+# Quantas amostras (ou baldes do nível anterior) formam um balde do próximo nível
+LOD_FACTOR = 4
+# Abaixo desse número de amostras não vale a pena montar níveis reduzidos
+LOD_MIN_POINTS = 2000
+
+
+class LodPyramid:
+    """
+    Pirâmide de níveis de detalhe de uma série (x ordenado, y).
+
+    O nível 0 são as amostras originais. Cada nível seguinte agrupa LOD_FACTOR
+    baldes do nível anterior e guarda, por balde, o índice da amostra de menor
+    e de maior valor. Desenhar o mínimo e o máximo de cada balde, na ordem em
+    que ocorreram, preserva todos os picos (por exemplo, um pico de temperatura
+    de freio em uma única amostra) em qualquer nível de zoom.
+    """
+
+    def __init__(self, x, y, factor=LOD_FACTOR, min_points=LOD_MIN_POINTS):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.factor = factor
+        self.levels = []  # [(índices dos mínimos, índices dos máximos)] a partir do nível 1
+        self.build(min_points)
+
+    def build(self, min_points):
+        size = len(self.y)
+        if size <= min_points:
+            return
+        # NaN nunca pode ser escolhido como extremo
+        low = np.where(np.isnan(self.y), np.inf, self.y)
+        high = np.where(np.isnan(self.y), -np.inf, self.y)
+        min_index = max_index = np.arange(size)
+
+        while len(min_index) > min_points // 2:
+            min_index = self.reduce(min_index, low, np.argmin, np.inf)
+            max_index = self.reduce(max_index, high, np.argmax, -np.inf)
+            self.levels.append((min_index, max_index))
+
+    def reduce(self, indices, values, choose, fill):
+        """
+        Agrupa `indices` em baldes de `factor` e escolhe o extremo de cada balde.
+        """
+        buckets = -(-len(indices) // self.factor)
+        padded = np.full(buckets * self.factor, indices[-1])
+        padded[:len(indices)] = indices
+        candidates = values[padded]
+        candidates[len(indices):] = fill
+        chosen = choose(candidates.reshape(buckets, self.factor), axis=1)
+        return padded.reshape(buckets, self.factor)[np.arange(buckets), chosen]
+
+    def bucket_size(self, level):
+        return self.factor ** level
+
+    def select(self, x_start, x_stop, pixels):
+        """
+        Retorna (x, y, nível) do trecho visível [x_start, x_stop] no nível mais
+        grosso que ainda tenha pelo menos um balde por pixel. Inclui uma amostra
+        além de cada borda para a linha continuar até fora da tela.
+        """
+        size = len(self.x)
+        first = max(int(np.searchsorted(self.x, x_start, side='left')) - 1, 0)
+        last = min(int(np.searchsorted(self.x, x_stop, side='right')) + 1, size)
+        visible = last - first
+        pixels = max(int(pixels), 1)
+
+        level = 0
+        while level < len(self.levels) and visible / self.bucket_size(level) > pixels:
+            level += 1
+        if level == 0:
+            return self.x[first:last], self.y[first:last], 0
+
+        bucket = self.bucket_size(level)
+        min_index, max_index = self.levels[level - 1]
+        first_bucket, last_bucket = first // bucket, min(-(-last // bucket), len(min_index))
+        low = min_index[first_bucket:last_bucket]
+        high = max_index[first_bucket:last_bucket]
+        # Mínimo e máximo de cada balde na ordem em que ocorreram
+        indices = np.empty(2 * len(low), dtype=np.int64)
+        indices[0::2] = np.minimum(low, high)
+        indices[1::2] = np.maximum(low, high)
+        # Extremidades da série, para que os limites do gráfico não mudem com o nível
+        if first_bucket == 0:
+            indices = np.concatenate(([0], indices))
+        if last_bucket == len(min_index):
+            indices = np.append(indices, size - 1)
+        return self.x[indices], self.y[indices], level
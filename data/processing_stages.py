@@ -0,0 +1,204 @@
+# data/processing_stages.py
+
+import warnings
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class ProcessingStage:
+    """
+    Etapa do pipeline do DataProcessor. Recebe um SampleBlock e devolve o bloco
+    transformado, operando sobre arrays inteiros (vetorizado).
+    """
+
+    def process(self, block):
+        return block
+
+    def reset(self):
+        """Descarta o estado acumulado entre blocos (filtros)."""
+
+
+class UnitConversion(ProcessingStage):
+    """
+    Conversão linear de unidade: saída = valor * scale + offset.
+    """
+
+    def __init__(self, channel, scale=1.0, offset=0.0, target=None):
+        self.channel = channel
+        self.scale = scale
+        self.offset = offset
+        self.target = target or channel
+
+    def process(self, block):
+        values = block.channels.get(self.channel)
+        if values is not None:
+            block.channels[self.target] = values * self.scale + self.offset
+        return block
+
+
+class Calibration(ProcessingStage):
+    """
+    Polinômio de calibração (coeficientes do maior para o menor grau, como em np.polyval).
+    """
+
+    def __init__(self, channel, coefficients, target=None):
+        self.channel = channel
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.target = target or channel
+
+    def process(self, block):
+        values = block.channels.get(self.channel)
+        if values is not None:
+            block.channels[self.target] = np.polyval(self.coefficients, values)
+        return block
+
+
+class MovingAverage(ProcessingStage):
+    """
+    Média móvel de `window` amostras. As últimas amostras de cada bloco são
+    guardadas para que o filtro seja contínuo entre blocos. Amostras ausentes
+    (NaN) são ignoradas: cada saída é a média das amostras válidas da janela, e
+    só é NaN quando a janela inteira está vazia.
+    """
+
+    def __init__(self, channel, window, target=None):
+        self.channel = channel
+        self.window = int(window)
+        self.target = target or channel
+        self.history = np.empty(0)
+
+    def reset(self):
+        self.history = np.empty(0)
+
+    def process(self, block):
+        values = block.channels.get(self.channel)
+        if values is None or len(values) == 0:
+            return block
+
+        data = np.concatenate((self.history, values))
+        valid = ~np.isnan(data)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(valid, data, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(valid)))
+        end = np.arange(len(self.history), len(data)) + 1
+        start = np.maximum(end - self.window, 0)
+        count = counts[end] - counts[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block.channels[self.target] = np.where(count > 0, (sums[end] - sums[start]) / count, np.nan)
+        self.history = data[-(self.window - 1):] if self.window > 1 else np.empty(0)
+        return block
+
+
+class MedianFilter(ProcessingStage):
+    """
+    Filtro de mediana de `window` amostras, contínuo entre blocos. Enquanto não há
+    histórico suficiente, a primeira amostra válida é repetida. Amostras ausentes
+    (NaN) são ignoradas: cada saída é a mediana das amostras válidas da janela, e
+    só é NaN quando a janela inteira está vazia.
+    """
+
+    def __init__(self, channel, window, target=None):
+        self.channel = channel
+        self.window = int(window)
+        self.target = target or channel
+        self.history = None
+
+    def reset(self):
+        self.history = None
+
+    def process(self, block):
+        values = block.channels.get(self.channel)
+        if values is None or len(values) == 0:
+            return block
+
+        if self.history is None:
+            valid = values[~np.isnan(values)]
+            if len(valid) == 0:
+                # Ainda sem nenhuma amostra válida para iniciar o histórico
+                block.channels[self.target] = np.full(len(values), np.nan)
+                return block
+            self.history = np.full(self.window - 1, valid[0])
+        data = np.concatenate((self.history, values))
+        windows = sliding_window_view(data, self.window)
+        if np.isnan(data).any():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # Janela inteira sem dados resulta em NaN
+                block.channels[self.target] = np.nanmedian(windows, axis=1)
+        else:
+            block.channels[self.target] = np.median(windows, axis=1)
+        self.history = data[len(data) - (self.window - 1):]
+        return block
+
+
+class Decimation(ProcessingStage):
+    """
+    Mantém uma a cada `factor` amostras do bloco inteiro (todos os canais),
+    respeitando a fase entre blocos consecutivos.
+    """
+
+    def __init__(self, factor):
+        self.factor = int(factor)
+        self.phase = 0  # Amostras a pular no início do próximo bloco
+
+    def reset(self):
+        self.phase = 0
+
+    def process(self, block):
+        size = len(block)
+        if self.factor <= 1 or size == 0:
+            return block
+        indices = np.arange(self.phase, size, self.factor)
+        self.phase = (self.phase - size) % self.factor
+        return block.take(indices)
+
+
+class DerivedChannel(ProcessingStage):
+    """
+    Canal calculado a partir de outros canais. `inputs` mapeia nomes de variáveis
+    para canais e `function` recebe esses arrays como argumentos nomeados.
+    Para configuração em JSON, `expression` (ex.: "v * i") pode substituir `function`.
+    """
+
+    def __init__(self, name, inputs, function=None, expression=None):
+        if function is None and expression is None:
+            raise ValueError("DerivedChannel requer 'function' ou 'expression'.")
+        self.name = name
+        self.inputs = dict(inputs)
+        self.function = function
+        if function is None:
+            code = compile(expression, f"<canal derivado {name}>", "eval")
+            self.function = lambda **arrays: eval(code, {"__builtins__": {}, "np": np}, arrays)
+
+    def process(self, block):
+        if not all(channel in block.channels for channel in self.inputs.values()):
+            return block
+        arrays = {variable: block.channels[channel] for variable, channel in self.inputs.items()}
+        result = np.asarray(self.function(**arrays), dtype=np.float64)
+        block.channels[self.name] = np.broadcast_to(result, block.timestamps.shape).copy()
+        return block
+
+
+STAGE_TYPES = {
+    "unit": UnitConversion,
+    "calibration": Calibration,
+    "moving_average": MovingAverage,
+    "median": MedianFilter,
+    "decimate": Decimation,
+    "derived": DerivedChannel,
+}
+
+
+def build_stages(config):
+    """
+    Cria as etapas a partir da configuração (lista de dicts com a chave "type"),
+    por exemplo: {"type": "moving_average", "channel": "DHT - Temperatura", "window": 5}.
+    """
+    stages = []
+    for entry in config:
+        options = dict(entry)
+        stage_type = options.pop("type", None)
+        if stage_type not in STAGE_TYPES:
+            print(f"Etapa de processamento desconhecida ignorada: {stage_type}")
+            continue
+        stages.append(STAGE_TYPES[stage_type](**options))
+    return stages
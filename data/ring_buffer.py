@@ -0,0 +1,99 @@
+# data/ring_buffer.py
+
+import numpy as np
+
+# Capacidade padrão dos buffers dos gráficos ao vivo (em amostras)
+DEFAULT_CAPACITY = 100_000
+
+
+class RingBuffer:
+    """
+    Buffer circular de capacidade fixa apoiado em NumPy, com várias colunas
+    (por exemplo x e y) que compartilham o mesmo cursor de escrita.
+
+    Cada amostra é escrita duas vezes (na posição i e na posição i + capacidade),
+    de forma que as últimas N amostras sempre formam uma fatia contígua da
+    memória. Assim `view()` devolve visões sem cópia que podem ser entregues
+    diretamente ao pyqtgraph.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, columns=2, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("A capacidade do buffer deve ser positiva.")
+        self.capacity = int(capacity)
+        self.columns = int(columns)
+        self._data = np.zeros((self.columns, 2 * self.capacity), dtype=dtype)
+        self._head = 0  # Próxima posição de escrita em [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """Descarta todas as amostras sem realocar memória."""
+        self._head = 0
+        self._size = 0
+
+    def append(self, *values):
+        """
+        Adiciona uma amostra (um valor por coluna).
+        """
+        if len(values) != self.columns:
+            raise ValueError(f"Esperado {self.columns} valores, recebido {len(values)}.")
+        head = self._head
+        column = self._data
+        for index, value in enumerate(values):
+            column[index, head] = value
+            column[index, head + self.capacity] = value
+        self._head = (head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, *columns):
+        """
+        Adiciona um bloco de amostras (um array por coluna, todos do mesmo tamanho).
+        Se o bloco for maior que a capacidade, apenas as últimas amostras são mantidas.
+        """
+        if len(columns) != self.columns:
+            raise ValueError(f"Esperado {self.columns} colunas, recebido {len(columns)}.")
+        arrays = [np.asarray(values, dtype=self._data.dtype).ravel() for values in columns]
+        count = len(arrays[0])
+        if any(len(values) != count for values in arrays):
+            raise ValueError("Todas as colunas devem ter o mesmo número de amostras.")
+        if count == 0:
+            return
+        if count > self.capacity:
+            arrays = [values[-self.capacity:] for values in arrays]
+            self._head = (self._head + count - self.capacity) % self.capacity
+            count = self.capacity
+
+        head = self._head
+        first = min(count, self.capacity - head)
+        rest = count - first
+        for index, values in enumerate(arrays):
+            row = self._data[index]
+            row[head:head + first] = values[:first]
+            row[head + self.capacity:head + self.capacity + first] = values[:first]
+            if rest:
+                row[:rest] = values[first:]
+                row[self.capacity:self.capacity + rest] = values[first:]
+
+        self._head = (head + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def view(self, last=None):
+        """
+        Retorna uma tupla com uma visão contígua (somente leitura) por coluna,
+        em ordem cronológica. Se `last` for informado, retorna apenas as últimas
+        `last` amostras.
+
+        As visões apontam para a memória interna do buffer: escritas posteriores
+        podem sobrescrevê-las, portanto devem ser consumidas antes da próxima escrita.
+        """
+        size = self._size if last is None else min(int(last), self._size)
+        start = (self._head - size) % self.capacity
+        views = []
+        for index in range(self.columns):
+            view = self._data[index, start:start + size]
+            view.flags.writeable = False
+            views.append(view)
+        return tuple(views)
@@ -0,0 +1,116 @@
+# data/sample_block.py
+
+import time
+import numpy as np
+
+# Chaves reservadas nas amostras recebidas da API
+TIMESTAMP_KEY = "timestamp"  # Horário da amostra no carro
+SEQUENCE_KEY = "seq"  # Número de sequência gerado pelo carro
+RECEIVED_AT_KEY = "received_at"  # Horário de chegada no notebook (preenchido pelo APIService)
+RESERVED_KEYS = (TIMESTAMP_KEY, SEQUENCE_KEY, RECEIVED_AT_KEY)
+
+
+class SampleBlock:
+    """
+    Bloco colunar de amostras: um array de tempos (do carro), um array opcional de
+    números de sequência, um array com o horário de chegada no notebook e um array
+    por canal (sensor), todos com o mesmo tamanho. `source` identifica o endpoint
+    (ECU) de origem quando há mais de um.
+    """
+
+    def __init__(self, timestamps, channels, sequence=None, received_at=None, source=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.sequence = None if sequence is None else np.asarray(sequence, dtype=np.int64)
+        if received_at is None:
+            received_at = np.full(len(self.timestamps), np.nan)
+        self.received_at = np.broadcast_to(np.asarray(received_at, dtype=np.float64), self.timestamps.shape)
+        self.channels = {name: np.asarray(values, dtype=np.float64) for name, values in channels.items()}
+        self.source = source
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def latency(self):
+        """
+        Latência de transporte por amostra (chegada no notebook - horário no carro), em segundos.
+        Só é significativa se os relógios do carro e do notebook estiverem sincronizados.
+        """
+        return self.received_at - self.timestamps
+
+    def copy(self):
+        """
+        Cópia rasa: um novo dict de canais apontando para os mesmos arrays. Permite
+        que as etapas de processamento substituam canais sem afetar outros
+        consumidores do mesmo bloco (por exemplo, o gravador de sessão).
+        """
+        return SampleBlock(self.timestamps, dict(self.channels), self.sequence, self.received_at, self.source)
+
+    def take(self, indices):
+        """
+        Retorna um novo bloco apenas com as amostras selecionadas (máscara booleana ou índices).
+        """
+        return SampleBlock(
+            self.timestamps[indices],
+            {name: values[indices] for name, values in self.channels.items()},
+            None if self.sequence is None else self.sequence[indices],
+            self.received_at[indices],
+            self.source,
+        )
+
+    @classmethod
+    def from_records(cls, records, received_at=None):
+        """
+        Converte uma lista de amostras no formato {"timestamp": ..., "seq": ..., sensor: valor}
+        em um bloco colunar. Canais ausentes em alguma amostra são preenchidos com NaN e
+        canais não numéricos são ignorados. Amostras sem "timestamp" recebem o horário
+        de chegada, lido de "received_at" na própria amostra ou do parâmetro `received_at`.
+        """
+        count = len(records)
+        if received_at is None:
+            received_at = time.time()
+        arrival = np.fromiter(
+            (record.get(RECEIVED_AT_KEY, received_at) for record in records), dtype=np.float64, count=count
+        )
+
+        # União ordenada dos nomes de canais presentes nas amostras
+        names = list(dict.fromkeys(name for record in records for name in record))
+        has_sequence = SEQUENCE_KEY in names
+        names = [name for name in names if name not in RESERVED_KEYS]
+
+        timestamps = np.fromiter(
+            (record.get(TIMESTAMP_KEY, arrival[index]) for index, record in enumerate(records)),
+            dtype=np.float64, count=count
+        )
+        sequence = None
+        if has_sequence:
+            sequence = np.fromiter(
+                (record.get(SEQUENCE_KEY, -1) for record in records), dtype=np.int64, count=count
+            )
+
+        channels = {}
+        for name in names:
+            try:
+                channels[name] = np.array([record.get(name, np.nan) for record in records], dtype=np.float64)
+            except (TypeError, ValueError):
+                print(f"Canal '{name}' ignorado: valores não numéricos.")
+        return cls(timestamps, channels, sequence, arrival)
+
+
+def parse_batch_payload(payload, received_at=None):
+    """
+    Interpreta a resposta do endpoint em modo de lote. São aceitos os formatos
+    {"cursor": n, "samples": [...]} e uma lista simples de amostras.
+    Retorna o bloco de amostras e o cursor para a próxima requisição (ou None).
+    """
+    if isinstance(payload, dict):
+        records = payload.get("samples", [])
+        cursor = payload.get("cursor")
+    else:
+        records = payload
+        cursor = None
+
+    block = SampleBlock.from_records(records, received_at=received_at)
+    if cursor is None and block.sequence is not None and len(block):
+        cursor = int(block.sequence[-1])
+    return block, cursor
@@ -0,0 +1,51 @@
+# data/sequence_tracker.py
+
+import numpy as np
+
+
+class SequenceTracker:
+    """
+    Acompanha os números de sequência enviados pelo carro para detectar lacunas
+    (amostras perdidas no rádio) e duplicatas/amostras fora de ordem.
+    """
+
+    def __init__(self, reset_window=1000):
+        # Uma queda maior que reset_window é tratada como reinício do contador no carro
+        self.reset_window = reset_window
+        self.last_sequence = None
+        self.gaps = 0
+        self.missing = 0
+        self.duplicates = 0
+        self.resets = 0
+
+    def filter(self, block):
+        """
+        Remove do bloco as amostras duplicadas ou fora de ordem e contabiliza as lacunas.
+        Blocos sem números de sequência são devolvidos sem alteração.
+        """
+        sequence = block.sequence
+        if sequence is None or len(sequence) == 0:
+            return block
+
+        if self.last_sequence is not None and sequence[0] < self.last_sequence - self.reset_window:
+            print(f"Contador de sequência reiniciado ({self.last_sequence} -> {sequence[0]}).")
+            self.resets += 1
+            self.last_sequence = None
+
+        previous = sequence[0] - 1 if self.last_sequence is None else self.last_sequence
+        # Maior número de sequência já visto antes de cada amostra
+        running_max = np.maximum.accumulate(np.concatenate(([previous], sequence[:-1])))
+        keep = sequence > running_max
+        self.duplicates += int(len(sequence) - np.count_nonzero(keep))
+
+        kept = sequence[keep]
+        if len(kept):
+            steps = np.diff(np.concatenate(([previous], kept)))
+            holes = steps[steps > 1] - 1
+            self.gaps += len(holes)
+            self.missing += int(holes.sum())
+            self.last_sequence = int(kept[-1])
+
+        if np.all(keep):
+            return block
+        return block.take(keep)
@@ -0,0 +1,83 @@
+# data/session_format.py
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+# Formato de sessão gravada: um diretório por sessão com um arquivo binário
+# (append-only, little-endian) por coluna e um meta.json descrevendo as colunas.
+#
+#   <sessão>/meta.json
+#   <sessão>/timestamp.f8      horário de cada amostra no carro
+#   <sessão>/seq.i8            número de sequência (-1 quando ausente)
+#   <sessão>/received_at.f8    horário de chegada no notebook
+#   <sessão>/ch_000.f8 ...     um arquivo por canal (nome real no meta.json)
+#   <sessão>/laps.json         índice de voltas (data/lap_index.py)
+#
+# Após uma queda, as colunas podem ter tamanhos diferentes; o número de linhas
+# válidas da sessão é o menor entre eles.
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+TIME_COLUMNS = {
+    "timestamp": ("timestamp.f8", "<f8"),
+    "seq": ("seq.i8", "<i8"),
+    "received_at": ("received_at.f8", "<f8"),
+}
+CHANNEL_DTYPE = "<f8"
+
+
+def new_session_path(base_dir):
+    """
+    Retorna o caminho de um novo diretório de sessão, nomeado pela data e hora atuais.
+    """
+    name = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    path = os.path.join(base_dir, name)
+    suffix = 1
+    while os.path.exists(path):
+        path = os.path.join(base_dir, f"{name}_{suffix}")
+        suffix += 1
+    return path
+
+
+def channel_file_name(index):
+    return f"ch_{index:03d}.f8"
+
+
+def write_meta(session_path, meta):
+    """
+    Grava o meta.json de forma atômica (arquivo temporário + rename).
+    """
+    temp_path = os.path.join(session_path, META_FILE + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, os.path.join(session_path, META_FILE))
+
+
+def read_meta(session_path):
+    with open(os.path.join(session_path, META_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def new_meta():
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "columns": {name: {"file": file_name, "dtype": dtype} for name, (file_name, dtype) in TIME_COLUMNS.items()},
+        "channels": {},
+    }
+
+
+def column_length(path, dtype):
+    """
+    Número de amostras completas gravadas em um arquivo de coluna.
+    """
+    try:
+        return os.path.getsize(path) // np.dtype(dtype).itemsize
+    except OSError:
+        return 0
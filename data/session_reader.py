@@ -0,0 +1,175 @@
+# data/session_reader.py
+
+import os
+
+import numpy as np
+
+from data import session_format
+from data.lap_index import LapIndex, LapIndexBuilder, LAP_CHANNEL, SECTOR_CHANNEL
+from data.lap_segmentation import LapSegmenter, BEACON_CHANNEL, build_segmenter
+
+
+class SessionReader:
+    """
+    Leitor de sessões gravadas pelo SessionRecorder. Cada coluna é aberta como
+    np.memmap somente quando usada, e apenas as fatias efetivamente acessadas
+    são carregadas do disco pelo sistema operacional. Abrir uma sessão de
+    várias horas é instantâneo.
+    """
+
+    def __init__(self, session_path):
+        self.session_path = session_path
+        self.meta = session_format.read_meta(session_path)
+        self.columns = dict(self.meta["columns"])
+        self.columns.update(self.meta["channels"])
+        self._maps = {}
+        self._lap_index = None
+        self._lap_times = {}
+
+        # Após uma queda as colunas podem ter tamanhos diferentes: vale o menor
+        lengths = [
+            session_format.column_length(os.path.join(session_path, info["file"]), info["dtype"])
+            for info in self.columns.values()
+        ]
+        self.row_count = min(lengths) if lengths else 0
+
+    @property
+    def channels(self):
+        return list(self.meta["channels"])
+
+    @property
+    def name(self):
+        return os.path.basename(os.path.normpath(self.session_path))
+
+    def column(self, name):
+        """
+        Retorna a coluna inteira como np.memmap somente leitura (sem ler o arquivo).
+        """
+        if name not in self._maps:
+            info = self.columns[name]
+            if self.row_count == 0:
+                self._maps[name] = np.empty(0, dtype=info["dtype"])
+            else:
+                self._maps[name] = np.memmap(
+                    os.path.join(self.session_path, info["file"]),
+                    dtype=info["dtype"], mode="r", shape=(self.row_count,)
+                )
+        return self._maps[name]
+
+    def timestamps(self, start=0, stop=None):
+        return self.column("timestamp")[start:stop]
+
+    def channel(self, name, start=0, stop=None):
+        return self.column(name)[start:stop]
+
+    @property
+    def lap_index(self):
+        """
+        Índice de voltas gravado junto com a sessão. Se a sessão não tiver índice
+        (ou se ele não cobrir o final, após uma queda), as voltas restantes são
+        obtidas varrendo apenas o trecho não indexado.
+        """
+        if self._lap_index is None:
+            index = LapIndex.load(self.session_path) or LapIndex()
+            index = index.truncated(self.row_count)
+            if self.row_count and (not len(index) or index.laps[-1]["stop"] < self.row_count):
+                # A última volta indexada estava em andamento: é refeita junto com o trecho restante
+                last = index.laps[-1] if len(index) else None
+                index = LapIndex(index.laps[:-1])
+                for lap in self.scan_laps(last["start"] if last else 0, last["lap"] if last else 1):
+                    index.add(lap)
+            self._lap_index = index
+        return self._lap_index
+
+    def scan_laps(self, start, first_lap=1):
+        """
+        Monta as voltas a partir da linha `start` (início da volta `first_lap`) com
+        o segmentador usado na gravação (configuração "lap_detection" do meta.json),
+        ou varrendo o canal de voltas (ou o beacon, se não houver canal de voltas).
+        Sem nenhum deles, todo o trecho é considerado uma única volta.
+        """
+        segmenter = build_segmenter(self.meta.get("lap_detection"))
+        if segmenter is not None and all(name in self.columns for name in segmenter.required_channels()):
+            channels = {name: self.channel(name, start) for name in segmenter.required_channels()}
+            return segmenter.segment(self.timestamps(start), channels, row_offset=start, first_lap=first_lap).laps
+        if LAP_CHANNEL not in self.columns and BEACON_CHANNEL in self.columns:
+            segmenter = LapSegmenter(beacon_channel=BEACON_CHANNEL)
+            return segmenter.segment(self.timestamps(start), {BEACON_CHANNEL: self.channel(BEACON_CHANNEL, start)},
+                                     row_offset=start, first_lap=first_lap).laps
+        if LAP_CHANNEL not in self.columns:
+            timestamps = self.timestamps(start)
+            return [{
+                "lap": first_lap, "start": start, "stop": self.row_count,
+                "start_time": float(timestamps[0]), "end_time": float(timestamps[-1]),
+                "lap_time": float(timestamps[-1] - timestamps[0]), "sectors": [], "complete": False,
+            }]
+        channels = {LAP_CHANNEL: self.channel(LAP_CHANNEL, start)}
+        if SECTOR_CHANNEL in self.columns:
+            channels[SECTOR_CHANNEL] = self.channel(SECTOR_CHANNEL, start)
+        builder = LapIndexBuilder()
+        builder.add_block(start, self.timestamps(start), channels)
+        return builder.finish().laps
+
+    def resegment(self, segmenter, save=False):
+        """
+        Refaz a segmentação de voltas da sessão inteira com outro segmentador
+        (por exemplo, depois de mover a linha de chegada). As colunas necessárias
+        são lidas por memmap e processadas em uma única passada vetorizada.
+        """
+        missing = [name for name in segmenter.required_channels() if name not in self.columns]
+        if missing:
+            raise KeyError(f"Canais ausentes na sessão: {', '.join(missing)}")
+        channels = {name: self.channel(name) for name in segmenter.required_channels()}
+        self._lap_index = segmenter.segment(self.timestamps(), channels)
+        self._lap_times.clear()
+        if save:
+            self._lap_index.save(self.session_path)
+        return self._lap_index
+
+    def laps(self):
+        """
+        Retorna a lista de voltas como tuplas (número, linha inicial, linha final).
+        """
+        return [(lap["lap"], lap["start"], lap["stop"]) for lap in self.lap_index]
+
+    def lap_info(self, lap_number):
+        """
+        Retorna o registro do índice da volta (tempo de volta, setores...) ou None.
+        """
+        return self.lap_index.get(lap_number)
+
+    def lap_slice(self, lap_number):
+        """
+        Retorna (linha inicial, linha final) da volta ou None se ela não existir.
+        """
+        lap = self.lap_index.get(lap_number)
+        if lap is None:
+            return None
+        return lap["start"], lap["stop"]
+
+    def lap_times(self, lap_number):
+        """
+        Retorna o tempo desde o início da volta em cada amostra (ou None).
+        O array é guardado em cache e compartilhado por todos os canais da volta.
+        """
+        bounds = self.lap_slice(lap_number)
+        if bounds is None:
+            return None
+        if bounds not in self._lap_times:
+            timestamps = self.timestamps(*bounds)
+            self._lap_times[bounds] = timestamps - timestamps[0]
+        return self._lap_times[bounds]
+
+    def lap_channel(self, lap_number, channel):
+        """
+        Retorna (tempo desde o início da volta, valores) de um canal em uma volta.
+        Apenas a fatia da volta é lida do disco.
+        """
+        bounds = self.lap_slice(lap_number)
+        if bounds is None or channel not in self.columns:
+            return None
+        return self.lap_times(lap_number), self.channel(channel, *bounds)
+
+    def close(self):
+        self._maps.clear()
+        self._lap_times.clear()
@@ -0,0 +1,196 @@
+# data/session_recorder.py
+
+from PySide6.QtCore import QObject, QThread
+import os
+import queue
+import time
+
+import numpy as np
+
+from data.sample_block import SampleBlock
+from data import session_format
+from data.lap_index import LapIndexBuilder
+
+
+class SessionRecorder(QObject):
+    """
+    Grava toda a telemetria recebida em um arquivo de sessão colunar, append-only.
+
+    record_data/record_block apenas colocam as amostras em uma fila (devem ser
+    conectados com Qt.DirectConnection, na thread da ingestão). Uma thread própria
+    converte as amostras em colunas, grava em lote a cada `flush_interval` e faz
+    fsync a cada `fsync_interval`, limitando a perda em caso de queda a poucos segundos.
+    Com um `lap_segmenter`, as voltas do índice são detectadas pelo beacon/GPS.
+    """
+
+    # Tamanho do buffer de escrita de cada arquivo de coluna
+    WRITE_BUFFER_SIZE = 1 << 20
+
+    def __init__(self, base_dir, flush_interval=0.5, fsync_interval=2.0, lap_segmenter=None, parent=None):
+        super().__init__(parent)
+        self.base_dir = base_dir
+        self.lap_segmenter = lap_segmenter
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.queue = queue.Queue()
+        self.running = False
+        self.session_path = None  # Criado na chegada da primeira amostra
+        self.meta = None
+        self.files = {}
+        self.rows_written = 0
+        self.lap_builder = None
+
+    def start(self):
+        """
+        Inicia a thread de gravação.
+        """
+        self.running = True
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.thread.started.connect(self.run)
+        self.thread.start()
+
+    def record_data(self, data):
+        """
+        Enfileira uma amostra única (dict) para gravação.
+        """
+        self.queue.put(data)
+
+    def record_block(self, block):
+        """
+        Enfileira um SampleBlock para gravação.
+        """
+        self.queue.put(block)
+
+    def run(self):
+        """
+        Laço de gravação: acumula itens da fila e grava em lote periodicamente.
+        """
+        pending = []
+        last_flush = last_sync = time.monotonic()
+        while self.running or not self.queue.empty():
+            try:
+                pending.append(self.queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if pending and (now - last_flush >= self.flush_interval or not self.running):
+                self.write_items(pending)
+                pending = []
+                last_flush = now
+            if now - last_sync >= self.fsync_interval:
+                self.sync()
+                last_sync = now
+
+        if pending:
+            self.write_items(pending)
+        self.close_files()
+
+    def write_items(self, items):
+        """
+        Converte os itens enfileirados em blocos (agrupando dicts consecutivos) e os grava.
+        """
+        records = []
+        for item in items:
+            if isinstance(item, SampleBlock):
+                if records:
+                    self.write_block(SampleBlock.from_records(records))
+                    records = []
+                self.write_block(item)
+            else:
+                records.append(item)
+        if records:
+            self.write_block(SampleBlock.from_records(records))
+
+    def write_block(self, block):
+        """
+        Acrescenta um bloco ao final de todas as colunas da sessão. Canais ausentes
+        no bloco recebem NaN.
+        """
+        size = len(block)
+        if size == 0:
+            return
+        if self.session_path is None:
+            self.open_session()
+
+        for channel in block.channels:
+            if channel not in self.meta["channels"]:
+                self.add_channel(channel)
+
+        sequence = block.sequence if block.sequence is not None else np.full(size, -1)
+        columns = {"timestamp": block.timestamps, "seq": sequence, "received_at": block.received_at}
+        for name, info in self.meta["columns"].items():
+            self.files[name].write(np.asarray(columns[name], dtype=info["dtype"]).tobytes())
+
+        for channel, info in self.meta["channels"].items():
+            values = block.channels.get(channel)
+            if values is None:
+                values = np.full(size, np.nan)
+            self.files[channel].write(np.asarray(values, dtype=info["dtype"]).tobytes())
+
+        # Índice de voltas: regravado a cada volta concluída
+        if self.lap_builder.add_block(self.rows_written, block.timestamps, block.channels):
+            self.lap_builder.snapshot().save(self.session_path)
+        self.rows_written += size
+
+    def open_session(self):
+        """
+        Cria o diretório da sessão e os arquivos das colunas de tempo.
+        """
+        self.session_path = session_format.new_session_path(self.base_dir)
+        os.makedirs(self.session_path)
+        self.meta = session_format.new_meta()
+        if self.lap_segmenter is not None:
+            # Usado pelo SessionReader para refazer as voltas não indexadas após uma queda
+            self.meta["lap_detection"] = self.lap_segmenter.to_config()
+        self.lap_builder = LapIndexBuilder(segmenter=self.lap_segmenter)
+        for name, info in self.meta["columns"].items():
+            self.files[name] = open(os.path.join(self.session_path, info["file"]), "ab",
+                                    buffering=self.WRITE_BUFFER_SIZE)
+        session_format.write_meta(self.session_path, self.meta)
+        print(f"Gravando sessão em: {self.session_path}")
+
+    def add_channel(self, channel):
+        """
+        Cria o arquivo de um canal novo, preenchendo com NaN as linhas já gravadas.
+        """
+        info = {
+            "file": session_format.channel_file_name(len(self.meta["channels"])),
+            "dtype": session_format.CHANNEL_DTYPE,
+        }
+        handle = open(os.path.join(self.session_path, info["file"]), "ab", buffering=self.WRITE_BUFFER_SIZE)
+        remaining = self.rows_written
+        while remaining > 0:
+            chunk = min(remaining, 1 << 20)
+            handle.write(np.full(chunk, np.nan, dtype=info["dtype"]).tobytes())
+            remaining -= chunk
+        self.files[channel] = handle
+        self.meta["channels"][channel] = info
+        session_format.write_meta(self.session_path, self.meta)
+
+    def sync(self):
+        """
+        Descarrega os buffers e força a escrita em disco (fsync).
+        """
+        for handle in self.files.values():
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def close_files(self):
+        self.sync()
+        if self.lap_builder is not None:
+            self.lap_builder.finish().save(self.session_path)
+            self.lap_builder = None
+        for handle in self.files.values():
+            handle.close()
+        self.files = {}
+
+    def stop(self):
+        """
+        Grava o que estiver pendente e encerra a thread.
+        """
+        self.running = False
+        if hasattr(self, 'thread') and self.thread.isRunning():
+            self.thread.quit()
+            self.thread.wait()
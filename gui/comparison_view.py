@@ -1,101 +1,151 @@
 # gui/comparison_view.py
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSizePolicy,
-    QGroupBox, QColorDialog, QMessageBox, QGridLayout, QCheckBox, QDialog
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QGroupBox, QColorDialog, QMessageBox, QGridLayout, QCheckBox, QFileDialog, QComboBox
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor
 from pyqtgraph import PlotWidget, mkPen
 import pyqtgraph as pg
-import random
 import numpy as np
 import os
-import json
-from datetime import datetime
 
 from gui.sensor_selection import SensorSelectionWidget
 from gui.flow_layout import FlowLayout
-from gui.styles import DARK_THEME, LIGHT_THEME
+from data.session_reader import SessionReader
+from data.lap_segmentation import LapSegmenter, build_segmenter
+from data.lap_alignment import LapAligner, AXIS_TIME, AXIS_DISTANCE, AXIS_FRACTION
+from gui.lod_controller import LodController
+from gui.render_backend import apply_render_backend
+
+
+# Máximo de atualizações por segundo do cursor de leitura dos gráficos
+CROSSHAIR_RATE_LIMIT = 60
+
+# Eixos x da comparação: (texto no seletor, eixo, rótulo do eixo)
+X_AXIS_OPTIONS = [
+    ("Tempo", AXIS_TIME, "Tempo (s)"),
+    ("Distância", AXIS_DISTANCE, "Distância (m)"),
+    ("Fração da Volta", AXIS_FRACTION, "Fração da Volta"),
+]
+
+
+def format_lap_time(seconds):
+    """Formata um tempo em segundos como m:ss.sss."""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:06.3f}"
 
 
 class PlotMixin:
     def get_y_at_x(self, curve, x):
         """
         Retorna o valor y correspondente ao ponto x na curva, interpolando se necessário.
-        """
-        x_data = curve.x_data
-        y_data = curve.y_data
-        if x < x_data[0] or x > x_data[-1]:
-            return None  # Fora do intervalo de dados
-
-        # Encontrar o índice i tal que x_data[i] <= x <= x_data[i+1]
-        for i in range(len(x_data) - 1):
-            if x_data[i] <= x <= x_data[i + 1]:
-                x0, y0 = x_data[i], y_data[i]
-                x1, y1 = x_data[i + 1], y_data[i + 1]
-                if x1 - x0 == 0:
-                    return y0  # Evitar divisão por zero
-                # Interpolação linear
-                return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
-        return None
-
-    def on_mouse_moved(self, pos):
+        Usa busca binária (np.searchsorted) sobre os dados da curva, que devem estar
+        ordenados em x.
+        """
+        return self.get_y_at_x_batch({None: curve}, x)[None]
+
+    def get_y_at_x_batch(self, curves, x):
+        """
+        Avalia todas as curvas visíveis no ponto x de uma vez. Retorna {chave: y ou None}.
+        Curvas que compartilham o mesmo array x (sensores da mesma volta) fazem uma
+        única busca binária.
+        """
+        results = {}
+        groups = {}
+        for key, curve in curves.items():
+            if not curve.isVisible() or getattr(curve, 'x_data', None) is None or len(curve.x_data) == 0:
+                results[key] = None
+                continue
+            groups.setdefault(id(curve.x_data), []).append((key, curve))
+
+        for members in groups.values():
+            x_data = members[0][1].x_data
+            if x < x_data[0] or x > x_data[-1]:
+                for key, _ in members:
+                    results[key] = None  # Fora do intervalo de dados
+                continue
+
+            # Índice i tal que x_data[i] <= x <= x_data[i+1]
+            i = min(int(np.searchsorted(x_data, x, side='right')) - 1, len(x_data) - 2)
+            if i < 0:
+                for key, curve in members:
+                    results[key] = float(curve.y_data[0])
+                continue
+            x0, x1 = x_data[i], x_data[i + 1]
+            fraction = (x - x0) / (x1 - x0) if x1 != x0 else 0.0  # Evitar divisão por zero
+            for key, curve in members:
+                y0, y1 = curve.y_data[i], curve.y_data[i + 1]
+                y = y0 + (y1 - y0) * fraction  # Interpolação linear
+                results[key] = None if np.isnan(y) else float(y)
+        return results
+
+    def connect_crosshair(self):
+        """
+        Conecta o movimento do mouse ao cursor com limite de taxa: eventos em
+        sequência são agrupados pelo SignalProxy e só o último é processado.
+        """
+        self.mouse_proxy = pg.SignalProxy(self.plot_widget.scene().sigMouseMoved,
+                                          rateLimit=CROSSHAIR_RATE_LIMIT, slot=self.on_mouse_moved)
+
+    def legend_text(self, key, x=None, y=None):
+        """
+        Monta o texto da legenda de (volta, sensor); o prefixo formatado é calculado uma única vez.
+        """
+        prefix = self.legend_prefixes.get(key)
+        if prefix is None:
+            lap, sensor = key
+            prefix = self.legend_prefixes[key] = f"{lap} - {sensor.replace('_', ' ').title()}"
+        if y is None:
+            return f"{prefix} - {self.x_readout}: N/A - Valor: N/A"
+        return f"{prefix} - {self.x_readout}: {x:.3f} - Valor: {y:.2f}"
+
+    def on_mouse_moved(self, event):
         """
         Atualiza as legendas com os valores correspondentes ao ponto x atual do mouse.
+        Recebe a posição diretamente ou a tupla de argumentos do SignalProxy.
+        Apenas os labels cujo texto mudou são alterados.
         """
+        pos = event[0] if isinstance(event, tuple) else event
         if self.plot_widget.sceneBoundingRect().contains(pos):
             mouse_point = self.plot_widget.plotItem.vb.mapSceneToView(pos)
             x = mouse_point.x()
 
-            # Mover a linha vertical para a posição x atual
+            # Mover a linha vertical para a posição x atual (e mostrá-la, se estava oculta)
             self.vLine.setPos(x)
+            self.vLine.setVisible(True)
 
-            # Iterar sobre todas as curvas para atualizar as legendas
-            for (lap, sensor), curve in self.curves.items():
-                y = self.get_y_at_x(curve, x)
-                if y is not None:
-                    self.legend_labels[(lap, sensor)].setText(
-                        f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: {x:.3f} - Valor: {y:.2f}")
-                else:
-                    self.legend_labels[(lap, sensor)].setText(
-                        f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: N/A - Valor: N/A")
+            # Avaliar todas as curvas de uma vez para atualizar as legendas
+            values = self.get_y_at_x_batch(self.curves, x)
         else:
-            # Resetar a linha vertical e todas as legendas
-            self.vLine.setPos(None)
-            for (lap, sensor), label in self.legend_labels.items():
-                label.setText(f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: N/A - Valor: N/A")
+            # Ocultar a linha vertical e resetar todas as legendas
+            self.vLine.setVisible(False)
+            x, values = None, {}
 
+        for key, label in self.legend_labels.items():
+            text = self.legend_text(key, x, values.get(key))
+            if label.text() != text:
+                label.setText(text)
 
-class FullscreenPlotWindow(QWidget, PlotMixin):
-    def __init__(self, curves, parent=None):
+
+class FullscreenPlotWindow(QWidget):
+    """
+    Janela de tela cheia da comparação de voltas. Em vez de copiar curvas e
+    legendas, a área do gráfico e a caixa de legenda da ComparisonView são
+    movidas para esta janela (mesmos itens, dados e pirâmides de detalhe) e
+    devolvidas ao fechar. Abrir a tela cheia não custa memória nem tempo de cópia.
+    """
+
+    closed = Signal()
+
+    def __init__(self, graph_box, legend_box, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Comparação de Voltas - Tela Cheia")
         self.setWindowFlags(self.windowFlags() | Qt.Window)
-        self.showFullScreen()
-
-        # Store reference to parent and main window
-        self.parent_widget = parent
-        self.main_window = parent.main_window if parent and hasattr(parent, 'main_window') else None
 
-        # Layout principal
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
-
-        # PlotWidget para tela cheia
-        self.plot_widget = PlotWidget(title="Comparação de Voltas - Tela Cheia")
-        self.plot_widget.setBackground('#ffe6e6')  # Cor inicial clara para o fundo do gráfico
-        self.plot_widget.setLabel('left', 'Valor', color='black')
-        self.plot_widget.setLabel('bottom', 'Tempo (s)', color='black')
-        self.plot_widget.getAxis('left').setTextPen('black')
-        self.plot_widget.getAxis('bottom').setTextPen('black')
-        self.plot_widget.getAxis('left').setPen('black')
-        self.plot_widget.getAxis('bottom').setPen('black')
-        self.plot_widget.setTitle("Comparação de Voltas - Tela Cheia", color='black')
-        self.plot_widget.showGrid(x=True, y=True)
-        self.plot_widget.setMouseEnabled(x=True, y=True)
-
-        main_layout.addWidget(self.plot_widget, stretch=5)
+        main_layout.addWidget(graph_box, stretch=5)
 
         # Botão para sair da tela cheia
         exit_fullscreen_button = QPushButton("Sair da Tela Cheia")
@@ -103,369 +153,19 @@ class FullscreenPlotWindow(QWidget, PlotMixin):
         exit_fullscreen_button.clicked.connect(self.close)
         main_layout.addWidget(exit_fullscreen_button, alignment=Qt.AlignRight)
 
-        # Caixa de legenda compacta com FlowLayout
-        self.legend_box = QGroupBox("Legenda das Linhas")
-        self.legend_layout = FlowLayout()
-        self.legend_box.setLayout(self.legend_layout)
-        self.legend_box.setStyleSheet("font-size: 10px;")
-        main_layout.addWidget(self.legend_box, stretch=1)
-
-        # Adicionando linha vertical para tooltips
-        self.vLine = pg.InfiniteLine(angle=90, movable=False, pen=pg.mkPen('w', width=1))  # Linha branca
-        self.plot_widget.addItem(self.vLine, ignoreBounds=True)
-
-        # Mapeamento de curvas para legendas
-        self.legend_labels = {}  # {(lap, sensor): QLabel}
-
-        # Plotar as curvas no PlotWidget de tela cheia
-        self.curves = {}
-        for (lap, sensor), curve in curves.items():
-            time_data = curve.xData
-            value_data = curve.yData
-            color = curve.opts['pen'].color()
-            pen = mkPen(color=color, width=2)
-            new_curve = self.plot_widget.plot(
-                name=f"{lap} - {sensor.replace('_', ' ').title()}",
-                symbol='o', symbolSize=5, symbolBrush=color
-            )
-            new_curve.setData(time_data, value_data, pen=pen)
-            self.curves[(lap, sensor)] = new_curve
-
-            # Adicionar legenda compacta
-            label = QLabel(f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: N/A - Valor: N/A")
-            label.setStyleSheet("font-size: 10px; font-weight: bold; color: black;")
-            self.legend_layout.addWidget(label)
-            self.legend_labels[(lap, sensor)] = label
-
-        # Depuração: Verificar quantas curvas foram plotadas
-        print(f"FullscreenPlotWindow: {len(self.curves)} curvas plotadas.")
-
-        # Conectar o sinal de movimento do mouse
-        self.plot_widget.scene().sigMouseMoved.connect(self.on_mouse_moved)
-
-    def change_background_color(self):
-        """
-        Abre um diálogo de seleção de cor e atualiza a cor de fundo do gráfico.
-        """
-        print("Abrindo diálogo de seleção de cor")
-
-        # Obter a cor atual do fundo
-        if self.plot_widget is not None:
-            # Tentar obter a cor atual do fundo
-            try:
-                # Verificar se temos uma cor personalizada definida
-                if hasattr(self, 'custom_bg_color') and self.custom_bg_color is not None:
-                    current_color = QColor(self.custom_bg_color)
-                else:
-                    # Usar a cor padrão com base no tema atual
-                    current_color = QColor('#212121')  # Dark theme default
-            except Exception as e:
-                print(f"Erro ao obter cor de fundo: {e}")
-                current_color = QColor('#212121')  # Fallback para tema escuro
-        else:
-            current_color = QColor('#212121')
-
-        # Criar um diálogo personalizado com botões de seleção de cor e reset
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Selecionar Cor de Fundo")
-        dialog.setModal(True)
-
-        # Layout principal
-        layout = QVBoxLayout(dialog)
-
-        # Criar o color dialog padrão
-        color_dialog = QColorDialog(dialog)
-        color_dialog.setCurrentColor(current_color)
-        color_dialog.setOption(QColorDialog.DontUseNativeDialog, True)
-
-        # Adicionar o color dialog ao layout
-        layout.addWidget(color_dialog)
-
-        # Layout para botões
-        button_layout = QHBoxLayout()
-
-        # Botão de reset
-        reset_button = QPushButton("Reset para Tema Original", dialog)
-        reset_button.clicked.connect(lambda: self.reset_background_color(dialog))
-        button_layout.addWidget(reset_button)
-
-        # Botões de OK e Cancelar
-        ok_button = QPushButton("OK", dialog)
-        ok_button.clicked.connect(dialog.accept)
-        cancel_button = QPushButton("Cancelar", dialog)
-        cancel_button.clicked.connect(dialog.reject)
-
-        button_layout.addWidget(ok_button)
-        button_layout.addWidget(cancel_button)
-
-        # Adicionar o layout de botões ao layout principal
-        layout.addLayout(button_layout)
-
-        # Mostrar o diálogo
-        if dialog.exec_() == QDialog.Accepted:
-            # Obter a cor selecionada
-            selected_color = color_dialog.selectedColor()
-
-            # Armazenar a cor personalizada
-            self.custom_bg_color = selected_color.name()
-
-            # Atualizar a cor de fundo do gráfico
-            if self.plot_widget is not None:
-                self.plot_widget.setBackground(selected_color)
-
-            # Determinar a cor do texto com base no brilho da cor de fundo
-            brightness = (
-                                     selected_color.red() * 299 + selected_color.green() * 587 + selected_color.blue() * 114) / 1000
-            text_color = 'white' if brightness < 128 else 'black'
-
-            # Atualizar as cores do texto
-            self.update_text_colors(text_color)
-
-            # Se estiver em tela cheia, atualizar também o gráfico da janela de tela cheia
-            if hasattr(self, 'fullscreen_window') and self.fullscreen_window is not None:
-                self.fullscreen_window.plot_widget.setBackground(selected_color)
-                self.fullscreen_window.update_text_colors(text_color)
-
-            print(f"Cor de fundo alterada para: {selected_color.name()}")
-            print(f"Cor do texto ajustada para: {text_color}")
-
-    def reset_background_color(self, dialog=None):
-        """
-        Reseta a cor de fundo para a cor original do tema atual.
-        """
-        print("Resetando cor de fundo para o tema original")
-
-        # Limpar a cor personalizada
-        self.custom_bg_color = None
-
-        # Determinar o tema atual
-        if self.main_window and hasattr(self.main_window, 'current_theme'):
-            is_dark = self.main_window.current_theme == "Dark"
-        else:
-            # Se não tiver acesso à janela principal, usar o tema do widget pai
-            is_dark = self.parent_widget.is_dark if hasattr(self.parent_widget, 'is_dark') else True
-
-        # Definir a cor de fundo com base no tema
-        if is_dark:
-            bg_color = QColor('#212121')  # Dark theme background
-            text_color = '#FFFFFF'  # Dark theme text
-        else:
-            bg_color = QColor('#ffe6e6')  # Light theme background
-            text_color = '#000000'  # Light theme text
-
-        # Atualizar a cor de fundo do gráfico
-        if self.plot_widget is not None:
-            self.plot_widget.setBackground(bg_color)
-
-        # Atualizar as cores do texto
-        self.update_text_colors(text_color)
-
-        print(f"Cor de fundo resetada para: {bg_color.name()}")
-        print(f"Cor do texto ajustada para: {text_color}")
-
-        # Se o diálogo foi fornecido, fechá-lo
-        if dialog:
-            dialog.accept()
-
-    def update_text_colors(self, text_color):
-        """
-        Atualiza as cores do texto no gráfico e elementos da interface.
-        """
-        print(f"Atualizando cores do texto para: {text_color}")
-
-        # Atualiza as cores dos eixos
-        self.plot_widget.setLabel('left', 'Valor', color=text_color)
-        self.plot_widget.setLabel('bottom', 'Tempo (s)', color=text_color)
-        self.plot_widget.getAxis('left').setTextPen(text_color)
-        self.plot_widget.getAxis('bottom').setTextPen(text_color)
-        self.plot_widget.getAxis('left').setPen(text_color)
-        self.plot_widget.getAxis('bottom').setPen(text_color)
-
-        # Atualiza a linha vertical se existir e estiver inicializada
-        if hasattr(self, 'vLine') and self.vLine is not None:
-            try:
-                self.vLine.setPen(pg.mkPen(text_color, width=1))
-            except RuntimeError:
-                print("Aviso: vLine ainda não está pronta para atualização")
-
-        # Atualiza a grade
-        self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
-
-        # Atualiza o título se existir
-        if hasattr(self, 'title_label'):
-            self.title_label.setStyleSheet(f"color: {text_color};")
-
-        # Atualiza as cores das curvas se existirem
-        if hasattr(self, 'curves') and self.curves:
-            for curve in self.curves.values():
-                curve.setPen(text_color)
-
-        # Atualiza a legenda se existir
-        if hasattr(self, 'legend'):
-            self.legend.setLabelTextColor(text_color)
-
-        # Atualiza as cores dos labels da legenda
-        for label in self.legend_labels.values():
-            label.setStyleSheet(f"font-size: 10px; font-weight: bold; color: {text_color};")
-
-        print("Cores do texto atualizadas com sucesso")
-
-    def on_theme_changed(self, is_dark):
-        """
-        Atualiza as cores do gráfico quando o tema é alterado.
-        """
-        print(f"Tema alterado para: {'Escuro' if is_dark else 'Claro'}")
-
-        # Definir as cores com base no tema
-        if is_dark:
-            bg_color = '#212121'  # Dark theme background from styles.py
-            text_color = '#FFFFFF'  # Dark theme text from styles.py
-            theme_name = "Dark"
-            button_bg = '#fb0e0e'  # Dark theme button color from styles.py
-            button_hover = '#ff0000'
-            widget_bg = '#333333'  # Dark widget background
-            border_color = '#fb0e0e'  # Dark border color
-        else:
-            bg_color = '#ffe6e6'  # Light theme background from styles.py
-            text_color = '#000000'  # Light theme text from styles.py
-            theme_name = "Light"
-            button_bg = '#bd0000'  # Light theme button color from styles.py
-            button_hover = '#ff0000'
-            widget_bg = '#ffcccc'  # Light widget background
-            border_color = '#bd0000'  # Light border color
-
-        # Atualizar a cor de fundo do gráfico
-        if self.plot_widget is not None:
-            self.plot_widget.setBackground(bg_color)
-
-        # Atualizar o botão de fundo para refletir a cor atual
-        if hasattr(self, 'bg_color_button'):
-            self.bg_color_button.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {button_bg};
-                    color: {text_color};
-                    border: 2px solid {text_color};
-                    border-radius: 4px;
-                    padding: 5px;
-                    font-family: Arial;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {button_hover};
-                }}
-            """)
-
-        # Atualizar as cores do texto
-        if self.plot_widget is not None:
-            self.update_text_colors(text_color)
-
-        # Atualizar o estilo dos botões
-        self.update_button_styles(is_dark)
-
-        # Se estiver em tela cheia, atualizar também o gráfico da janela de tela cheia
-        if hasattr(self, 'fullscreen_window') and self.fullscreen_window is not None:
-            self.fullscreen_window.plot_widget.setBackground(bg_color)
-            self.fullscreen_window.update_text_colors(text_color)
-            self.fullscreen_window.on_theme_changed(is_dark)
-
-        # Atualizar a grade do gráfico
-        if self.plot_widget is not None:
-            self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
-
-        # Atualizar a linha vertical
-        if hasattr(self, 'vLine') and self.plot_widget is not None:
-            self.vLine.setPen(pg.mkPen(text_color, width=1))
-
-        # Atualizar as cores dos eixos e título
-        if self.plot_widget is not None:
-            self.plot_widget.setLabel('left', 'Valor', color=text_color)
-            self.plot_widget.setLabel('bottom', 'Tempo (s)', color=text_color)
-            self.plot_widget.getAxis('left').setTextPen(text_color)
-            self.plot_widget.getAxis('bottom').setTextPen(text_color)
-            self.plot_widget.getAxis('left').setPen(text_color)
-            self.plot_widget.getAxis('bottom').setPen(text_color)
-            self.plot_widget.setTitle("Comparação de Voltas", color=text_color)
-
-        print(f"Tema alterado para: {theme_name}")
-        print(f"Cor de fundo: {bg_color}")
-        print(f"Cor do texto: {text_color}")
-
-        # Força a atualização do widget
-        self.plot_widget.update()
-        if hasattr(self, 'fullscreen_window') and self.fullscreen_window is not None:
-            self.fullscreen_window.plot_widget.update()
-
-    def update_button_styles(self, is_dark):
-        """
-        Atualiza os estilos dos botões com base no tema.
-        """
-        print(f"Atualizando estilos dos botões para tema {'escuro' if is_dark else 'claro'}")
+        main_layout.addWidget(legend_box, stretch=1)
+        self.showFullScreen()
 
-        # Definir cores com base no tema
-        if is_dark:
-            bg_color = '#212121'  # Dark theme background
-            text_color = '#FFFFFF'  # Dark theme text
-            button_bg = '#fb0e0e'  # Dark theme button background
-            button_hover = '#ff0000'  # Dark theme button hover
-            border_color = '#FFFFFF'  # Dark theme border
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
         else:
-            bg_color = '#ffe6e6'  # Light theme background
-            text_color = '#000000'  # Light theme text
-            button_bg = '#bd0000'  # Light theme button background
-            button_hover = '#ff0000'  # Light theme button hover
-            border_color = '#000000'  # Light theme border
-
-        # Estilo base para botões
-        base_button_style = f"""
-            QPushButton {{
-                background-color: {button_bg};
-                color: {text_color if is_dark else '#FFFFFF'};
-                border: 2px solid {border_color};
-                border-radius: 4px;
-                padding: 5px;
-                font-family: Arial;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {button_hover};
-            }}
-            QPushButton:disabled {{
-                background-color: {'#4A4A4A' if is_dark else '#ffb8b8'};
-                color: {'#808080' if is_dark else '#666666'};
-                border: 2px solid {'#808080' if is_dark else '#666666'};
-            }}
-        """
-
-        # Aplicar estilo aos botões
-        for button in self.findChildren(QPushButton):
-            button.setStyleSheet(base_button_style)
-
-        # Estilo para checkboxes
-        checkbox_style = f"""
-            QCheckBox {{
-                color: {text_color};
-                font-family: Arial;
-                font-size: 14px;
-            }}
-            QCheckBox::indicator {{
-                width: 15px;
-                height: 15px;
-                background-color: {'#4A4A4A' if is_dark else '#ffcccc'};
-                border: 1px solid {button_bg};
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {button_bg};
-            }}
-            QCheckBox::indicator:hover {{
-                border: 1px solid {button_hover};
-            }}
-        """
+            super().keyPressEvent(event)
 
-        # Aplicar estilo aos checkboxes
-        for checkbox in self.findChildren(QCheckBox):
-            checkbox.setStyleSheet(checkbox_style)
-
-        print("Estilos dos botões atualizados com sucesso")
+    def closeEvent(self, event):
+        # A ComparisonView recoloca o gráfico e a legenda no lugar original
+        self.closed.emit()
+        super().closeEvent(event)
 
 
 class ComparisonView(QWidget, PlotMixin):
@@ -474,14 +174,25 @@ class ComparisonView(QWidget, PlotMixin):
 
         # Inicialização de dados
         self.lap_data = {}
+        self.lap_pyramids = {}  # {(lap, sensor, eixo, referência): LodPyramid}
+        self.lap_aligner = None
+        self.x_axis = AXIS_TIME
+        self.x_axis_label = "Tempo (s)"
+        self.x_readout = "Tempo"  # Nome do eixo x nas legendas
+        self.aligned_grid = None
+        self.aligned_data = {}  # {(lap, sensor): valores na grade comum}
+        self.reference_lap = None
         self.curves = {}
         self.selected_sensors = []
         self.selected_laps = []
         self.legend_labels = {}
+        self.legend_prefixes = {}
         self.color_buttons = {}
         self.lap_checkboxes = {}  # Movido para o início
         self.is_fullscreen = False
         self.fullscreen_window = None
+        self.session_reader = None  # Sessão gravada aberta para comparação
+        self.checkbox_style = None
 
         # Store reference to main window
         self.main_window = main_window
@@ -503,34 +214,42 @@ class ComparisonView(QWidget, PlotMixin):
         # Layout para seleção de voltas e gráfico (direita) - 80% da largura
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
+        self.right_layout = right_layout
         main_layout.addWidget(right_panel, stretch=4)
 
         # Seção de seleção de voltas (topo) - Reduzida para 15% da altura
         selection_box = QGroupBox("Selecione as Voltas para Comparar")
         selection_layout = QVBoxLayout(selection_box)
 
-        # Grid de checkboxes para voltas
+        # Sessão gravada de onde as voltas são lidas
+        session_layout = QHBoxLayout()
+        self.session_label = QLabel("Nenhuma sessão carregada")
+        self.open_session_button = QPushButton("Abrir Sessão")
+        self.open_session_button.clicked.connect(self.open_session_dialog)
+        self.detect_laps_button = QPushButton("Detectar Voltas")
+        self.detect_laps_button.setToolTip("Refaz a segmentação das voltas pelo beacon/GPS (configuração lap_detection)")
+        self.detect_laps_button.setEnabled(False)
+        self.detect_laps_button.clicked.connect(self.resegment_session)
+        session_layout.addWidget(self.session_label, stretch=1)
+        session_layout.addWidget(self.open_session_button)
+        session_layout.addWidget(self.detect_laps_button)
+        selection_layout.addLayout(session_layout)
+
+        # Grid de checkboxes para voltas (preenchido ao abrir uma sessão)
         lap_grid = QWidget()
-        lap_grid_layout = QGridLayout(lap_grid)
-        lap_grid_layout.setSpacing(5)  # Reduzir espaçamento entre checkboxes
-
-        # Adicionar voltas simuladas com caixas de seleção
-        max_columns = 10
-        for i in range(1, 21):
-            checkbox = QCheckBox(f"{i}")
-            row = (i - 1) // max_columns
-            col = (i - 1) % max_columns
-            lap_grid_layout.addWidget(checkbox, row, col)
-            self.lap_checkboxes[f"Volta {i}"] = checkbox
+        self.lap_grid_layout = QGridLayout(lap_grid)
+        self.lap_grid_layout.setSpacing(5)  # Reduzir espaçamento entre checkboxes
 
         selection_layout.addWidget(lap_grid)
         right_layout.addWidget(selection_box)
 
         # Área de gráficos (meio) - 70% da altura
         graph_box = QGroupBox("Gráfico de Comparação")
+        self.graph_box = graph_box
         graph_layout = QVBoxLayout(graph_box)
 
         self.plot_widget = PlotWidget(title="Comparação de Voltas")
+        self.lod = LodController(self.plot_widget)
         self.plot_widget.setBackground('#2E2E2E')
         self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
         self.plot_widget.setLabel('left', 'Valor')
@@ -542,6 +261,17 @@ class ComparisonView(QWidget, PlotMixin):
         self.plot_widget.addItem(self.vLine, ignoreBounds=True)
 
         graph_layout.addWidget(self.plot_widget)
+
+        # Gráfico de delta de tempo em relação à volta de referência (eixo x ligado ao principal)
+        self.delta_plot = PlotWidget()
+        self.delta_plot.setBackground('#2E2E2E')
+        self.delta_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.delta_plot.setLabel('left', 'Delta (s)')
+        self.delta_plot.setXLink(self.plot_widget)
+        self.delta_plot.setVisible(False)
+        self.delta_curves = {}
+        graph_layout.addWidget(self.delta_plot, stretch=1)
+        graph_layout.setStretchFactor(self.plot_widget, 3)
         right_layout.addWidget(graph_box, stretch=4)
 
         # Área de legendas (base) - 15% da altura
@@ -555,12 +285,35 @@ class ComparisonView(QWidget, PlotMixin):
         button_layout = QHBoxLayout()
         self.compare_button = QPushButton("Comparar Voltas")
 
+        # Eixo x da comparação (tempo bruto ou voltas alinhadas por distância)
+        self.axis_combo = QComboBox()
+        for text, axis, _ in X_AXIS_OPTIONS:
+            self.axis_combo.addItem(text, axis)
+        self.axis_combo.currentIndexChanged.connect(self.on_x_axis_changed)
+
+        # Volta de referência para o alinhamento e o delta de tempo
+        self.reference_combo = QComboBox()
+        self.reference_combo.currentIndexChanged.connect(self.on_reference_lap_changed)
+        self.delta_checkbox = QCheckBox("Delta de Tempo")
+        self.delta_checkbox.setToolTip("Mostra o tempo ganho/perdido em relação à volta de referência "
+                                       "(eixo de distância ou fração da volta)")
+        self.delta_checkbox.toggled.connect(self.update_delta_plot)
+
+        button_layout.addWidget(QLabel("Eixo X:"))
+        button_layout.addWidget(self.axis_combo)
+        button_layout.addWidget(QLabel("Referência:"))
+        button_layout.addWidget(self.reference_combo)
+        button_layout.addWidget(self.delta_checkbox)
         button_layout.addWidget(self.compare_button)
+
+        self.fullscreen_button = QPushButton("Tela Cheia")
+        self.fullscreen_button.clicked.connect(self.toggle_fullscreen)
+        button_layout.addWidget(self.fullscreen_button)
         right_layout.addLayout(button_layout)
 
         # Conectar sinais
         self.compare_button.clicked.connect(self.compare_laps)
-        self.plot_widget.scene().sigMouseMoved.connect(self.on_mouse_moved)
+        self.connect_crosshair()
         self.sensor_selection.selections_applied.connect(self.update_selected_sensors)
 
         # Desabilitar botão inicialmente
@@ -583,32 +336,6 @@ class ComparisonView(QWidget, PlotMixin):
             # Set default theme
             self.on_theme_changed(True)  # Default to dark theme
 
-    def on_mouse_moved(self, pos):
-        """
-        Atualiza as legendas com os valores correspondentes ao ponto x atual do mouse.
-        """
-        if self.plot_widget.sceneBoundingRect().contains(pos):
-            mouse_point = self.plot_widget.plotItem.vb.mapSceneToView(pos)
-            x = mouse_point.x()
-
-            # Mover a linha vertical para a posição x atual
-            self.vLine.setPos(x)
-
-            # Iterar sobre todas as curvas para atualizar as legendas
-            for (lap, sensor), curve in self.curves.items():
-                y = self.get_y_at_x(curve, x)
-                if y is not None:
-                    self.legend_labels[(lap, sensor)].setText(
-                        f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: {x:.3f} - Valor: {y:.2f}")
-                else:
-                    self.legend_labels[(lap, sensor)].setText(
-                        f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: N/A - Valor: N/A")
-        else:
-            # Resetar a linha vertical e todas as legendas
-            self.vLine.setPos(None)
-            for (lap, sensor), label in self.legend_labels.items():
-                label.setText(f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: N/A - Valor: N/A")
-
     def on_sensor_selection_changed(self, selected_sensors):
         """
         Called when sensor selection changes.
@@ -684,6 +411,7 @@ class ComparisonView(QWidget, PlotMixin):
             return
 
         # Limpar gráficos anteriores
+        self.lod.clear()
         self.plot_widget.clear()
         self.curves = {}
         print("Gráficos anteriores limpos.")
@@ -700,30 +428,13 @@ class ComparisonView(QWidget, PlotMixin):
         self.legend_labels.clear()
         self.color_buttons.clear()
 
-        # Plotar dados simulados para cada volta e sensor selecionados
+        # Plotar os dados da sessão para cada volta e sensor selecionados
+        if not self.align_selected_laps():
+            return
         for lap in self.selected_laps:
             for sensor in self.selected_sensors:
-                if (lap, sensor) not in self.lap_data:
-                    # Simular dados para a volta e sensor
-                    time_data = list(range(60))
-                    value_data = [random.uniform(150, 200) for _ in time_data]
-                    self.lap_data[(lap, sensor)] = (time_data, value_data)
-                    print(f"Simulando dados para {lap} - {sensor}")
-
-                time_data, value_data = self.lap_data[(lap, sensor)]
-                # Gerar uma cor única para cada curva baseada no hash do sensor e volta
-                color = pg.intColor(abs(hash(lap + sensor)) % 256)
-                pen = mkPen(color=color, width=2)
-                curve = self.plot_widget.plot(
-                    name=f"{lap} - {sensor.replace('_', ' ').title()}",
-                    symbol='o', symbolSize=5, symbolBrush=color
-                )
-                curve.setData(time_data, value_data, pen=pen)
-                self.curves[(lap, sensor)] = curve
-                print(f"Plotando {lap} - {sensor}")
-
-                # Adicionar legenda e botão de cor
-                self.add_legend_entry(lap, sensor, curve)
+                self._plot_lap_sensor_data(lap, sensor)
+        self.update_delta_plot()
 
         print("Comparação de voltas concluída")
 
@@ -732,8 +443,7 @@ class ComparisonView(QWidget, PlotMixin):
         Adiciona uma entrada de legenda e botão de cor para a combinação de volta e sensor.
         """
         # Criar e configurar o label da legenda
-        label_text = f"{lap} - {sensor.replace('_', ' ').title()} - Tempo: N/A - Valor: N/A"
-        label = QLabel(label_text)
+        label = QLabel(self.legend_text((lap, sensor)))
 
         # Determinar a cor do texto com base no tema atual
         text_color = 'white' if self.main_window and self.main_window.current_theme == "Dark" else 'black'
@@ -817,6 +527,7 @@ class ComparisonView(QWidget, PlotMixin):
         # Atualizar a cor de fundo do gráfico
         if self.plot_widget is not None:
             self.plot_widget.setBackground(bg_color)
+            self.delta_plot.setBackground(bg_color)
 
         # Atualizar o botão de fundo para refletir a cor atual
         if hasattr(self, 'bg_color_button'):
@@ -842,12 +553,6 @@ class ComparisonView(QWidget, PlotMixin):
         # Atualizar o estilo dos botões
         self.update_button_styles(is_dark)
 
-        # Se estiver em tela cheia, atualizar também o gráfico da janela de tela cheia
-        if hasattr(self, 'fullscreen_window') and self.fullscreen_window is not None:
-            self.fullscreen_window.plot_widget.setBackground(bg_color)
-            self.fullscreen_window.update_text_colors(text_color)
-            self.fullscreen_window.on_theme_changed(is_dark)
-
         # Atualizar a grade do gráfico
         if self.plot_widget is not None:
             self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
@@ -859,7 +564,7 @@ class ComparisonView(QWidget, PlotMixin):
         # Atualizar as cores dos eixos e título
         if self.plot_widget is not None:
             self.plot_widget.setLabel('left', 'Valor', color=text_color)
-            self.plot_widget.setLabel('bottom', 'Tempo (s)', color=text_color)
+            self.plot_widget.setLabel('bottom', self.x_axis_label, color=text_color)
             self.plot_widget.getAxis('left').setTextPen(text_color)
             self.plot_widget.getAxis('bottom').setTextPen(text_color)
             self.plot_widget.getAxis('left').setPen(text_color)
@@ -872,8 +577,6 @@ class ComparisonView(QWidget, PlotMixin):
 
         # Força a atualização do widget
         self.plot_widget.update()
-        if hasattr(self, 'fullscreen_window') and self.fullscreen_window is not None:
-            self.fullscreen_window.plot_widget.update()
 
     def update_button_styles(self, is_dark):
         """
@@ -941,7 +644,8 @@ class ComparisonView(QWidget, PlotMixin):
             }}
         """
 
-        # Aplicar estilo aos checkboxes
+        # Aplicar estilo aos checkboxes (e guardar para as voltas criadas depois)
+        self.checkbox_style = checkbox_style
         for checkbox in self.findChildren(QCheckBox):
             checkbox.setStyleSheet(checkbox_style)
 
@@ -955,7 +659,7 @@ class ComparisonView(QWidget, PlotMixin):
 
         # Atualiza as cores dos eixos
         self.plot_widget.setLabel('left', 'Valor', color=text_color)
-        self.plot_widget.setLabel('bottom', 'Tempo (s)', color=text_color)
+        self.plot_widget.setLabel('bottom', self.x_axis_label, color=text_color)
         self.plot_widget.getAxis('left').setTextPen(text_color)
         self.plot_widget.getAxis('bottom').setTextPen(text_color)
         self.plot_widget.getAxis('left').setPen(text_color)
@@ -1010,6 +714,7 @@ class ComparisonView(QWidget, PlotMixin):
             return
 
         # Limpar gráficos anteriores
+        self.lod.clear()
         self.plot_widget.clear()
         self.curves = {}
         self.plot_widget.addItem(self.vLine, ignoreBounds=True)
@@ -1018,9 +723,127 @@ class ComparisonView(QWidget, PlotMixin):
         self._clear_legend_box()
 
         # Plotar dados para cada combinação de volta e sensor
+        if not self.align_selected_laps():
+            return
         for lap in self.selected_laps:
             for sensor in self.selected_sensors:
                 self._plot_lap_sensor_data(lap, sensor)
+        self.update_delta_plot()
+
+    def set_render_backend(self, backend):
+        """
+        Aplica o backend de desenho (raster ou OpenGL) aos gráficos da comparação.
+        """
+        apply_render_backend(self.plot_widget, backend)
+        apply_render_backend(self.delta_plot, backend)
+
+    def toggle_fullscreen(self):
+        """
+        Abre ou fecha a tela cheia do gráfico de comparação.
+        """
+        if self.fullscreen_window is not None:
+            self.fullscreen_window.close()
+            return
+
+        # Guardar as posições no layout para devolver os widgets ao fechar
+        self.fullscreen_positions = [
+            (widget, self.right_layout.indexOf(widget), self.right_layout.stretch(self.right_layout.indexOf(widget)))
+            for widget in (self.graph_box, self.legend_box)
+        ]
+        self.fullscreen_window = FullscreenPlotWindow(self.graph_box, self.legend_box)
+        self.fullscreen_window.setStyleSheet(self.window().styleSheet())
+        self.fullscreen_window.closed.connect(self.exit_fullscreen)
+        self.is_fullscreen = True
+
+    def exit_fullscreen(self):
+        """
+        Devolve o gráfico e a legenda da janela de tela cheia para a aba de comparação.
+        """
+        for widget, index, stretch in self.fullscreen_positions:
+            self.right_layout.insertWidget(index, widget, stretch)
+        self.fullscreen_window.deleteLater()
+        self.fullscreen_window = None
+        self.is_fullscreen = False
+
+    def open_session_dialog(self):
+        """
+        Abre um diálogo para escolher o diretório de uma sessão gravada.
+        """
+        default_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sessions')
+        path = QFileDialog.getExistingDirectory(self, "Abrir Sessão", default_dir)
+        if path:
+            self.load_session(path)
+
+    def load_session(self, path):
+        """
+        Carrega uma sessão gravada e preenche a lista de voltas.
+        """
+        try:
+            reader = SessionReader(path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Sessão Inválida", f"Não foi possível abrir a sessão:\n{e}")
+            return
+
+        if self.session_reader is not None:
+            self.session_reader.close()
+        self.session_reader = reader
+        self.lap_data.clear()
+        self.lap_pyramids.clear()
+        self.lap_aligner = LapAligner(reader)
+        self.session_label.setText(f"Sessão: {reader.name} ({reader.row_count} amostras)")
+        self.populate_lap_checkboxes(list(reader.lap_index))
+        self.detect_laps_button.setEnabled(True)
+        print(f"Sessão carregada: {path}")
+
+    def resegment_session(self, segmenter=None):
+        """
+        Detecta novamente as voltas da sessão carregada a partir do beacon ou da
+        linha de chegada GPS. Sem segmentador explícito, usa a configuração
+        "lap_detection" da janela principal (ou o canal de beacon padrão).
+        """
+        if self.session_reader is None:
+            return
+        if not isinstance(segmenter, LapSegmenter):
+            config = getattr(self.main_window, 'api_config', {}) if self.main_window else {}
+            segmenter = build_segmenter(config.get("lap_detection")) or LapSegmenter()
+        try:
+            index = self.session_reader.resegment(segmenter)
+        except KeyError as e:
+            QMessageBox.warning(self, "Detecção de Voltas", f"Não foi possível detectar as voltas:\n{e}")
+            return
+        self.lap_data.clear()
+        self.lap_pyramids.clear()
+        self.lap_aligner.clear()
+        self.populate_lap_checkboxes(list(index))
+        print(f"Voltas detectadas: {len(index)}")
+
+    def populate_lap_checkboxes(self, laps):
+        """
+        Recria o grid de checkboxes com as voltas do índice da sessão.
+        O tempo de volta e as parciais aparecem no tooltip de cada checkbox.
+        """
+        for checkbox in self.lap_checkboxes.values():
+            self.lap_grid_layout.removeWidget(checkbox)
+            checkbox.deleteLater()
+        self.lap_checkboxes.clear()
+
+        max_columns = 10
+        for index, lap in enumerate(laps):
+            number = lap["lap"]
+            checkbox = QCheckBox(f"{number}" if lap["complete"] else f"{number}*")
+            tooltip = f"Volta {number}: {format_lap_time(lap['lap_time'])}"
+            if lap["sectors"]:
+                tooltip += "\n" + "  ".join(
+                    f"S{i + 1}: {format_lap_time(split)}" for i, split in enumerate(lap["sectors"]))
+            if not lap["complete"]:
+                tooltip += "\n(volta incompleta)"
+            checkbox.setToolTip(tooltip)
+            if self.checkbox_style:
+                checkbox.setStyleSheet(self.checkbox_style)
+            checkbox.toggled.connect(self.update_generate_button_state)
+            self.lap_grid_layout.addWidget(checkbox, index // max_columns, index % max_columns)
+            self.lap_checkboxes[f"Volta {number}"] = checkbox
+        self.update_generate_button_state()
 
     def _clear_legend_box(self):
         """Limpa a caixa de legenda."""
@@ -1031,29 +854,119 @@ class ComparisonView(QWidget, PlotMixin):
         self.legend_labels.clear()
         self.color_buttons.clear()
 
+    def on_x_axis_changed(self, index):
+        """
+        Troca o eixo x da comparação e refaz o gráfico, se houver um.
+        """
+        self.x_readout, self.x_axis, self.x_axis_label = X_AXIS_OPTIONS[index]
+        self.plot_widget.setLabel('bottom', self.x_axis_label,
+                                  color=self.plot_widget.getAxis('left').textPen().color())
+        if self.curves:
+            self.compare_laps()
+
+    def align_selected_laps(self):
+        """
+        Reamostra as voltas e sensores selecionados na grade comum do eixo escolhido.
+        A volta de referência (por padrão, a primeira selecionada) define a grade.
+        Retorna False se o alinhamento não for possível.
+        """
+        self.aligned_grid, self.aligned_data = None, {}
+        self.update_reference_combo()
+        if self.x_axis == AXIS_TIME or self.lap_aligner is None:
+            return True
+        if self.x_axis == AXIS_DISTANCE and self.lap_aligner.distance_source() is None:
+            QMessageBox.warning(self, "Alinhamento por Distância",
+                                "A sessão não tem velocidade nem GPS para calcular a distância percorrida.")
+            return False
+
+        laps = {int(lap.split()[-1]): lap for lap in self.selected_laps}
+        self.aligned_grid, aligned = self.lap_aligner.align(
+            list(laps), self.selected_sensors, int(self.reference_lap.split()[-1]), self.x_axis)
+        self.aligned_data = {(laps[number], sensor): values for (number, sensor), values in aligned.items()}
+        return True
+
+    def update_reference_combo(self):
+        """
+        Preenche o seletor de referência com as voltas selecionadas, mantendo a
+        referência atual se ela continuar selecionada.
+        """
+        current = self.reference_combo.currentText()
+        self.reference_combo.blockSignals(True)
+        self.reference_combo.clear()
+        self.reference_combo.addItems(self.selected_laps)
+        if current in self.selected_laps:
+            self.reference_combo.setCurrentText(current)
+        self.reference_combo.blockSignals(False)
+        self.reference_lap = self.reference_combo.currentText() or None
+
+    def on_reference_lap_changed(self, index):
+        """
+        Troca a volta de referência. As voltas alinhadas estão em cache, então o
+        gráfico e o delta são refeitos quase instantaneamente.
+        """
+        if index < 0 or not self.curves:
+            return
+        self.compare_laps()
+
+    def update_delta_plot(self):
+        """
+        Calcula e plota o delta de tempo acumulado de cada volta selecionada em
+        relação à referência, em uma única operação vetorizada sobre a grade comum.
+        """
+        self.delta_plot.clear()
+        self.delta_curves = {}
+        show = (self.delta_checkbox.isChecked() and self.x_axis != AXIS_TIME
+                and self.lap_aligner is not None and self.reference_lap and len(self.selected_laps) > 1)
+        self.delta_plot.setVisible(bool(show))
+        if not show:
+            return
+
+        self.delta_plot.addItem(pg.InfiniteLine(pos=0, angle=0, pen=pg.mkPen('#888888', width=1)))
+        laps = {int(lap.split()[-1]): lap for lap in self.selected_laps}
+        grid, deltas = self.lap_aligner.delta(list(laps), int(self.reference_lap.split()[-1]), self.x_axis)
+        for number, delta in deltas.items():
+            lap = laps[number]
+            curve = self.delta_plot.plot(grid, delta, name=f"Delta {lap}",
+                                         pen=mkPen(color=pg.intColor(abs(hash(lap)) % 256), width=2))
+            self.delta_curves[lap] = curve
+
     def _plot_lap_sensor_data(self, lap, sensor):
         """Plota os dados para uma combinação específica de volta e sensor."""
-        # Gerar ou recuperar dados
-        if (lap, sensor) not in self.lap_data:
-            time_data = list(range(60))
-            value_data = [random.uniform(150, 200) for _ in time_data]
-            self.lap_data[(lap, sensor)] = (time_data, value_data)
-            print(f"Simulando dados para {lap} - {sensor}")
-
-        time_data, value_data = self.lap_data[(lap, sensor)]
+        if self.x_axis == AXIS_TIME:
+            # Ler a fatia da volta da sessão (memória mapeada) ou recuperar do cache
+            if (lap, sensor) not in self.lap_data:
+                lap_number = int(lap.split()[-1])
+                data = self.session_reader.lap_channel(lap_number, sensor) if self.session_reader else None
+                if data is None:
+                    print(f"Sem dados de {sensor} na {lap}")
+                    return
+                self.lap_data[(lap, sensor)] = data
+            time_data, value_data = self.lap_data[(lap, sensor)]
+            pyramid_key = (lap, sensor, AXIS_TIME, None)
+        else:
+            # Voltas alinhadas: todas as curvas compartilham a mesma grade x
+            if (lap, sensor) not in self.aligned_data:
+                print(f"Sem dados de {sensor} na {lap}")
+                return
+            time_data, value_data = self.aligned_grid, self.aligned_data[(lap, sensor)]
+            pyramid_key = (lap, sensor, self.x_axis, self.reference_lap)
 
         # Criar curva
         color = pg.intColor(abs(hash(lap + sensor)) % 256)
         pen = mkPen(color=color, width=2)
         curve = self.plot_widget.plot(
-            time_data, value_data, pen=pen,
+            pen=pen,
             name=f"{lap} - {sensor.replace('_', ' ').title()}",
             symbol='o', symbolSize=5, symbolBrush=color
         )
 
-        # Anexar dados à curva
+        # Anexar dados à curva (arrays NumPy usados pela busca binária do cursor)
         curve.x_data = time_data
-        curve.y_data = value_data
+        curve.y_data = np.asarray(value_data)
+
+        # Os pontos desenhados vêm da pirâmide de detalhe (montada uma vez por volta/sensor)
+        curve.lod_pyramid = self.lod.add_curve(curve, self.lap_pyramids.get(pyramid_key))
+        self.lap_pyramids[pyramid_key] = curve.lod_pyramid
         self.curves[(lap, sensor)] = curve
 
         # Adicionar legenda
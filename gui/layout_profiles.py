@@ -0,0 +1,76 @@
+# gui/layout_profiles.py
+
+import json
+import os
+
+# Arquivo com os perfis de layout da aba ao vivo (na raiz do projeto)
+LAYOUT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'graph_layout_config.json')
+# Nome do perfil criado a partir de um arquivo no formato antigo (um único layout)
+DEFAULT_PROFILE = "Padrão"
+
+
+def is_legacy_layout(config):
+    """
+    O formato antigo é um único layout: {sensor: {"row", "column", "rowSpan", "colSpan"}}.
+    """
+    return "profiles" not in config and all(
+        isinstance(entry, dict) and "row" in entry for entry in config.values()
+    )
+
+
+def load_layout_profiles(path=LAYOUT_CONFIG_PATH):
+    """
+    Lê os perfis de layout. Retorna (perfis, perfil ativo), onde perfis é
+    {nome: {sensor: configuração do gráfico}}. Um arquivo no formato antigo vira
+    o perfil DEFAULT_PROFILE; arquivo ausente ou inválido resulta em nenhum perfil.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return {}, None
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler os perfis de layout: {e}")
+        return {}, None
+
+    if not isinstance(config, dict) or not config:
+        return {}, None
+    if is_legacy_layout(config):
+        return {DEFAULT_PROFILE: config}, DEFAULT_PROFILE
+    profiles = config.get("profiles", {})
+    active = config.get("active")
+    return profiles, active if active in profiles else None
+
+
+def save_layout_profiles(profiles, active=None, path=LAYOUT_CONFIG_PATH):
+    """
+    Grava os perfis de forma atômica (arquivo temporário + rename).
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"active": active, "profiles": profiles}, f, ensure_ascii=False, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def profile_positions(profile):
+    """
+    Retorna [(sensor, (linha, coluna, linhas ocupadas, colunas ocupadas))] na
+    ordem da grade (linha, depois coluna).
+    """
+    positions = [
+        (sensor, (entry.get("row", 0), entry.get("column", 0), entry.get("rowSpan", 1), entry.get("colSpan", 1)))
+        for sensor, entry in profile.items()
+    ]
+    positions.sort(key=lambda item: (item[1][0], item[1][1]))
+    return positions
+
+
+def grid_size(positions):
+    """
+    Número de linhas e colunas ocupadas pelas posições (considerando os spans).
+    """
+    rows = max((row + row_span for _, (row, _, row_span, _) in positions), default=0)
+    cols = max((col + col_span for _, (_, col, _, col_span) in positions), default=0)
+    return rows, cols
@@ -0,0 +1,205 @@
+# gui/live_plot.py
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+from pyqtgraph import mkPen
+import pyqtgraph as pg
+import numpy as np
+
+from data.ring_buffer import RingBuffer, DEFAULT_CAPACITY
+from data.history_store import ChunkedHistoryStore, DEFAULT_RETENTION, DEFAULT_MAX_SAMPLES
+
+# Número máximo de barras desenhadas no gráfico de barras (o trecho é reduzido por picos)
+MAX_BARS = 500
+
+
+class LivePlotMixin:
+    """
+    Dados e desenho de um gráfico ao vivo, compartilhados pelo gráfico da grade
+    (DraggablePlotWidget, um PlotWidget) e pelo painel da tela única
+    (CanvasPlotItem, um PlotItem). Ambos expõem a mesma API de plotagem
+    (plot, addItem, getViewBox, setTitle...), usada aqui.
+    """
+
+    def setup_live_plot(self, title, buffer_size=DEFAULT_CAPACITY, render_scheduler=None,
+                        history_retention=DEFAULT_RETENTION, history_max_samples=DEFAULT_MAX_SAMPLES):
+        self.render_scheduler = render_scheduler  # Quando definido, o redesenho é feito por quadro
+
+        # Atributos para definir o tipo do gráfico e as cores
+        self.current_chart_type = "line"  # Tipo padrão
+        self.line_color = 'r'  # Cor inicial da linha (vermelho)
+        self.custom_bg_color = None  # Cor de fundo escolhida pelo usuário (None segue o tema)
+
+        # Buffer circular com os dados (x, y) do gráfico
+        self.buffer = RingBuffer(capacity=buffer_size, columns=2)
+        # Histórico completo (limitado pela janela de retenção) para rolagem ao passado
+        self.history = ChunkedHistoryStore(retention=history_retention,
+                                           max_samples=max(history_max_samples, buffer_size))
+        self.history_range = None  # Trecho do histórico carregado no gráfico (x inicial, x final)
+
+        self.setTitle(title, color=self.line_color, size="16pt", bold=True)
+        self.setLabel("left", "Valor", color="w", size="12pt")
+        self.setLabel("bottom", "Tempo (s)", color="w", size="12pt")
+
+        # Habilitar a grade por padrão com opacidade máxima
+        self.showGrid(x=True, y=True, alpha=1.0)
+
+        # Personaliza a fonte dos ticks dos eixos
+        left_axis = self.getAxis("left")
+        left_axis.tickFont = QFont("Arial", 12)
+        bottom_axis = self.getAxis("bottom")
+        bottom_axis.tickFont = QFont("Arial", 12)
+
+        self.plot_item = self.plot([], [], pen=mkPen(color=self.line_color, width=2))
+        # Itens persistentes por tipo de gráfico, atualizados com setData/setOpts
+        self.chart_items = {"line": self.plot_item}
+
+        # Desenhar apenas o trecho visível e reduzir pontos preservando picos
+        self.setClipToView(True)
+        self.setDownsampling(auto=True, mode='peak')
+
+        # Ao sair da borda ao vivo (pan/zoom), os dados passam a vir do histórico
+        self.getViewBox().sigXRangeChanged.connect(self.on_x_range_changed)
+
+    @property
+    def data_x(self):
+        return self.buffer.view()[0]
+
+    @property
+    def data_y(self):
+        return self.buffer.view()[1]
+
+    def set_chart_type(self, chart_type):
+        """
+        Define o tipo de gráfico e atualiza a visualização. Os itens da cena só são
+        trocados quando o tipo realmente muda; os demais ficam ocultos para reuso.
+        """
+        if chart_type != self.current_chart_type:
+            previous_item = self.chart_items[self.current_chart_type]
+            previous_item.setVisible(False)
+            if chart_type not in self.chart_items:
+                self.chart_items[chart_type] = self._create_chart_item(chart_type)
+                self.addItem(self.chart_items[chart_type])
+            self.chart_items[chart_type].setVisible(True)
+            self.current_chart_type = chart_type
+        self.update_chart()
+
+    def set_line_color(self, color):
+        """
+        Altera a cor da linha do gráfico do tipo "line".
+        """
+        self.line_color = color
+        self.plot_item.setPen(mkPen(color=self.line_color, width=2))
+
+    def _create_chart_item(self, chart_type):
+        """
+        Cria o item persistente da cena para o tipo de gráfico informado.
+        """
+        if chart_type == "bar":
+            return pg.BarGraphItem(x=[], height=[], width=0.5, brush='g')
+        if chart_type == "radial":
+            # PlotDataItem recebe do addItem o recorte à área visível e a redução por picos.
+            # Tracejado com 1 px: com largura maior o Qt contorna cada traço e o quadro leva ~1 s
+            return pg.PlotDataItem(
+                pen=mkPen(color='b', width=1, style=Qt.DashLine),
+                name="Radial"
+            )
+        return pg.PlotDataItem(pen=mkPen(color=self.line_color, width=2))
+
+    def update_chart(self):
+        """
+        Atualiza os dados do item do tipo de gráfico selecionado, sem recriar itens da cena.
+        Enquanto o usuário navega pelo histórico, a borda ao vivo não redesenha o gráfico.
+        """
+        if self.history_range is not None:
+            return
+        self._set_item_data(*self.buffer.view())
+
+    def _set_item_data(self, data_x, data_y):
+        item = self.chart_items[self.current_chart_type]
+        if self.current_chart_type == "bar":
+            data_x, data_y = self._bar_data(data_x, data_y)
+            width = 0.8 * float(np.median(np.diff(data_x))) if len(data_x) > 1 else 0.5
+            item.setOpts(x=data_x, height=data_y, width=width)
+        else:
+            item.setData(data_x, data_y)
+
+    def _bar_data(self, data_x, data_y):
+        """
+        O BarGraphItem não tem recorte nem redução de pontos: fora da borda ao vivo
+        só o trecho visível é usado, e acima de MAX_BARS amostras cada barra
+        representa um intervalo com o valor de maior módulo dele (pico).
+        """
+        if not self.is_following_live() and len(data_x):
+            x_start, x_stop = self.getViewBox().viewRange()[0]
+            start, stop = np.searchsorted(data_x, (x_start, x_stop))
+            data_x, data_y = data_x[max(start - 1, 0):stop + 1], data_y[max(start - 1, 0):stop + 1]
+        if len(data_x) <= MAX_BARS:
+            return data_x, data_y
+        edges = np.linspace(0, len(data_x), MAX_BARS + 1).astype(np.intp)[:-1]
+        highs = np.fmax.reduceat(data_y, edges)
+        lows = np.fmin.reduceat(data_y, edges)
+        return data_x[edges], np.where(np.abs(lows) > np.abs(highs), lows, highs)
+
+    def is_following_live(self):
+        """
+        O gráfico acompanha a borda ao vivo enquanto o auto-range em x estiver ativo.
+        """
+        return self.getViewBox().autoRangeEnabled()[0]
+
+    def on_x_range_changed(self, view_box, x_range):
+        """
+        Carrega sob demanda o trecho do histórico visível quando o usuário navega
+        para fora da borda ao vivo. Um trecho com uma largura de folga de cada
+        lado é carregado de uma vez, para que pans curtos não consultem o histórico.
+        """
+        if self.is_following_live():
+            if self.history_range is not None:
+                self.history_range = None
+                self.request_update()
+            return
+        x_start, x_stop = x_range
+        if self.history_range is not None:
+            loaded_start, loaded_stop = self.history_range
+            if loaded_start <= x_start and x_stop <= loaded_stop:
+                return
+        elif len(self.buffer) and x_start >= self.buffer.view()[0][0]:
+            return  # O trecho ainda está no buffer ao vivo
+        width = x_stop - x_start
+        self.history_range = (x_start - width, x_stop + width)
+        self._set_item_data(*self.history.range(*self.history_range))
+
+    def resume_live(self):
+        """
+        Volta a acompanhar a borda ao vivo.
+        """
+        self.history_range = None
+        self.getViewBox().enableAutoRange(x=True, y=True)
+        self.request_update()
+
+    def add_data_point(self, x, y):
+        """
+        Adiciona um novo ponto de dados e atualiza o gráfico. Os pontos mais antigos
+        são descartados quando o buffer atinge sua capacidade.
+        """
+        self.buffer.append(x, y)
+        self.history.append(x, y)
+        self.request_update()
+
+    def add_data_points(self, xs, ys):
+        """
+        Adiciona um bloco de pontos de dados (arrays) de uma só vez.
+        """
+        self.buffer.extend(xs, ys)
+        self.history.extend(xs, ys)
+        self.request_update()
+
+    def request_update(self):
+        """
+        Agenda o redesenho no próximo quadro do RenderScheduler ou redesenha imediatamente
+        se o gráfico não estiver associado a um.
+        """
+        if self.render_scheduler is not None:
+            self.render_scheduler.mark_dirty(self)
+        else:
+            self.update_chart()
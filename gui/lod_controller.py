@@ -0,0 +1,74 @@
+# gui/lod_controller.py
+
+import numpy as np
+
+from data.lod_pyramid import LodPyramid
+
+# Espaço mínimo (em pixels) entre amostras para que os marcadores sejam desenhados
+SYMBOL_MIN_SPACING = 6
+
+
+class LodController:
+    """
+    Mantém as curvas de um PlotWidget no nível de detalhe adequado ao trecho
+    visível. A cada zoom/pan (ou redimensionamento), cada curva recebe apenas os
+    pontos do nível da LodPyramid com cerca de um balde por pixel, e os
+    marcadores são escondidos quando as amostras ficam mais densas que os pixels.
+    """
+
+    def __init__(self, plot_widget):
+        self.plot_widget = plot_widget
+        self.curves = {}  # {curva: (pirâmide, marcador original)}
+        self.updating = False
+        view_box = plot_widget.getPlotItem().getViewBox()
+        view_box.sigXRangeChanged.connect(self.update_all)
+        view_box.sigResized.connect(self.update_all)
+
+    def add_curve(self, curve, pyramid=None):
+        """
+        Passa a controlar o nível de detalhe da curva. A pirâmide pode ser
+        compartilhada (por exemplo, entre o gráfico normal e o de tela cheia).
+        """
+        if pyramid is None:
+            pyramid = LodPyramid(curve.x_data, curve.y_data)
+        self.curves[curve] = (pyramid, curve.opts.get('symbol'))
+        self.update_curve(curve)
+        return pyramid
+
+    def remove_curve(self, curve):
+        self.curves.pop(curve, None)
+
+    def clear(self):
+        self.curves.clear()
+
+    def visible_range(self):
+        """
+        Retorna (x inicial, x final, largura em pixels) da área visível. Com o
+        auto-range ativo em x, toda a série é considerada visível, para que o
+        enquadramento automático sempre enxergue os limites completos dos dados.
+        """
+        view_box = self.plot_widget.getPlotItem().getViewBox()
+        pixels = max(int(view_box.width()), 1)
+        if view_box.autoRangeEnabled()[0]:
+            return -np.inf, np.inf, pixels
+        (x_start, x_stop), _ = view_box.viewRange()
+        return x_start, x_stop, pixels
+
+    def update_all(self, *args):
+        if self.updating:
+            return
+        self.updating = True
+        try:
+            for curve in list(self.curves):
+                self.update_curve(curve)
+        finally:
+            self.updating = False
+
+    def update_curve(self, curve):
+        pyramid, symbol = self.curves[curve]
+        x_start, x_stop, pixels = self.visible_range()
+        x, y, level = pyramid.select(x_start, x_stop, pixels)
+
+        # Marcadores só quando cada amostra tem espaço para aparecer
+        show_symbols = symbol is not None and level == 0 and len(x) * SYMBOL_MIN_SPACING <= pixels
+        curve.setData(x, y, symbol=symbol if show_symbols else None)
@@ -3,22 +3,35 @@
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QGridLayout, QTabWidget,
     QLabel, QPushButton, QDialog, QFormLayout, QMessageBox,
-    QListWidget, QListWidgetItem, QHBoxLayout, QApplication, QSpinBox, QMenu, QColorDialog, QComboBox
+    QListWidget, QListWidgetItem, QHBoxLayout, QApplication, QColorDialog, QComboBox,
+    QInputDialog
 )
-from PySide6.QtCore import Qt, QMimeData, QSize, QPoint, Signal
-from PySide6.QtGui import QPalette, QColor, QDrag, QCursor, QPixmap, QPainter, QBrush, QAction, QFont
+from PySide6.QtCore import Qt, QMimeData, Signal
+from PySide6.QtGui import QPalette, QColor, QDrag, QCursor, QPixmap, QPainter, QBrush
 from gui.sensor_selection import SensorSelectionWidget
 from gui.comparison_view import ComparisonView
 from gui.styles import DARK_THEME, LIGHT_THEME
 from gui.setup_view import SetupView
 from gui.car_monitoring_view import CarMonitoringView
-from pyqtgraph import PlotWidget, mkPen
-import pyqtgraph as pg
+from gui.render_scheduler import RenderScheduler, DEFAULT_TARGET_FPS
+from gui.live_plot import LivePlotMixin
+from gui.multi_panel_canvas import MultiPanelCanvas, LAYOUT_GRID, LAYOUT_CANVAS
+from gui.render_backend import resolve_render_backend, apply_render_backend, DEFAULT_RENDER_BACKEND
+from gui.layout_profiles import (
+    LAYOUT_CONFIG_PATH, DEFAULT_PROFILE, load_layout_profiles, save_layout_profiles, profile_positions, grid_size
+)
+from pyqtgraph import PlotWidget
 import json
 import os
-import time
 import math
-from data.api_service import APIService
+from data.api_service import APIService, build_decoder
+from data.data_processor import DataProcessor
+from data.processing_stages import build_stages
+from data.ingest_engine import IngestEngine
+from data.session_recorder import SessionRecorder
+from data.lap_segmentation import build_segmenter
+from data.ring_buffer import DEFAULT_CAPACITY
+from data.history_store import DEFAULT_RETENTION, DEFAULT_MAX_SAMPLES
 
 
 # --- Diálogo para configurar gráficos (não grade) ---
@@ -72,6 +85,7 @@ class GraphConfigurationDialog(QDialog):
         # Variáveis para armazenar as cores escolhidas
         self.chosen_line_color = None
         self.chosen_bg_color = None
+        self.bg_color_selected = False  # True só quando o usuário escolhe a cor de fundo
 
         # Quando o usuário selecionar um gráfico na lista, carregar suas configurações atuais
         self.graph_list.currentTextChanged.connect(self.load_graph_settings)
@@ -81,7 +95,10 @@ class GraphConfigurationDialog(QDialog):
         if widget:
             self.type_combo.setCurrentText(widget.current_chart_type)
             self.chosen_line_color = widget.line_color
-            self.chosen_bg_color = widget.palette().color(widget.backgroundRole()).name()
+            self.chosen_bg_color = getattr(widget, "bg_color", None)
+            self.bg_color_selected = False
+            if self.chosen_bg_color is None and isinstance(widget, QWidget):
+                self.chosen_bg_color = widget.palette().color(widget.backgroundRole()).name()
             self.line_color_button.setStyleSheet(f"background-color: {self.chosen_line_color};")
             self.bg_color_button.setStyleSheet(f"background-color: {self.chosen_bg_color};")
 
@@ -95,6 +112,7 @@ class GraphConfigurationDialog(QDialog):
         color = QColorDialog.getColor()
         if color.isValid():
             self.chosen_bg_color = color.name()
+            self.bg_color_selected = True
             self.bg_color_button.setStyleSheet(f"background-color: {self.chosen_bg_color};")
 
 
@@ -148,8 +166,9 @@ class ColorSelectionDialog(QDialog):
             self.bg_color_button.setStyleSheet(f"background-color: {self.bg_color};")
 
 
-class DraggablePlotWidget(PlotWidget):
-    def __init__(self, title, main_window, parent=None):
+class DraggablePlotWidget(LivePlotMixin, PlotWidget):
+    def __init__(self, title, main_window, parent=None, buffer_size=DEFAULT_CAPACITY, render_scheduler=None,
+                 history_retention=DEFAULT_RETENTION, history_max_samples=DEFAULT_MAX_SAMPLES):
         super().__init__(parent=parent)
         self.main_window = main_window  # Referência à MainWindow
 
@@ -158,78 +177,31 @@ class DraggablePlotWidget(PlotWidget):
         self.setAcceptDrops(True)
         self.drag_start_position = None
 
-        # Atributos para definir o tipo do gráfico e as cores
-        self.current_chart_type = "line"  # Tipo padrão
-        self.line_color = 'r'  # Cor inicial da linha (vermelho)
-
-        # Arrays de dados
-        self.data_x = []
-        self.data_y = []
-
         # Configuração inicial do plot
         self.setBackground('#2E2E2E' if self.main_window.current_theme == "Dark" else '#ffe0e0')
-        self.setTitle(title, color=self.line_color, size="16pt", bold=True)
-        self.setLabel("left", "Valor", color="w", size="12pt")
-        self.setLabel("bottom", "Tempo (s)", color="w", size="12pt")
-
-        # Habilitar a grade por padrão com opacidade máxima
-        self.showGrid(x=True, y=True, alpha=1.0)
-
-        # Personaliza a fonte dos ticks dos eixos
-        left_axis = self.getAxis("left")
-        left_axis.tickFont = QFont("Arial", 12)
-        bottom_axis = self.getAxis("bottom")
-        bottom_axis.tickFont = QFont("Arial", 12)
-
-        self.plot_item = self.plot([], [], pen=mkPen(color=self.line_color, width=2))
+        self.setup_live_plot(title, buffer_size=buffer_size, render_scheduler=render_scheduler,
+                             history_retention=history_retention, history_max_samples=history_max_samples)
 
         # Desabilita o menu de contexto (não permite alterar propriedades pelo clique)
         self.setContextMenuPolicy(Qt.NoContextMenu)
 
-    def set_chart_type(self, chart_type):
-        """
-        Define o tipo de gráfico e atualiza a visualização.
-        """
-        self.current_chart_type = chart_type
-        self.update_chart()
-
-    def update_chart(self):
-        """
-        Redesenha o gráfico de acordo com o tipo selecionado.
-        """
-        self.clear()
-        if self.current_chart_type == "line":
-            self.plot(self.data_x, self.data_y, pen=mkPen(color=self.line_color, width=2))
-        elif self.current_chart_type == "bar":
-            bar_graph = pg.BarGraphItem(x=self.data_x, height=self.data_y, width=0.5, brush='g')
-            self.addItem(bar_graph)
-        elif self.current_chart_type == "radial":
-            radial_plot = pg.PlotCurveItem(
-                x=self.data_x,
-                y=self.data_y,
-                pen=mkPen(color='b', width=2, style=Qt.DashLine),
-                name="Radial"
-            )
-            self.addItem(radial_plot)
-
-    def add_data_point(self, x, y):
-        """
-        Adiciona um novo ponto de dados e atualiza o gráfico (mantendo somente os 100 últimos pontos).
-        """
-        self.data_x.append(x)
-        self.data_y.append(y)
-        if len(self.data_x) > 100:
-            self.data_x = self.data_x[-100:]
-            self.data_y = self.data_y[-100:]
-        self.update_chart()
-
     # Se desejar manter o suporte a drag-and-drop, mantenha os métodos de mouse e drag
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.drag_start_position = event.position()
         super().mousePressEvent(event)
 
+    def mouseDoubleClickEvent(self, event):
+        # Duplo clique retorna à borda ao vivo
+        self.resume_live()
+        event.accept()
+
     def mouseMoveEvent(self, event):
+        if event.modifiers() & Qt.ShiftModifier:
+            # Shift + arrastar faz pan no histórico (arrastar sem Shift troca gráficos)
+            self.drag_start_position = None
+            super().mouseMoveEvent(event)
+            return
         if not (event.buttons() & Qt.LeftButton):
             return
         if self.drag_start_position is None:
@@ -413,14 +385,37 @@ class MainWindow(QMainWindow):
         self.sensor_selection = SensorSelectionWidget()
         self.monitoring_layout.addWidget(self.sensor_selection, stretch=1)
 
+        live_area = QWidget()
+        live_layout = QVBoxLayout(live_area)
+        live_layout.setContentsMargins(0, 0, 0, 0)
+
+        # Perfis de layout salvos em graph_layout_config.json (troca com um clique)
+        profile_bar = QHBoxLayout()
+        profile_bar.addWidget(QLabel("Layout:"))
+        self.layout_profile_combo = QComboBox()
+        self.layout_profile_combo.setMinimumWidth(180)
+        self.layout_profile_combo.setToolTip("Aplica um perfil de layout salvo")
+        self.layout_profile_combo.textActivated.connect(self.apply_layout_profile)
+        profile_bar.addWidget(self.layout_profile_combo)
+        self.save_layout_button = QPushButton("Salvar Layout")
+        self.save_layout_button.setToolTip("Salva a grade atual (posições, tipos, cores e buffers) como um perfil")
+        self.save_layout_button.clicked.connect(self.save_layout_profile)
+        profile_bar.addWidget(self.save_layout_button)
+        profile_bar.addStretch()
+        live_layout.addLayout(profile_bar)
+
         self.graph_grid_layout = QGridLayout()
         self.graph_grid_widget = QWidget()
         self.graph_grid_widget.setLayout(self.graph_grid_layout)
-        self.monitoring_layout.addWidget(self.graph_grid_widget, stretch=4)
+        live_layout.addWidget(self.graph_grid_widget)
+        self.monitoring_layout.addWidget(live_area, stretch=4)
 
         self.graph_widgets = {}
+        self.multi_panel_canvas = None  # Tela única usada no modo "canvas"
         self.highlighted_positions = set()
         self.selected_sensors = []
+        self.layout_config_path = LAYOUT_CONFIG_PATH
+        self.layout_profiles = {}
 
         self.sensor_selection.selections_applied.connect(self.setup_graphs)
 
@@ -447,13 +442,52 @@ class MainWindow(QMainWindow):
                 "retry_delay": 1.0
             }
 
-        # Initialize API service with configuration
-        self.api_service = APIService(
-            api_url=self.api_config["api_endpoint"],
-            update_rate=self.api_config["update_rate"],
-            retry_delay=self.api_config["retry_delay"]
+        # Backend de desenho (raster ou OpenGL) de todos os gráficos
+        self.render_backend = resolve_render_backend(self.api_config.get("render_backend", DEFAULT_RENDER_BACKEND))
+        self.comparison_page.set_render_backend(self.render_backend)
+
+        # Relógio de quadros que redesenha os gráficos ao vivo
+        self.render_scheduler = RenderScheduler(
+            target_fps=self.api_config.get("render_fps", DEFAULT_TARGET_FPS), parent=self
         )
-        self.api_service.data_generated.connect(self.update_graphs_with_data)
+        self.render_scheduler.start()
+
+        # Cadeia de ingestão: APIService (ou IngestEngine) -> DataProcessor -> gráficos
+        self.data_processor = DataProcessor(stages=build_stages(self.api_config.get("processing", [])))
+        if "endpoints" in self.api_config:
+            # Várias ECUs: um único motor asyncio consulta todos os endpoints
+            self.api_service = IngestEngine(
+                endpoints=self.api_config["endpoints"],
+                retry_delay=self.api_config["retry_delay"]
+            )
+        else:
+            # Initialize API service with configuration
+            self.api_service = APIService(
+                api_url=self.api_config["api_endpoint"],
+                update_rate=self.api_config["update_rate"],
+                retry_delay=self.api_config["retry_delay"],
+                batch_mode=self.api_config.get("batch_mode", False),
+                transport=self.api_config.get("transport", "poll"),
+                decoder=build_decoder(self.api_config)
+            )
+            self.api_service.data_generated.connect(self.data_processor.process_data)
+        self.api_service.block_generated.connect(self.data_processor.process_block)
+        self.data_processor.data_updated.connect(self.update_graphs_with_block)
+        self.data_processor.stats_updated.connect(self.update_status_bar)
+        self.data_processor.start()
+
+        # Gravação de toda a telemetria bruta em disco, na thread da ingestão (sem passar pela interface)
+        self.session_recorder = None
+        if self.api_config.get("record_sessions", True):
+            default_session_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sessions')
+            self.session_recorder = SessionRecorder(
+                self.api_config.get("session_dir", default_session_dir),
+                lap_segmenter=build_segmenter(self.api_config.get("lap_detection"))
+            )
+            if isinstance(self.api_service, APIService):
+                self.api_service.data_generated.connect(self.session_recorder.record_data, Qt.DirectConnection)
+            self.api_service.block_generated.connect(self.session_recorder.record_block, Qt.DirectConnection)
+            self.session_recorder.start()
         self.api_service.start()
 
         # Conectar o sinal de mudança de tab para mostrar/esconder o botão de configuração
@@ -462,6 +496,9 @@ class MainWindow(QMainWindow):
         # Inicialmente, mostrar o botão de configuração (assumindo que o primeiro tab é o de monitoramento)
         self.configure_graph_button.setVisible(True)
 
+        # Restaura o último perfil de layout salvo
+        self.load_layout_profiles()
+
     def open_graph_config_dialog(self):
         dialog = GraphConfigurationDialog(self.graph_widgets, self)
         if dialog.exec() == QDialog.Accepted:
@@ -472,10 +509,11 @@ class MainWindow(QMainWindow):
                 if widget:
                     widget.set_chart_type(dialog.type_combo.currentText())
                     if dialog.chosen_line_color:
-                        widget.line_color = dialog.chosen_line_color
-                    if dialog.chosen_bg_color:
+                        widget.set_line_color(dialog.chosen_line_color)
+                    if dialog.bg_color_selected:
                         widget.setBackground(dialog.chosen_bg_color)
                         widget.bg_color = dialog.chosen_bg_color
+                        widget.custom_bg_color = dialog.chosen_bg_color
                     widget.update_chart()
 
     def change_theme(self, theme_name):
@@ -575,8 +613,12 @@ class MainWindow(QMainWindow):
         self.theme_changed.emit(self.current_theme)
 
         # Update graph backgrounds
+        if self.multi_panel_canvas is not None:
+            self.multi_panel_canvas.setBackground('#2E2E2E' if self.current_theme == "Dark" else '#ffe0e0')
         for sensor_name, plot in self.graph_widgets.items():
-            plot.setBackground('#2E2E2E' if self.current_theme == "Dark" else '#ffe0e0')
+            # Gráficos com cor de fundo personalizada mantêm a cor escolhida
+            if plot.custom_bg_color is None:
+                plot.setBackground('#2E2E2E' if self.current_theme == "Dark" else '#ffe0e0')
             # Atualizar as cores do texto dos gráficos
             text_color = 'white' if self.current_theme == "Dark" else 'black'
             plot.setLabel('left', 'Valor', color=text_color)
@@ -593,30 +635,236 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(stylesheet)
 
     def setup_graphs(self, selected_sensors_list):
+        """
+        Monta os gráficos dos sensores selecionados, na grade (um PlotWidget por
+        sensor) ou na tela única (configuração "live_layout": "canvas").
+        """
         self.selected_sensors = selected_sensors_list
-        self.clear_grid_layout()
         self.highlighted_positions.clear()
-        self.graph_widgets.clear()
+
+        self.graph_grid_widget.setUpdatesEnabled(False)
+        try:
+            if self.api_config.get("live_layout", LAYOUT_GRID) == LAYOUT_CANVAS:
+                self.setup_canvas(selected_sensors_list)
+            else:
+                self.setup_grid(selected_sensors_list)
+        finally:
+            self.graph_grid_widget.setUpdatesEnabled(True)
+        if selected_sensors_list:
+            QMessageBox.information(self, "Configuração Atualizada", "Os gráficos foram configurados com sucesso!")
+
+    def setup_grid(self, selected_sensors_list):
+        """
+        Os gráficos ficam em um pool por sensor (self.graph_widgets): só os
+        sensores que entraram ou saíram da seleção criam/destroem widgets, e os
+        demais são apenas reposicionados na grade, mantendo os dados já recebidos.
+        """
+        for sensor in list(self.graph_widgets):
+            if sensor not in selected_sensors_list:
+                self.remove_plot(sensor)
 
         num_sensors = len(selected_sensors_list)
         if num_sensors == 0:
+            self.detach_grid_widgets()
             return
 
         rows = math.ceil(math.sqrt(num_sensors))
         cols = math.ceil(num_sensors / rows)
-        for index, sensor in enumerate(selected_sensors_list):
-            row = index // cols
-            col = index % cols
-            plot = DraggablePlotWidget(title=sensor, main_window=self, parent=self.graph_grid_widget)
-            plot.data_x = []
-            plot.data_y = []
-            plot.setObjectName(sensor)
-            self.graph_grid_layout.addWidget(plot, row, col, 1, 1)
-            self.graph_widgets[sensor] = plot
-
-        self.adjust_grid_stretch(rows, cols)
-        self.graph_grid_widget.update()
-        QMessageBox.information(self, "Configuração Atualizada", "Os gráficos foram configurados com sucesso!")
+        self.place_plots([(sensor, (index // cols, index % cols, 1, 1))
+                          for index, sensor in enumerate(selected_sensors_list)])
+
+    def place_plots(self, positions, buffer_sizes=None):
+        """
+        Posiciona os gráficos na grade em uma única passada, criando os que ainda
+        não estão no pool. `positions` é [(sensor, (linha, coluna, linhas, colunas))].
+        """
+        buffer_sizes = buffer_sizes or {}
+        self.detach_grid_widgets()
+        for sensor, (row, col, row_span, col_span) in positions:
+            plot = self.graph_widgets.get(sensor)
+            if plot is None:
+                plot = self.create_plot(sensor, buffer_sizes.get(sensor))
+                self.graph_widgets[sensor] = plot
+            self.graph_grid_layout.addWidget(plot, row, col, row_span, col_span)
+            plot.show()
+        self.adjust_grid_stretch(*grid_size(positions))
+
+    def setup_canvas(self, selected_sensors_list, buffer_sizes=None):
+        """
+        Desenha todos os sensores em uma única MultiPanelCanvas, com uma só cena e
+        uma só pintura por quadro, em vez de um QGraphicsView por sensor.
+        """
+        if self.multi_panel_canvas is None:
+            self.multi_panel_canvas = MultiPanelCanvas(
+                parent=self.graph_grid_widget,
+                buffer_size=self.api_config.get("buffer_size", DEFAULT_CAPACITY),
+                render_scheduler=self.render_scheduler,
+                history_retention=self.api_config.get("history_retention", DEFAULT_RETENTION),
+                history_max_samples=self.api_config.get("history_max_samples", DEFAULT_MAX_SAMPLES)
+            )
+            self.multi_panel_canvas.setBackground('#2E2E2E' if self.current_theme == "Dark" else '#ffe0e0')
+            apply_render_backend(self.multi_panel_canvas, self.render_backend)
+            self.graph_grid_layout.addWidget(self.multi_panel_canvas, 0, 0, 1, 1)
+            self.adjust_grid_stretch(1, 1)
+        self.graph_widgets.clear()
+        self.graph_widgets.update(self.multi_panel_canvas.set_sensors(selected_sensors_list, buffer_sizes))
+
+    def load_layout_profiles(self):
+        """
+        Lê os perfis de graph_layout_config.json e aplica o perfil ativo.
+        """
+        self.layout_profiles, active = load_layout_profiles(self.layout_config_path)
+        self.refresh_profile_combo(active)
+        if active is not None:
+            self.apply_layout_profile(active)
+
+    def refresh_profile_combo(self, current=None):
+        self.layout_profile_combo.blockSignals(True)
+        self.layout_profile_combo.clear()
+        self.layout_profile_combo.addItems(list(self.layout_profiles))
+        if current is not None:
+            self.layout_profile_combo.setCurrentText(current)
+        self.layout_profile_combo.blockSignals(False)
+
+    def apply_layout_profile(self, name):
+        """
+        Aplica um perfil de layout em uma única passada, com a grade congelada:
+        posições e spans, tipo de gráfico, cores e tamanho do buffer de cada
+        sensor. Gráficos já existentes são reaproveitados com seus dados; só são
+        recriados os que mudaram de tamanho de buffer.
+        """
+        profile = self.layout_profiles.get(name)
+        if profile is None:
+            return
+        positions = profile_positions(profile)
+        sensors = [sensor for sensor, _ in positions]
+        buffer_sizes = {sensor: entry["bufferSize"] for sensor, entry in profile.items() if "bufferSize" in entry}
+        canvas_mode = self.api_config.get("live_layout", LAYOUT_GRID) == LAYOUT_CANVAS
+
+        self.selected_sensors = sensors
+        self.highlighted_positions.clear()
+        self.sensor_selection.set_selected_sensors(sensors)
+
+        self.graph_grid_widget.setUpdatesEnabled(False)
+        try:
+            for sensor, plot in list(self.graph_widgets.items()):
+                if sensor not in profile or buffer_sizes.get(sensor, plot.buffer.capacity) != plot.buffer.capacity:
+                    if canvas_mode:
+                        self.multi_panel_canvas.remove_panel(sensor)
+                        del self.graph_widgets[sensor]
+                    else:
+                        self.remove_plot(sensor)
+            if canvas_mode:
+                # A tela única empilha os painéis na ordem da grade
+                self.setup_canvas(sensors, buffer_sizes)
+            else:
+                self.place_plots(positions, buffer_sizes)
+            for sensor in sensors:
+                self.apply_plot_settings(self.graph_widgets[sensor], profile[sensor])
+        finally:
+            self.graph_grid_widget.setUpdatesEnabled(True)
+        self.layout_profile_combo.setCurrentText(name)
+
+    def apply_plot_settings(self, plot, entry):
+        """
+        Aplica ao gráfico o tipo e as cores salvos no perfil.
+        """
+        if entry.get("lineColor"):
+            plot.set_line_color(entry["lineColor"])
+        if entry.get("backgroundColor"):
+            plot.setBackground(entry["backgroundColor"])
+            plot.bg_color = entry["backgroundColor"]
+            plot.custom_bg_color = entry["backgroundColor"]
+        elif plot.custom_bg_color is not None:
+            # Sem cor no perfil, o gráfico reaproveitado volta a seguir o tema
+            plot.custom_bg_color = None
+            plot.setBackground('#2E2E2E' if self.current_theme == "Dark" else '#ffe0e0')
+        plot.set_chart_type(entry.get("chartType", plot.current_chart_type))
+
+    def capture_layout_profile(self, base=None):
+        """
+        Retorna o layout atual no formato de perfil ({sensor: configuração}).
+
+        Na tela única não há grade: a posição e os spans de cada sensor vêm do
+        perfil `base` (o perfil sobrescrito ou o aplicado), e sensores que não
+        estão nele são acrescentados em linhas novas abaixo da grade do perfil.
+        A cor de fundo só é salva quando foi escolhida pelo usuário.
+        """
+        base = base or {}
+        canvas_mode = self.api_config.get("live_layout", LAYOUT_GRID) == LAYOUT_CANVAS
+        next_row = grid_size(profile_positions({sensor: entry for sensor, entry in base.items()
+                                                if sensor in self.selected_sensors}))[0]
+        profile = {}
+        for sensor in self.selected_sensors:
+            plot = self.graph_widgets.get(sensor)
+            if plot is None:
+                continue
+            layout_index = -1 if canvas_mode else self.graph_grid_layout.indexOf(plot)
+            if layout_index >= 0:
+                row, col, row_span, col_span = self.graph_grid_layout.getItemPosition(layout_index)
+            elif sensor in base:
+                previous = base[sensor]
+                row, col = previous.get("row", 0), previous.get("column", 0)
+                row_span, col_span = previous.get("rowSpan", 1), previous.get("colSpan", 1)
+            else:
+                row, col, row_span, col_span = next_row, 0, 1, 1
+                next_row += 1
+            entry = {
+                "row": row,
+                "column": col,
+                "rowSpan": row_span,
+                "colSpan": col_span,
+                "chartType": plot.current_chart_type,
+                "lineColor": plot.line_color,
+                "bufferSize": plot.buffer.capacity
+            }
+            if plot.custom_bg_color:
+                entry["backgroundColor"] = plot.custom_bg_color
+            profile[sensor] = entry
+        return profile
+
+    def save_layout_profile(self):
+        """
+        Salva os gráficos atuais como um perfil em graph_layout_config.json.
+        """
+        if not self.selected_sensors:
+            QMessageBox.warning(self, "Salvar Layout", "Selecione os sensores antes de salvar um layout.")
+            return
+        name, ok = QInputDialog.getText(self, "Salvar Layout", "Nome do perfil:",
+                                        text=self.layout_profile_combo.currentText() or DEFAULT_PROFILE)
+        name = name.strip()
+        if not ok or not name:
+            return
+        base = self.layout_profiles.get(name) or self.layout_profiles.get(self.layout_profile_combo.currentText())
+        self.layout_profiles[name] = self.capture_layout_profile(base)
+        try:
+            save_layout_profiles(self.layout_profiles, name, self.layout_config_path)
+        except OSError as e:
+            QMessageBox.warning(self, "Erro", f"Não foi possível salvar o layout: {e}")
+            return
+        self.refresh_profile_combo(name)
+
+    def create_plot(self, sensor, buffer_size=None):
+        if buffer_size is None:
+            buffer_size = self.api_config.get("buffer_size", DEFAULT_CAPACITY)
+        plot = DraggablePlotWidget(title=sensor, main_window=self, parent=self.graph_grid_widget,
+                                   buffer_size=buffer_size,
+                                   history_retention=self.api_config.get("history_retention", DEFAULT_RETENTION),
+                                   history_max_samples=self.api_config.get("history_max_samples",
+                                                                           DEFAULT_MAX_SAMPLES),
+                                   render_scheduler=self.render_scheduler)
+        plot.setObjectName(sensor)
+        apply_render_backend(plot, self.render_backend)
+        return plot
+
+    def remove_plot(self, sensor):
+        """
+        Destrói o gráfico de um sensor que saiu da seleção.
+        """
+        plot = self.graph_widgets.pop(sensor)
+        self.render_scheduler.discard(plot)
+        self.graph_grid_layout.removeWidget(plot)
+        plot.deleteLater()
 
     def adjust_grid_stretch(self, rows, cols):
         for r in range(self.graph_grid_layout.rowCount()):
@@ -628,25 +876,43 @@ class MainWindow(QMainWindow):
         for c in range(cols):
             self.graph_grid_layout.setColumnStretch(c, 1)
 
-    def clear_grid_layout(self):
+    def detach_grid_widgets(self):
+        """
+        Retira os gráficos da grade sem destruí-los, para serem reposicionados.
+        """
         while self.graph_grid_layout.count():
-            item = self.graph_grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        self.graph_grid_layout.update()
-
-    def update_graphs_with_data(self, sensor_data):
-        current_time = time.time()
+            self.graph_grid_layout.takeAt(0)
+
+    def update_graphs_with_block(self, block):
+        """
+        Atualiza os gráficos com um bloco colunar de amostras processadas. O eixo X
+        usa o horário de cada amostra no carro, não o horário de chegada na interface.
+        """
         for sensor in self.selected_sensors:
-            if sensor in sensor_data:
-                value = sensor_data[sensor]
+            values = block.channels.get(sensor)
+            if values is not None:
                 plot = self.graph_widgets.get(sensor)
                 if plot:
-                    plot.add_data_point(current_time, value)
+                    plot.add_data_points(block.timestamps, values)
+
+    def update_status_bar(self, stats):
+        """
+        Mostra os contadores do processador. Recebe a cópia emitida pela thread do
+        processador, sem ler os rastreadores de sequência que ela altera.
+        """
+        latency = stats["latency"]
+        latency_text = f"{latency * 1000:.0f} ms" if latency == latency else "N/A"  # NaN quando desconhecida
+        self.statusBar().showMessage(
+            f"Latência: {latency_text} | Amostras perdidas: {stats['missing']} | "
+            f"Duplicadas: {stats['duplicates']}"
+        )
 
     def closeEvent(self, event):
-        self.data_simulator.stop()
+        self.render_scheduler.stop()
+        self.api_service.stop()
+        self.data_processor.stop()
+        if self.session_recorder is not None:
+            self.session_recorder.stop()
         super().closeEvent(event)
 
     def swap_plots(self, source_sensor, target_sensor):
@@ -657,7 +923,6 @@ class MainWindow(QMainWindow):
             pos_target = self.graph_grid_layout.getItemPosition(self.graph_grid_layout.indexOf(plot_target))
             self.graph_grid_layout.addWidget(plot_target, pos_source[0], pos_source[1], pos_source[2], pos_source[3])
             self.graph_grid_layout.addWidget(plot_source, pos_target[0], pos_target[1], pos_target[2], pos_target[3])
-            self.graph_widgets[source_sensor], self.graph_widgets[target_sensor] = plot_target, plot_source
             print(f"Troca realizada: Gráfico '{source_sensor}' ↔ Gráfico '{target_sensor}'")
 
     def on_tab_changed(self, index):
@@ -0,0 +1,104 @@
+# gui/multi_panel_canvas.py
+
+import pyqtgraph as pg
+
+from gui.live_plot import LivePlotMixin
+from data.ring_buffer import DEFAULT_CAPACITY
+from data.history_store import DEFAULT_RETENTION, DEFAULT_MAX_SAMPLES
+
+# Modos de exibição da aba ao vivo
+LAYOUT_GRID = "grid"  # Um PlotWidget por sensor em uma grade
+LAYOUT_CANVAS = "canvas"  # Todos os sensores em uma única tela com eixos X ligados
+
+
+class CanvasPlotItem(LivePlotMixin, pg.PlotItem):
+    """
+    Painel de um sensor dentro da MultiPanelCanvas. Tem os mesmos dados e a
+    mesma API de atualização do DraggablePlotWidget, mas é apenas um item da
+    cena compartilhada, sem QGraphicsView próprio.
+    """
+
+    def __init__(self, title, buffer_size=DEFAULT_CAPACITY, render_scheduler=None,
+                 history_retention=DEFAULT_RETENTION, history_max_samples=DEFAULT_MAX_SAMPLES):
+        super().__init__()
+        self.sensor = title
+        self.bg_color = None
+        self.setup_live_plot(title, buffer_size=buffer_size, render_scheduler=render_scheduler,
+                             history_retention=history_retention, history_max_samples=history_max_samples)
+        # Sem menu de contexto, como na grade
+        self.setMenuEnabled(False)
+
+    @property
+    def plotItem(self):
+        return self
+
+    def setBackground(self, color):
+        self.bg_color = color
+        self.getViewBox().setBackgroundColor(color)
+
+    def mouseDoubleClickEvent(self, event):
+        # Duplo clique retorna à borda ao vivo
+        self.resume_live()
+        event.accept()
+
+
+class MultiPanelCanvas(pg.GraphicsLayoutWidget):
+    """
+    Desenha todos os sensores selecionados em um único GraphicsLayoutWidget: os
+    painéis ficam empilhados em uma coluna, compartilham a mesma cena (uma única
+    pintura por quadro) e têm os eixos X ligados ao primeiro painel, de modo que
+    zoom e pan no tempo valem para todos.
+
+    Os painéis ficam em um pool por sensor, como os gráficos da grade: trocar a
+    seleção só cria/remove os painéis que mudaram e mantém os dados dos demais.
+    """
+
+    def __init__(self, parent=None, buffer_size=DEFAULT_CAPACITY, render_scheduler=None,
+                 history_retention=DEFAULT_RETENTION, history_max_samples=DEFAULT_MAX_SAMPLES):
+        super().__init__(parent=parent)
+        self.buffer_size = buffer_size
+        self.render_scheduler = render_scheduler
+        self.history_retention = history_retention
+        self.history_max_samples = history_max_samples
+        self.panels = {}  # {sensor: CanvasPlotItem}
+        self.ci.setSpacing(0)
+
+    def remove_panel(self, sensor):
+        panel = self.panels.pop(sensor)
+        if self.render_scheduler is not None:
+            self.render_scheduler.discard(panel)
+        if panel in self.ci.items:
+            self.removeItem(panel)
+
+    def set_sensors(self, sensors, buffer_sizes=None):
+        """
+        Reorganiza os painéis para a lista de sensores e retorna {sensor: painel}.
+        `buffer_sizes` define a capacidade dos painéis criados ({sensor: amostras}).
+        """
+        buffer_sizes = buffer_sizes or {}
+        for sensor in list(self.panels):
+            if sensor not in sensors:
+                self.remove_panel(sensor)
+        # Retira os painéis mantidos da coluna para reinseri-los na nova ordem
+        for panel in self.panels.values():
+            if panel in self.ci.items:
+                self.removeItem(panel)
+
+        first_panel = None
+        for row, sensor in enumerate(sensors):
+            panel = self.panels.get(sensor)
+            if panel is None:
+                panel = CanvasPlotItem(sensor, buffer_size=buffer_sizes.get(sensor, self.buffer_size),
+                                       render_scheduler=self.render_scheduler,
+                                       history_retention=self.history_retention,
+                                       history_max_samples=self.history_max_samples)
+                self.panels[sensor] = panel
+            self.addItem(panel, row=row, col=0)
+            if first_panel is None:
+                first_panel = panel
+                panel.setXLink(None)
+            else:
+                panel.setXLink(first_panel)
+            # Eixo do tempo só no último painel, para sobrar altura para os dados
+            panel.showAxis("bottom", row == len(sensors) - 1)
+        return dict(self.panels)
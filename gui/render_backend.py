@@ -0,0 +1,105 @@
+# gui/render_backend.py
+
+import json
+import os
+import sys
+
+from PySide6.QtCore import Qt, QCoreApplication
+from PySide6.QtGui import QGuiApplication, QOpenGLContext, QOffscreenSurface
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+
+# Backends de desenho dos gráficos
+RENDER_RASTER = "raster"  # QPainter padrão do pyqtgraph
+RENDER_OPENGL = "opengl"  # Viewport QOpenGLWidget: as curvas são desenhadas pelo pyqtgraph via OpenGL
+RENDER_SOFTWARE_GL = "software_gl"  # OpenGL forçado no rasterizador por software (Mesa llvmpipe)
+DEFAULT_RENDER_BACKEND = RENDER_RASTER
+
+RENDER_BACKENDS = (RENDER_RASTER, RENDER_OPENGL, RENDER_SOFTWARE_GL)
+
+
+def read_render_backend(config_path=None):
+    """
+    Lê a opção "render_backend" do api_config.json. Precisa ser chamada antes
+    de criar a QApplication, por isso não depende da MainWindow.
+    """
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'api_config.json')
+    try:
+        with open(config_path, 'r') as f:
+            return json.load(f).get("render_backend", DEFAULT_RENDER_BACKEND)
+    except (OSError, ValueError):
+        return DEFAULT_RENDER_BACKEND
+
+
+def is_headless():
+    """
+    Indica se não há servidor gráfico (por exemplo, uma máquina de CI no Linux).
+    """
+    platform = os.environ.get("QT_QPA_PLATFORM", "")
+    if platform.startswith(("offscreen", "minimal")):
+        return True
+    return sys.platform.startswith("linux") and not (
+        os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    )
+
+
+def prepare_render_backend(backend):
+    """
+    Ajusta os atributos do Qt para o backend pedido. Deve ser chamada antes de
+    criar a QApplication. Sem servidor gráfico, o modo OpenGL passa a usar o
+    OpenGL por software, que funciona com o Mesa em um display virtual (Xvfb).
+    """
+    if backend not in RENDER_BACKENDS:
+        print(f"Backend de desenho desconhecido: {backend}. Usando {DEFAULT_RENDER_BACKEND}.")
+        return DEFAULT_RENDER_BACKEND
+    if backend == RENDER_RASTER:
+        return backend
+    if backend == RENDER_OPENGL and is_headless():
+        backend = RENDER_SOFTWARE_GL
+    if backend == RENDER_SOFTWARE_GL:
+        QCoreApplication.setAttribute(Qt.AA_UseSoftwareOpenGL)
+    # Vários gráficos OpenGL na mesma janela compartilham recursos
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    return backend
+
+
+def opengl_available():
+    """
+    Testa se é possível criar um contexto OpenGL na plataforma atual.
+    """
+    if QGuiApplication.instance() is None:
+        return False
+    context = QOpenGLContext()
+    if not context.create():
+        return False
+    surface = QOffscreenSurface()
+    surface.create()
+    available = surface.isValid() and context.makeCurrent(surface)
+    if available:
+        context.doneCurrent()
+    return available
+
+
+def resolve_render_backend(backend):
+    """
+    Retorna o backend efetivo, com a QApplication já criada: quando nenhum
+    contexto OpenGL pode ser criado (nem por software), volta para o raster.
+    """
+    if backend not in RENDER_BACKENDS:
+        return DEFAULT_RENDER_BACKEND
+    if backend != RENDER_RASTER and not opengl_available():
+        print(f"OpenGL indisponível nesta plataforma; usando o backend {RENDER_RASTER}.")
+        return RENDER_RASTER
+    return backend
+
+
+def apply_render_backend(view, backend):
+    """
+    Aplica o backend a um GraphicsView do pyqtgraph (PlotWidget, GraphicsLayoutWidget).
+    O raster já é o padrão: a viewport só é trocada ao ligar o OpenGL ou ao
+    voltar de uma viewport OpenGL.
+    """
+    if backend != RENDER_RASTER:
+        view.useOpenGL(True)
+    elif isinstance(view.viewport(), QOpenGLWidget):
+        view.useOpenGL(False)
@@ -0,0 +1,64 @@
+# gui/render_scheduler.py
+
+from PySide6.QtCore import QObject, QTimer, Qt
+
+# Taxa de quadros padrão para redesenhar os gráficos ao vivo
+DEFAULT_TARGET_FPS = 30
+
+
+class RenderScheduler(QObject):
+    """
+    Relógio de quadros para os gráficos ao vivo.
+
+    As amostras recebidas são acumuladas nos buffers de cada gráfico e o gráfico
+    apenas é marcado como "sujo". A cada quadro do QTimer, todos os gráficos
+    sujos são redesenhados de uma vez, desacoplando a taxa de chegada dos dados
+    do custo de pintura.
+    """
+
+    def __init__(self, target_fps=DEFAULT_TARGET_FPS, parent=None):
+        super().__init__(parent)
+        self.dirty_plots = set()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.flush)
+        self.set_target_fps(target_fps)
+
+    def set_target_fps(self, target_fps):
+        """
+        Define a taxa de quadros alvo (em Hz).
+        """
+        self.target_fps = max(1, int(target_fps))
+        self.timer.setInterval(int(1000 / self.target_fps))
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.dirty_plots.clear()
+
+    def mark_dirty(self, plot):
+        """
+        Agenda o redesenho do gráfico para o próximo quadro.
+        """
+        self.dirty_plots.add(plot)
+
+    def discard(self, plot):
+        """
+        Remove um gráfico da fila (por exemplo, antes de destruí-lo).
+        """
+        self.dirty_plots.discard(plot)
+
+    def clear(self):
+        self.dirty_plots.clear()
+
+    def flush(self):
+        """
+        Redesenha todos os gráficos sujos acumulados desde o último quadro.
+        """
+        if not self.dirty_plots:
+            return
+        dirty_plots, self.dirty_plots = self.dirty_plots, set()
+        for plot in dirty_plots:
+            plot.update_chart()
@@ -51,6 +51,14 @@ class SensorSelectionWidget(QWidget):
         # Conectar o botão ao método de aplicação
         self.apply_button.clicked.connect(self.emit_selections)
     
+    def set_selected_sensors(self, sensors):
+        """
+        Marca os sensores informados (e desmarca os demais) sem emitir selections_applied.
+        """
+        for index in range(self.sensor_list.count()):
+            item = self.sensor_list.item(index)
+            item.setCheckState(Qt.Checked if item.data(Qt.UserRole) in sensors else Qt.Unchecked)
+
     def emit_selections(self):
         # Obter as seleções verificadas
         selected_sensors = []
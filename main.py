@@ -2,11 +2,14 @@
 
 import sys
 from PySide6.QtWidgets import QApplication
+from gui.render_backend import prepare_render_backend, read_render_backend
 from gui.main_window import MainWindow
 from data.api_service import APIService
 from data.data_processor import DataProcessor
 
 def main():
+    # Atributos de OpenGL precisam ser definidos antes da QApplication
+    prepare_render_backend(read_render_backend())
     app = QApplication(sys.argv)
     
     # Aplicar o stylesheet global
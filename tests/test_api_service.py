@@ -0,0 +1,132 @@
+# tests/test_api_service.py
+
+import unittest
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PySide6.QtCore import QCoreApplication, Qt
+import sys
+
+import numpy as np
+from data.api_service import APIService, parse_stream_line, build_decoder
+
+
+class NDJSONStreamHandler(BaseHTTPRequestHandler):
+    """
+    Servidor substituto do carro: envia 3 amostras em NDJSON (chunked) por conexão
+    e depois encerra a conexão, forçando o serviço a reconectar.
+    """
+    protocol_version = "HTTP/1.1"
+    samples_per_connection = 3
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for seq in range(self.samples_per_connection):
+            line = json.dumps({"seq": seq, "timestamp": time.time(), "DHT - Temperatura": 20.0 + seq}) + "\n"
+            data = line.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+            time.sleep(0.02)
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestParseStreamLine(unittest.TestCase):
+    def test_ndjson_and_sse_lines(self):
+        """
+        Verifica a interpretação de linhas NDJSON e de eventos SSE.
+        """
+        self.assertEqual(parse_stream_line(b'{"a": 1}'), {"a": 1})
+        self.assertEqual(parse_stream_line('data: {"a": 2}'), {"a": 2})
+        self.assertIsNone(parse_stream_line(b""))
+        self.assertIsNone(parse_stream_line(": keep-alive"))
+        self.assertIsNone(parse_stream_line("event: sample"))
+
+
+class TestBinaryDecoders(unittest.TestCase):
+    def test_struct_records(self):
+        """
+        Registros de tamanho fixo devem ser decodificados direto para arrays.
+        """
+        decoder = build_decoder({"wire_format": "struct", "channels": ["a", "b"]})
+        records = np.zeros(3, dtype=decoder.dtype)
+        records["seq"] = [7, 8, 9]
+        records["timestamp"] = [1.0, 1.1, 1.2]
+        records["a"] = [10.0, 11.0, 12.0]
+        block = decoder.decode(records.tobytes(), received_at=2.0)
+        np.testing.assert_array_equal(block.sequence, [7, 8, 9])
+        np.testing.assert_allclose(block.channels["a"], [10.0, 11.0, 12.0])
+        np.testing.assert_allclose(block.latency, [1.0, 0.9, 0.8])
+
+    def test_columnar_arrays(self):
+        """
+        O formato colunar é um contador seguido de uma coluna contígua por campo.
+        """
+        decoder = build_decoder({"wire_format": "columnar", "channels": ["a"], "value_dtype": "<f8"})
+        body = (np.array([2], "<u4").tobytes() + np.array([1, 2], "<u8").tobytes()
+                + np.array([0.5, 0.6], "<f8").tobytes() + np.array([3.0, 4.0], "<f8").tobytes())
+        block = decoder.decode(body)
+        np.testing.assert_array_equal(block.sequence, [1, 2])
+        np.testing.assert_allclose(block.timestamps, [0.5, 0.6])
+        np.testing.assert_allclose(block.channels["a"], [3.0, 4.0])
+        self.assertIsNone(build_decoder({}))
+
+    def test_empty_binary_body(self):
+        """
+        Um corpo vazio (nada novo desde o cursor) resulta em um bloco vazio, não em erro.
+        """
+        for wire_format in ("columnar", "struct"):
+            decoder = build_decoder({"wire_format": wire_format, "channels": ["a"]})
+            block = decoder.decode(b"", received_at=1.0)
+            self.assertEqual(len(block), 0)
+            self.assertEqual(len(block.channels["a"]), 0)
+
+
+class TestAPIServiceStream(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), NDJSONStreamHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/stream"
+
+        self.received = []
+        self.latencies = []
+        self.done = threading.Event()
+        self.service = APIService(url, retry_delay=0.1, transport="stream")
+        # Conexão direta: o slot roda na thread do serviço, sem depender do loop de eventos
+        self.service.data_generated.connect(self.collect_data, Qt.DirectConnection)
+
+    def tearDown(self):
+        self.service.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def collect_data(self, data):
+        self.latencies.append(time.time() - data["timestamp"])
+        self.received.append(data)
+        if len(self.received) >= 6:
+            self.done.set()
+
+    def test_stream_receives_samples_and_reconnects(self):
+        """
+        O serviço deve receber as amostras assim que chegam e reconectar quando o
+        servidor encerra o stream.
+        """
+        self.service.start()
+        self.assertTrue(self.done.wait(10), "Deve receber 6 amostras em duas conexões.")
+        self.assertEqual([data["seq"] for data in self.received[:6]], [0, 1, 2, 0, 1, 2])
+        # Latência ponta a ponta medida contra o servidor local
+        self.assertLess(max(self.latencies), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# tests/test_data_processor.py
+
+import unittest
+import sys
+import threading
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+from data.data_processor import DataProcessor
+from data.processing_stages import MovingAverage
+
+
+class Source(QObject):
+    data_generated = Signal(dict)
+
+
+class TestDataProcessorThread(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        self.processor = DataProcessor(stages=[MovingAverage("a", 2)])
+        self.source = Source()
+        self.source.data_generated.connect(self.processor.process_data)
+        self.processor.data_updated.connect(self.collect_block)
+        self.blocks = []
+        self.worker_threads = []
+
+    def tearDown(self):
+        self.processor.stop()
+
+    def collect_block(self, block):
+        self.blocks.append(block)
+        if len(self.blocks) >= 2:
+            self.app.quit()
+
+    def test_processing_runs_off_the_main_thread(self):
+        """
+        Após start(), as amostras devem ser processadas na thread do processador e
+        entregues de volta à thread principal.
+        """
+        original = self.processor.process_block
+
+        def spy(block):
+            self.worker_threads.append(threading.get_ident())
+            original(block)
+        self.processor.process_block = spy
+
+        self.processor.start()
+        self.source.data_generated.emit({"seq": 1, "timestamp": 0.0, "a": 1.0})
+        self.source.data_generated.emit({"seq": 2, "timestamp": 0.1, "a": 3.0})
+        QTimer.singleShot(5000, self.app.quit)
+        self.app.exec()
+
+        self.assertEqual(len(self.blocks), 2)
+        self.assertNotIn(threading.get_ident(), self.worker_threads)
+        self.assertEqual(self.blocks[1].channels["a"][0], 2.0)
+
+    def test_counters_are_emitted_from_the_worker(self):
+        """
+        Os contadores chegam à thread principal como cópia pelo sinal
+        stats_updated, inclusive quando o bloco inteiro é descartado como duplicado.
+        """
+        stats = []
+
+        def collect_stats(snapshot):
+            stats.append(snapshot)
+            if len(stats) >= 3:
+                self.app.quit()
+        self.processor.data_updated.disconnect(self.collect_block)
+        self.processor.stats_updated.connect(collect_stats)
+
+        self.processor.start()
+        self.source.data_generated.emit({"seq": 1, "timestamp": 0.0, "a": 1.0})
+        self.source.data_generated.emit({"seq": 4, "timestamp": 0.3, "a": 3.0})
+        self.source.data_generated.emit({"seq": 4, "timestamp": 0.3, "a": 3.0})
+        QTimer.singleShot(5000, self.app.quit)
+        self.app.exec()
+
+        self.assertEqual([(item["missing"], item["duplicates"]) for item in stats], [(0, 0), (2, 0), (2, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
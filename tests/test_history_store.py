@@ -0,0 +1,52 @@
+# tests/test_history_store.py
+
+import unittest
+import numpy as np
+
+from data.history_store import ChunkedHistoryStore
+
+
+class TestChunkedHistoryStore(unittest.TestCase):
+    def test_range_across_chunks(self):
+        """
+        Uma consulta por intervalo deve juntar blocos selados e o bloco ativo,
+        com uma amostra a mais de cada lado.
+        """
+        store = ChunkedHistoryStore(retention=1e9, max_samples=10_000, chunk_size=100)
+        t = np.arange(1050) * 0.1
+        store.extend(t, t * 2)
+        self.assertEqual(len(store), 1050)
+        self.assertEqual(len(store.chunks), 10)
+
+        x, y = store.range(20.0, 104.0)
+        self.assertLess(x[0], 20.0)
+        self.assertGreater(x[-1], 104.0)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        np.testing.assert_allclose(y, x * 2)
+        self.assertEqual(store.range(200.0, 300.0).shape[1], 1)  # Só a última amostra
+
+    def test_retention_and_memory_bound(self):
+        """
+        Blocos fora da janela de retenção ou acima do limite de amostras são
+        descartados e reaproveitados, mantendo a memória constante.
+        """
+        store = ChunkedHistoryStore(retention=60.0, max_samples=100_000, chunk_size=1000)
+        for second in range(600):
+            t = second + np.arange(100) / 100.0
+            store.extend(t, np.sin(t))
+            if second == 100:
+                steady_memory = store.memory_bytes
+        self.assertLessEqual(store.newest() - store.oldest(), 60.0 + 10.0)
+        self.assertEqual(store.memory_bytes, steady_memory)
+
+        store = ChunkedHistoryStore(retention=1e9, max_samples=5000, chunk_size=1000)
+        for value in range(20_000):
+            store.append(value, value)
+        self.assertLessEqual(len(store), 5000 + 1000)
+        self.assertEqual(store.newest(), 19_999)
+        x, _ = store.range(0, 20_000)
+        self.assertEqual(x[0], store.oldest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# tests/test_ingest_engine.py
+
+import unittest
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PySide6.QtCore import QCoreApplication, Qt
+import sys
+
+from data.ingest_engine import IngestEngine
+
+
+class ECUHandler(BaseHTTPRequestHandler):
+    """
+    Servidor substituto com dois endpoints: /main responde a consultas com um lote
+    de amostras e /bms envia amostras em stream NDJSON (chunked).
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/main"):
+            body = json.dumps({"samples": [
+                {"seq": 1, "timestamp": time.time(), "DHT - Temperatura": 25.0},
+                {"seq": 2, "timestamp": time.time(), "DHT - Temperatura": 25.5},
+            ]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for seq in range(3):
+            data = (json.dumps({"seq": seq, "timestamp": time.time(), "Tensão": 400.0}) + "\n").encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestIngestEngine(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ECUHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.blocks = []
+        self.done = threading.Event()
+        self.engine = IngestEngine([
+            {"name": "main", "url": f"{base_url}/main", "update_rate": 0.05},
+            {"name": "bms", "url": f"{base_url}/bms", "transport": "stream", "prefix": "BMS - "},
+        ], retry_delay=0.05)
+        self.engine.block_generated.connect(self.collect_block, Qt.DirectConnection)
+
+    def tearDown(self):
+        self.engine.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def collect_block(self, block):
+        self.blocks.append(block)
+        if {b.source for b in self.blocks} == {"main", "bms"} and len(self.blocks) >= 4:
+            self.done.set()
+
+    def test_polls_and_streams_concurrently(self):
+        """
+        Os dois endpoints devem ser atendidos pela mesma thread, com os canais do
+        endpoint de stream prefixados e o cursor do endpoint em lote atualizado.
+        """
+        self.engine.start()
+        self.assertTrue(self.done.wait(10), "Deve receber blocos dos dois endpoints.")
+        bms_blocks = [b for b in self.blocks if b.source == "bms"]
+        main_blocks = [b for b in self.blocks if b.source == "main"]
+        self.assertIn("BMS - Tensão", bms_blocks[0].channels)
+        self.assertEqual(len(main_blocks[0]), 2)
+        self.assertEqual(self.engine.cursors["main"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
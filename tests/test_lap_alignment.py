@@ -0,0 +1,79 @@
+# tests/test_lap_alignment.py
+
+import unittest
+import tempfile
+import numpy as np
+
+from data.sample_block import SampleBlock
+from data.session_recorder import SessionRecorder
+from data.session_reader import SessionReader
+from data.lap_alignment import (
+    LapAligner, distance_from_speed, distance_from_gps, AXIS_DISTANCE, AXIS_FRACTION
+)
+
+
+class TestLapAlignment(unittest.TestCase):
+    def test_distance_sources(self):
+        """
+        A distância integrada da velocidade e a somada do GPS devem bater com o percurso real.
+        """
+        t = np.arange(0, 10.001, 0.01)
+        distance = distance_from_speed(t, np.full(len(t), 36.0))  # 36 km/h = 10 m/s
+        self.assertAlmostEqual(distance[-1], 100.0, places=6)
+
+        # 1 km para o norte em 100 passos
+        lat = -23.7 + np.linspace(0, 1000 / 111195.0, 101)
+        distance = distance_from_gps(lat, np.full(101, -46.7))
+        self.assertAlmostEqual(distance[-1], 1000.0, delta=1.0)
+
+    def test_laps_with_different_pace_align_by_distance(self):
+        """
+        Duas voltas de 1000 m em ritmos diferentes: um evento no mesmo ponto da
+        pista deve cair na mesma distância, e o tempo alinhado reflete o ritmo.
+        """
+        with tempfile.TemporaryDirectory() as base_dir:
+            recorder = SessionRecorder(base_dir)
+            offset = 0.0
+            for lap, speed in [(1, 72.0), (2, 36.0)]:  # 20 m/s e 10 m/s
+                lap_time = 1000 / (speed / 3.6)
+                t = offset + np.arange(0, lap_time, 0.01)
+                position = (t - offset) * speed / 3.6
+                brake = (np.abs(position - 600) < 5).astype(float)  # Frenagem aos 600 m
+                recorder.write_block(SampleBlock(
+                    t, {"Volta": np.full(len(t), lap), "Velocidade": np.full(len(t), speed), "Freio": brake}))
+                offset = t[-1] + 0.01
+            recorder.close_files()
+
+            reader = SessionReader(recorder.session_path)
+            aligner = LapAligner(reader)
+            grid, aligned = aligner.align([1, 2], ["Freio", "time"], reference_lap=1, axis=AXIS_DISTANCE)
+
+            self.assertAlmostEqual(grid[-1], 1000.0, delta=1.0)
+            for lap in (1, 2):
+                braking = grid[aligned[(lap, "Freio")] > 0.5]
+                self.assertAlmostEqual(braking.mean(), 600.0, delta=1.0)
+            at_600m = np.searchsorted(grid, 600.0)
+            self.assertAlmostEqual(aligned[(1, "time")][at_600m], 30.0, delta=0.1)
+            self.assertAlmostEqual(aligned[(2, "time")][at_600m], 60.0, delta=0.1)
+
+            # Delta de tempo: a volta 2 perde 30 s até os 600 m e 50 s na volta toda
+            grid, deltas = aligner.delta([1, 2], reference_lap=1, axis=AXIS_DISTANCE)
+            self.assertEqual(list(deltas), [2])
+            self.assertAlmostEqual(deltas[2][at_600m], 30.0, delta=0.1)
+            self.assertAlmostEqual(np.nanmax(deltas[2]), 50.0, delta=0.1)
+
+            # Trocar a referência reaproveita as voltas alinhadas em cache
+            cached = len(aligner.aligned)
+            grid, deltas = aligner.delta([1, 2], reference_lap=2, axis=AXIS_DISTANCE)
+            self.assertAlmostEqual(deltas[1][at_600m], -30.0, delta=0.1)
+            self.assertEqual(len(aligner.aligned), cached)
+
+            # A distância de cada volta é calculada uma única vez
+            self.assertEqual(len(aligner.distances), 2)
+            grid, aligned = aligner.align([1, 2], ["Freio"], reference_lap=2, axis=AXIS_FRACTION)
+            self.assertEqual((grid[0], grid[-1]), (0.0, 1.0))
+            self.assertEqual(len(aligner.distances), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
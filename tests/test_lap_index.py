@@ -0,0 +1,83 @@
+# tests/test_lap_index.py
+
+import unittest
+import tempfile
+import numpy as np
+
+from data.lap_index import LapIndex, LapIndexBuilder
+from data.sample_block import SampleBlock
+from data.session_recorder import SessionRecorder
+from data.session_reader import SessionReader
+
+
+class TestLapIndex(unittest.TestCase):
+    def build(self, block_size):
+        """
+        Alimenta o construtor com 3 voltas de 10 s (10 Hz), 2 setores por volta,
+        divididas em blocos de `block_size` amostras.
+        """
+        t = np.arange(300) * 0.1
+        laps = np.floor(t / 10) + 1
+        sectors = np.where((t % 10) < 4, 1.0, 2.0)
+        laps[150:153] = np.nan  # Amostras sem o canal de volta são ignoradas
+        builder = LapIndexBuilder()
+        for start in range(0, 300, block_size):
+            stop = start + block_size
+            builder.add_block(start, t[start:stop], {"Volta": laps[start:stop], "Setor": sectors[start:stop]})
+        return builder
+
+    def test_incremental_build_matches_single_block(self):
+        """
+        O índice deve ser o mesmo independentemente do tamanho dos blocos gravados.
+        """
+        expected = self.build(300).finish().laps
+        self.assertEqual(self.build(7).finish().laps, expected)
+        self.assertEqual([(lap["lap"], lap["start"], lap["stop"]) for lap in expected],
+                         [(1, 0, 100), (2, 100, 200), (3, 200, 300)])
+
+        lap = expected[1]
+        self.assertTrue(lap["complete"])
+        self.assertAlmostEqual(lap["lap_time"], 10.0)
+        np.testing.assert_allclose(lap["sectors"], [4.0, 6.0])
+        self.assertFalse(expected[2]["complete"])
+
+    def test_save_load_and_truncate(self):
+        """
+        O índice salvo é relido com busca por número e pode ser limitado às linhas válidas.
+        """
+        with tempfile.TemporaryDirectory() as session_path:
+            self.build(50).finish().save(session_path)
+            index = LapIndex.load(session_path)
+        self.assertEqual(index.numbers(), [1, 2, 3])
+        self.assertEqual(index.get(2)["start"], 100)
+
+        truncated = index.truncated(150)
+        self.assertEqual(truncated.numbers(), [1, 2])
+        self.assertEqual(truncated.get(2)["stop"], 150)
+        self.assertFalse(truncated.get(2)["complete"])
+
+    def test_reopen_after_crash_with_lap_in_progress(self):
+        """
+        Se a gravação cair com uma volta em andamento, o índice salvo termina nessa
+        volta incompleta; ao reabrir, ela deve ser refeita uma única vez com o
+        trecho gravado depois do último índice.
+        """
+        with tempfile.TemporaryDirectory() as base_dir:
+            recorder = SessionRecorder(base_dir)
+            t = np.arange(400) * 0.1
+            laps = np.floor(t / 10) + 1
+            # O primeiro bloco fecha as voltas 1 a 3 (o índice é salvo com a volta 4 em andamento)
+            recorder.write_block(SampleBlock(t[:350], {"Volta": laps[:350]}))
+            recorder.write_block(SampleBlock(t[350:], {"Volta": laps[350:]}))
+            recorder.sync()  # Queda: close_files() nunca é chamado
+
+            snapshot = LapIndex.load(recorder.session_path)
+            self.assertEqual((snapshot.laps[-1]["lap"], snapshot.laps[-1]["stop"]), (4, 350))
+
+            reader = SessionReader(recorder.session_path)
+            self.assertEqual(reader.laps(), [(1, 0, 100), (2, 100, 200), (3, 200, 300), (4, 300, 400)])
+            self.assertFalse(reader.lap_info(4)["complete"])
+
+
+if __name__ == "__main__":
+    unittest.main()
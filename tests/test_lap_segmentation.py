@@ -0,0 +1,120 @@
+# tests/test_lap_segmentation.py
+
+import unittest
+import tempfile
+import numpy as np
+
+from data.lap_index import LapIndex, LapIndexBuilder
+from data.lap_segmentation import LapSegmenter, beacon_crossings
+from data.sample_block import SampleBlock
+from data.session_recorder import SessionRecorder
+from data.session_reader import SessionReader
+
+
+def circular_track(laps, rate=20.0, lap_time=30.0, radius=200.0):
+    """
+    Gera posições GPS de um carro em uma pista circular, começando meia volta
+    antes da linha de chegada (que fica no ponto mais ao sul do círculo).
+    """
+    t = np.arange(0, laps * lap_time, 1.0 / rate)
+    angle = 2 * np.pi * t / lap_time + np.pi / 2  # Começa no ponto mais ao norte
+    lat0, lon0 = -23.7, -46.7
+    meters_per_degree = 111195.0
+    lat = lat0 + radius * np.sin(angle) / meters_per_degree
+    lon = lon0 + radius * np.cos(angle) / (meters_per_degree * np.cos(np.radians(lat0)))
+    # Linha radial no ponto mais ao sul, de dentro para fora, cruzada de oeste para leste
+    line = [lat0 - 150 / meters_per_degree, lon0, lat0 - 250 / meters_per_degree, lon0]
+    return t, {"Latitude": lat, "Longitude": lon}, line
+
+
+class TestLapSegmentation(unittest.TestCase):
+    def test_beacon_rising_edges(self):
+        """
+        Apenas a borda de subida do beacon conta, e repiques próximos são descartados.
+        """
+        beacon = np.zeros(1000)
+        beacon[[100, 101, 102, 105, 400, 700]] = 1.0
+        np.testing.assert_array_equal(beacon_crossings(beacon), [100, 105, 400, 700])
+
+        t = np.arange(1000) * 0.1
+        index = LapSegmenter(min_lap_time=10.0).segment(t, {"Beacon": beacon})
+        self.assertEqual([(lap["lap"], lap["start"], lap["stop"]) for lap in index],
+                         [(1, 0, 100), (2, 100, 400), (3, 400, 700), (4, 700, 1000)])
+        self.assertEqual([lap["complete"] for lap in index], [False, True, True, False])
+        self.assertAlmostEqual(index.get(2)["lap_time"], 30.0)
+
+    def test_gps_line_crossing_interpolates_time(self):
+        """
+        No modo GPS o horário da passagem é interpolado entre as amostras.
+        """
+        t, channels, line = circular_track(5)
+        index = LapSegmenter(start_line=line).segment(t, channels)
+        self.assertEqual(len(index), 6)
+        np.testing.assert_allclose([lap["start_time"] for lap in index][1:], [15.0, 45.0, 75.0, 105.0, 135.0],
+                                   atol=1e-3)
+        np.testing.assert_allclose([lap["lap_time"] for lap in index if lap["complete"]], 30.0, atol=1e-3)
+
+    def test_incremental_matches_batch(self):
+        """
+        A detecção incremental (blocos do fluxo ao vivo) deve gerar as mesmas voltas
+        que a segmentação da sessão inteira, inclusive com passagens na emenda dos blocos.
+        """
+        t, channels, line = circular_track(4)
+        expected = [(lap["lap"], lap["start"]) for lap in LapSegmenter(start_line=line).segment(t, channels)]
+
+        builder = LapIndexBuilder(segmenter=LapSegmenter(start_line=line))
+        for start in range(0, len(t), 37):
+            stop = start + 37
+            builder.add_block(start, t[start:stop], {name: values[start:stop] for name, values in channels.items()})
+        self.assertEqual([(lap["lap"], lap["start"]) for lap in builder.finish()], expected)
+
+    def test_gps_dropout_across_the_line(self):
+        """
+        Uma falha do GPS (NaN) em cima da linha de chegada não pode juntar duas
+        voltas: a passagem é interpolada entre as amostras válidas em volta da
+        falha, inclusive quando a falha cai na emenda entre blocos.
+        """
+        t, channels, line = circular_track(4)
+        # Passagem em t = 45 s (linha 900); falha de 0,8 s em volta dela
+        for values in channels.values():
+            values[890:906] = np.nan
+        index = LapSegmenter(start_line=line).segment(t, channels)
+        self.assertEqual([(lap["lap"], lap["start"]) for lap in index],
+                         [(1, 0), (2, 300), (3, 906), (4, 1500), (5, 2100)])
+        self.assertAlmostEqual(index.get(3)["start_time"], 45.0, delta=0.05)
+
+        # Blocos de 7 amostras: a emenda na linha 896 cai no meio da falha (o bloco
+        # anterior termina em NaN); com 5, há blocos inteiros sem posição
+        for block_size in (7, 5):
+            builder = LapIndexBuilder(segmenter=LapSegmenter(start_line=line))
+            for start in range(0, len(t), block_size):
+                stop = start + block_size
+                builder.add_block(start, t[start:stop],
+                                  {name: values[start:stop] for name, values in channels.items()})
+            self.assertEqual([(lap["lap"], lap["start"]) for lap in builder.finish()],
+                             [(lap["lap"], lap["start"]) for lap in index])
+
+    def test_reopen_gps_session_after_crash(self):
+        """
+        Após uma queda, o trecho não indexado de uma sessão segmentada por GPS é
+        refeito com a mesma linha de chegada (gravada no meta.json), e não como
+        uma única volta.
+        """
+        t, channels, line = circular_track(4)
+        index = LapSegmenter(start_line=line).segment(t, channels)
+        expected = [(lap["lap"], lap["start"], lap["stop"]) for lap in index]
+        with tempfile.TemporaryDirectory() as base_dir:
+            recorder = SessionRecorder(base_dir, lap_segmenter=LapSegmenter(start_line=line))
+            recorder.write_block(SampleBlock(t[:1000], {name: values[:1000] for name, values in channels.items()}))
+            snapshot = LapIndex.load(recorder.session_path)  # Voltas 1 e 2 fechadas, volta 3 em andamento
+            recorder.write_block(SampleBlock(t[1000:], {name: values[1000:] for name, values in channels.items()}))
+            recorder.sync()  # Queda: close_files() nunca é chamado
+            # O índice gravado por último se perdeu na queda; só o anterior está no disco
+            snapshot.save(recorder.session_path)
+
+            reader = SessionReader(recorder.session_path)
+            self.assertEqual(reader.laps(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
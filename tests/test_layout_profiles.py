@@ -0,0 +1,66 @@
+# tests/test_layout_profiles.py
+
+import os
+import json
+import unittest
+import tempfile
+
+from gui.layout_profiles import (
+    DEFAULT_PROFILE, load_layout_profiles, save_layout_profiles, profile_positions, grid_size
+)
+
+
+class TestLayoutProfiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "graph_layout_config.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_legacy_layout_becomes_default_profile(self):
+        """
+        O arquivo no formato antigo (um único layout) deve ser lido como o perfil padrão.
+        """
+        legacy = {
+            "DHT - Temperatura": {"row": 0, "column": 0, "rowSpan": 1, "colSpan": 1},
+            "DHT - Umidade": {"row": 1, "column": 0, "rowSpan": 1, "colSpan": 1}
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+        profiles, active = load_layout_profiles(self.path)
+        self.assertEqual(active, DEFAULT_PROFILE)
+        self.assertEqual(profiles, {DEFAULT_PROFILE: legacy})
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({}, f)
+        self.assertEqual(load_layout_profiles(self.path), ({}, None))
+        self.assertEqual(load_layout_profiles(self.path + ".missing"), ({}, None))
+
+    def test_profiles_round_trip_and_positions(self):
+        """
+        Os perfis salvos devem ser lidos de volta com o perfil ativo, e as posições
+        saem na ordem da grade com o tamanho da grade considerando os spans.
+        """
+        profiles = {
+            "endurance": {
+                "Volante - Ângulo": {"row": 1, "column": 0, "rowSpan": 1, "colSpan": 2, "chartType": "bar"},
+                "DHT - Temperatura": {"row": 0, "column": 1, "bufferSize": 5000},
+                "DHT - Umidade": {"row": 0, "column": 0, "lineColor": "#00ff00"}
+            },
+            "acceleration": {"Volante - Ângulo": {"row": 0, "column": 0}}
+        }
+        save_layout_profiles(profiles, "endurance", self.path)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        loaded, active = load_layout_profiles(self.path)
+        self.assertEqual((loaded, active), (profiles, "endurance"))
+
+        positions = profile_positions(loaded["endurance"])
+        self.assertEqual([sensor for sensor, _ in positions],
+                         ["DHT - Umidade", "DHT - Temperatura", "Volante - Ângulo"])
+        self.assertEqual(positions[2][1], (1, 0, 1, 2))
+        self.assertEqual(grid_size(positions), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests/test_lod_pyramid.py
+
+import unittest
+import numpy as np
+
+from data.lod_pyramid import LodPyramid
+
+
+class TestLodPyramid(unittest.TestCase):
+    def setUp(self):
+        # 100 s a 1 kHz com um pico de uma única amostra e um trecho sem dados
+        self.x = np.arange(100_000) / 1000.0
+        self.y = np.sin(self.x)
+        self.y[54_321] = 50.0
+        self.y[10_000:10_500] = np.nan
+        self.pyramid = LodPyramid(self.x, self.y)
+
+    def test_peaks_survive_every_level(self):
+        """
+        O pico e o vale globais devem aparecer em todos os níveis da pirâmide.
+        """
+        self.assertGreater(len(self.pyramid.levels), 3)
+        for min_index, max_index in self.pyramid.levels:
+            self.assertIn(54_321, max_index)
+            self.assertEqual(np.nanmin(self.y[min_index]), np.nanmin(self.y))
+
+    def test_select_matches_view_resolution(self):
+        """
+        A seleção usa cerca de um balde por pixel, mantém as extremidades da série
+        e volta às amostras originais quando o zoom é grande.
+        """
+        x, y, level = self.pyramid.select(-np.inf, np.inf, 800)
+        self.assertGreater(level, 0)
+        self.assertLessEqual(len(x), 2 * 800 * self.pyramid.factor + 2)
+        self.assertEqual((x[0], x[-1]), (self.x[0], self.x[-1]))
+        self.assertEqual(np.nanmax(y), 50.0)
+        self.assertTrue(np.all(np.diff(x) >= 0))
+
+        x, y, level = self.pyramid.select(54.3, 54.4, 800)
+        self.assertEqual(level, 0)
+        self.assertLessEqual(x[0], 54.3)
+        self.assertGreaterEqual(x[-1], 54.4)
+        self.assertEqual(np.nanmax(y), 50.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
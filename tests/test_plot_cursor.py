@@ -0,0 +1,99 @@
+# tests/test_plot_cursor.py
+
+import unittest
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import QPointF, QRectF
+
+from gui.comparison_view import PlotMixin
+
+
+class FakeCurve:
+    def __init__(self, x_data, y_data, visible=True):
+        self.x_data = x_data
+        self.y_data = y_data
+        self.visible = visible
+
+    def isVisible(self):
+        return self.visible
+
+
+class FakeViewBox:
+    def mapSceneToView(self, pos):
+        return pos
+
+
+class FakePlotItem:
+    vb = FakeViewBox()
+
+
+class FakePlotWidget:
+    plotItem = FakePlotItem()
+
+    def sceneBoundingRect(self):
+        return QRectF(0, 0, 10, 10)
+
+
+class FakeLabel:
+    def __init__(self):
+        self.label_text = ""
+
+    def text(self):
+        return self.label_text
+
+    def setText(self, text):
+        self.label_text = text
+
+
+class TestPlotCursor(unittest.TestCase):
+    def test_matches_linear_interpolation(self):
+        """
+        A busca binária deve dar o mesmo resultado que a interpolação linear do NumPy.
+        """
+        x_data = np.sort(np.random.default_rng(1).uniform(0, 100, 5000))
+        y_data = np.sin(x_data)
+        curve = FakeCurve(x_data, y_data)
+        mixin = PlotMixin()
+        for x in [x_data[0], 3.3, 50.0, 99.0, x_data[-1]]:
+            self.assertAlmostEqual(mixin.get_y_at_x(curve, x), np.interp(x, x_data, y_data))
+        self.assertIsNone(mixin.get_y_at_x(curve, x_data[-1] + 1))
+        self.assertIsNone(mixin.get_y_at_x(curve, -1))
+
+    def test_batch_groups_shared_x(self):
+        """
+        Curvas com o mesmo x são avaliadas juntas; curvas ocultas ou sem valor retornam None.
+        """
+        x_data = np.linspace(0, 10, 11)
+        curves = {
+            "a": FakeCurve(x_data, x_data * 2),
+            "b": FakeCurve(x_data, x_data + 1),
+            "c": FakeCurve(x_data, np.full(11, np.nan)),
+            "d": FakeCurve(x_data, x_data, visible=False),
+            "e": FakeCurve(np.array([20.0, 30.0]), np.array([0.0, 1.0])),
+        }
+        values = PlotMixin().get_y_at_x_batch(curves, 2.5)
+        self.assertEqual(values, {"a": 5.0, "b": 3.5, "c": None, "d": None, "e": None})
+
+    def test_cursor_line_hidden_outside_plot(self):
+        """
+        Fora da área do gráfico a linha do cursor é ocultada (sem erro) e as
+        legendas são resetadas; ao voltar, a linha reaparece na posição do mouse.
+        """
+        mixin = PlotMixin()
+        mixin.plot_widget = FakePlotWidget()
+        mixin.vLine = pg.InfiniteLine(angle=90, movable=False)
+        mixin.curves = {"a": FakeCurve(np.linspace(0, 10, 11), np.linspace(0, 10, 11))}
+        mixin.legend_labels = {"a": FakeLabel()}
+        mixin.legend_text = lambda key, x, value: f"{key}: {value}"
+
+        mixin.on_mouse_moved((QPointF(20, 5),))
+        self.assertFalse(mixin.vLine.isVisible())
+        self.assertEqual(mixin.legend_labels["a"].text(), "a: None")
+
+        mixin.on_mouse_moved((QPointF(4, 5),))
+        self.assertTrue(mixin.vLine.isVisible())
+        self.assertEqual(mixin.vLine.value(), 4)
+        self.assertEqual(mixin.legend_labels["a"].text(), "a: 4.0")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_processing_stages.py
+
+import unittest
+import numpy as np
+from data.sample_block import SampleBlock
+from data.processing_stages import (
+    UnitConversion, Calibration, MovingAverage, MedianFilter, Decimation, DerivedChannel, build_stages
+)
+
+
+def make_block(**channels):
+    size = len(next(iter(channels.values())))
+    return SampleBlock(np.arange(size, dtype=float), channels)
+
+
+class TestProcessingStages(unittest.TestCase):
+    def test_unit_conversion_and_calibration(self):
+        """
+        Verifica a conversão linear e o polinômio de calibração.
+        """
+        block = make_block(temp=np.array([0.0, 100.0]))
+        UnitConversion("temp", scale=1.8, offset=32.0, target="temp_f").process(block)
+        np.testing.assert_allclose(block.channels["temp_f"], [32.0, 212.0])
+
+        Calibration("temp", [2.0, 0.0, 1.0]).process(block)  # 2x² + 1
+        np.testing.assert_allclose(block.channels["temp"], [1.0, 20001.0])
+
+    def test_filters_are_continuous_across_blocks(self):
+        """
+        Filtrar em dois blocos deve dar o mesmo resultado que filtrar tudo de uma vez.
+        """
+        signal = np.array([1.0, 5.0, 2.0, 8.0, 3.0, 9.0, 4.0])
+        for stage_class in (MovingAverage, MedianFilter):
+            whole = stage_class("a", 3).process(make_block(a=signal)).channels["a"]
+            stage = stage_class("a", 3)
+            first = stage.process(make_block(a=signal[:3])).channels["a"]
+            second = stage.process(make_block(a=signal[3:])).channels["a"]
+            np.testing.assert_allclose(np.concatenate((first, second)), whole)
+
+        np.testing.assert_allclose(MovingAverage("a", 2).process(make_block(a=signal[:3])).channels["a"],
+                                   [1.0, 3.0, 3.5])
+
+    def test_moving_average_ignores_missing_samples(self):
+        """
+        Um NaN no meio do bloco ou na emenda entre blocos só fica de fora da sua
+        janela, sem contaminar as saídas seguintes.
+        """
+        signal = np.array([0.0, 1.0, np.nan, 3.0, 4.0, 5.0, 6.0])
+        expected = [0.0, 0.5, 0.5, 2.0, 3.5, 4.0, 5.0]
+        result = MovingAverage("a", 3).process(make_block(a=signal)).channels["a"]
+        np.testing.assert_allclose(result, expected)
+
+        # NaN na última amostra do primeiro bloco, carregado no histórico
+        stage = MovingAverage("a", 3)
+        first = stage.process(make_block(a=signal[:3])).channels["a"]
+        second = stage.process(make_block(a=signal[3:])).channels["a"]
+        np.testing.assert_allclose(np.concatenate((first, second)), expected)
+
+        # Janela inteira sem dados resulta em NaN
+        result = MovingAverage("a", 2).process(make_block(a=np.array([1.0, np.nan, np.nan, 2.0]))).channels["a"]
+        np.testing.assert_allclose(result, [1.0, 1.0, np.nan, 2.0])
+
+    def test_median_filter_ignores_missing_samples(self):
+        """
+        O filtro de mediana também ignora amostras ausentes, no meio do bloco, na
+        emenda entre blocos e na primeira amostra (que inicia o histórico).
+        """
+        signal = np.array([1.0, 9.0, np.nan, 3.0, 5.0, 4.0, 7.0])
+        expected = [1.0, 1.0, 5.0, 6.0, 4.0, 4.0, 5.0]
+        result = MedianFilter("a", 3).process(make_block(a=signal)).channels["a"]
+        np.testing.assert_allclose(result, expected)
+
+        # NaN na última amostra do primeiro bloco, carregado no histórico
+        stage = MedianFilter("a", 3)
+        first = stage.process(make_block(a=signal[:3])).channels["a"]
+        second = stage.process(make_block(a=signal[3:])).channels["a"]
+        np.testing.assert_allclose(np.concatenate((first, second)), expected)
+
+        # Histórico iniciado pela primeira amostra válida (2.0), repetida como no
+        # início sem falhas; janela inteira sem dados resulta em NaN
+        stage = MedianFilter("a", 2)
+        np.testing.assert_allclose(stage.process(make_block(a=np.array([np.nan]))).channels["a"], [np.nan])
+        result = stage.process(make_block(a=np.array([np.nan, 2.0, np.nan, np.nan, 4.0]))).channels["a"]
+        np.testing.assert_allclose(result, [2.0, 2.0, 2.0, np.nan, 4.0])
+
+    def test_decimation_keeps_phase_across_blocks(self):
+        """
+        A decimação em blocos deve manter as mesmas amostras que a decimação do sinal inteiro.
+        """
+        stage = Decimation(3)
+        kept = [stage.process(make_block(a=np.arange(start, stop, dtype=float))).channels["a"]
+                for start, stop in ((0, 4), (4, 9), (9, 10))]
+        np.testing.assert_array_equal(np.concatenate(kept), [0, 3, 6, 9])
+
+    def test_derived_channel_from_config(self):
+        """
+        Canais derivados configurados por expressão usam os canais de entrada.
+        """
+        stages = build_stages([
+            {"type": "derived", "name": "Potência", "inputs": {"v": "Tensão", "i": "Corrente"},
+             "expression": "v * i"},
+            {"type": "inexistente"},
+        ])
+        self.assertEqual(len(stages), 1)
+        block = stages[0].process(make_block(**{"Tensão": np.array([400.0]), "Corrente": np.array([2.0])}))
+        np.testing.assert_allclose(block.channels["Potência"], [800.0])
+
+        block = DerivedChannel("x", {"a": "ausente"}, function=lambda a: a).process(make_block(b=np.ones(2)))
+        self.assertNotIn("x", block.channels)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# tests/test_ring_buffer.py
+
+import unittest
+import numpy as np
+from data.ring_buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_append_keeps_last_samples_in_order(self):
+        """
+        Verifica se o buffer mantém apenas as últimas amostras, em ordem cronológica.
+        """
+        buffer = RingBuffer(capacity=5, columns=2)
+        for i in range(12):
+            buffer.append(i, i * 10)
+
+        x, y = buffer.view()
+        self.assertEqual(len(buffer), 5)
+        np.testing.assert_array_equal(x, [7, 8, 9, 10, 11])
+        np.testing.assert_array_equal(y, [70, 80, 90, 100, 110])
+
+    def test_extend_wraps_and_truncates(self):
+        """
+        Verifica a escrita em bloco, inclusive quando o bloco dá a volta no buffer
+        ou é maior que a capacidade.
+        """
+        buffer = RingBuffer(capacity=4, columns=1)
+        buffer.extend(np.arange(3))
+        buffer.extend(np.arange(3, 6))
+        np.testing.assert_array_equal(buffer.view()[0], [2, 3, 4, 5])
+
+        buffer.extend(np.arange(100, 110))
+        np.testing.assert_array_equal(buffer.view()[0], [106, 107, 108, 109])
+        np.testing.assert_array_equal(buffer.view(last=2)[0], [108, 109])
+
+    def test_view_is_contiguous_without_copy(self):
+        """
+        As visões devem ser contíguas e compartilhar memória com o buffer.
+        """
+        buffer = RingBuffer(capacity=8, columns=2)
+        buffer.extend(np.arange(11), np.arange(11))
+        x, _ = buffer.view()
+        self.assertTrue(x.flags['C_CONTIGUOUS'])
+        self.assertTrue(np.shares_memory(x, buffer._data))
+        self.assertFalse(x.flags.writeable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+# tests/test_sample_block.py
+
+import unittest
+import numpy as np
+from data.sample_block import SampleBlock, parse_batch_payload
+
+
+class TestSampleBlock(unittest.TestCase):
+    def test_from_records_builds_columns(self):
+        """
+        Verifica a conversão de amostras em colunas, preenchendo canais ausentes com NaN.
+        """
+        records = [
+            {"timestamp": 1.0, "seq": 10, "DHT - Temperatura": 25.0, "DHT - Umidade": 40.0},
+            {"timestamp": 1.1, "seq": 11, "DHT - Temperatura": 25.5},
+        ]
+        block = SampleBlock.from_records(records)
+        self.assertEqual(len(block), 2)
+        np.testing.assert_array_equal(block.timestamps, [1.0, 1.1])
+        np.testing.assert_array_equal(block.sequence, [10, 11])
+        np.testing.assert_array_equal(block.channels["DHT - Temperatura"], [25.0, 25.5])
+        self.assertTrue(np.isnan(block.channels["DHT - Umidade"][1]))
+        self.assertNotIn("timestamp", block.channels)
+
+    def test_parse_batch_payload_cursor(self):
+        """
+        O cursor vem do payload ou, na falta dele, do último número de sequência.
+        """
+        block, cursor = parse_batch_payload({"cursor": 42, "samples": [{"timestamp": 0.0, "a": 1}]})
+        self.assertEqual(cursor, 42)
+        self.assertEqual(len(block), 1)
+
+        block, cursor = parse_batch_payload([{"seq": 5, "a": 1}, {"seq": 6, "a": 2}], received_at=3.0)
+        self.assertEqual(cursor, 6)
+        np.testing.assert_array_equal(block.timestamps, [3.0, 3.0])
+
+        block, cursor = parse_batch_payload({"samples": []})
+        self.assertEqual(len(block), 0)
+        self.assertIsNone(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
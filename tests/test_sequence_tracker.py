@@ -0,0 +1,50 @@
+# tests/test_sequence_tracker.py
+
+import unittest
+import numpy as np
+from data.sample_block import SampleBlock
+from data.sequence_tracker import SequenceTracker
+
+
+def make_block(sequence):
+    sequence = np.asarray(sequence)
+    return SampleBlock(sequence * 0.1, {"a": sequence * 1.0}, sequence)
+
+
+class TestSequenceTracker(unittest.TestCase):
+    def test_detects_gaps_and_duplicates(self):
+        """
+        Verifica a contagem de lacunas e o descarte de duplicatas entre blocos.
+        """
+        tracker = SequenceTracker()
+        block = tracker.filter(make_block([1, 2, 3]))
+        self.assertEqual(len(block), 3)
+
+        block = tracker.filter(make_block([3, 4, 7, 6, 8]))
+        np.testing.assert_array_equal(block.sequence, [4, 7, 8])
+        np.testing.assert_array_equal(block.channels["a"], [4.0, 7.0, 8.0])
+        self.assertEqual(tracker.duplicates, 2)
+        self.assertEqual(tracker.gaps, 1)
+        self.assertEqual(tracker.missing, 2)
+
+    def test_counter_reset(self):
+        """
+        Uma queda grande na sequência é tratada como reinício do contador no carro.
+        """
+        tracker = SequenceTracker(reset_window=10)
+        tracker.filter(make_block([500, 501]))
+        block = tracker.filter(make_block([0, 1]))
+        self.assertEqual(len(block), 2)
+        self.assertEqual(tracker.resets, 1)
+        self.assertEqual(tracker.duplicates, 0)
+
+    def test_latency_per_sample(self):
+        """
+        A latência por amostra é a diferença entre a chegada e o horário do carro.
+        """
+        block = SampleBlock.from_records([{"timestamp": 1.0, "received_at": 1.25, "a": 0.0}])
+        np.testing.assert_allclose(block.latency, [0.25])
+
+
+if __name__ == "__main__":
+    unittest.main()
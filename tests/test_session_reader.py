@@ -0,0 +1,54 @@
+# tests/test_session_reader.py
+
+import unittest
+import os
+import tempfile
+import numpy as np
+
+from data.sample_block import SampleBlock
+from data.session_recorder import SessionRecorder
+from data.session_reader import SessionReader
+
+
+class TestSessionReader(unittest.TestCase):
+    def setUp(self):
+        """
+        Grava uma sessão de 3 voltas de 10 s (10 Hz) sem iniciar a thread do gravador.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        recorder = SessionRecorder(self.temp_dir.name)
+        t = np.arange(300) * 0.1
+        recorder.write_block(SampleBlock(t, {"Volta": np.floor(t / 10) + 1, "a": np.arange(300.0)},
+                                         np.arange(300)))
+        recorder.close_files()
+        self.session_path = recorder.session_path
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_laps_and_lap_channel(self):
+        """
+        As voltas vêm do canal de voltas e cada volta é lida com o tempo relativo ao seu início.
+        """
+        reader = SessionReader(self.session_path)
+        self.assertEqual(reader.laps(), [(1, 0, 100), (2, 100, 200), (3, 200, 300)])
+        time_data, values = reader.lap_channel(2, "a")
+        self.assertIsInstance(reader.column("a"), np.memmap)
+        np.testing.assert_allclose(time_data[[0, -1]], [0.0, 9.9])
+        np.testing.assert_allclose(values[[0, -1]], [100.0, 199.0])
+        self.assertIsNone(reader.lap_channel(9, "a"))
+
+    def test_truncated_column_after_crash(self):
+        """
+        Se uma coluna ficou mais curta (queda durante a gravação), vale o menor tamanho.
+        """
+        column_path = os.path.join(self.session_path, "ch_001.f8")
+        with open(column_path, "r+b") as f:
+            f.truncate(250 * 8 + 3)
+        reader = SessionReader(self.session_path)
+        self.assertEqual(reader.row_count, 250)
+        self.assertEqual(reader.laps()[-1], (3, 200, 250))
+
+
+if __name__ == "__main__":
+    unittest.main()
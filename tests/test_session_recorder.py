@@ -0,0 +1,59 @@
+# tests/test_session_recorder.py
+
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+from PySide6.QtCore import QCoreApplication
+
+from data.sample_block import SampleBlock
+from data.session_recorder import SessionRecorder
+from data import session_format
+
+
+class TestSessionRecorder(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.recorder = SessionRecorder(self.temp_dir.name, flush_interval=0.05, fsync_interval=0.1)
+
+    def tearDown(self):
+        self.recorder.stop()
+        self.temp_dir.cleanup()
+
+    def read_column(self, info):
+        return np.fromfile(os.path.join(self.recorder.session_path, info["file"]), dtype=info["dtype"])
+
+    def test_records_columns_and_pads_new_channels(self):
+        """
+        Amostras e blocos devem ser gravados em colunas; um canal que aparece depois
+        é preenchido com NaN nas linhas anteriores.
+        """
+        self.recorder.start()
+        self.recorder.record_data({"seq": 1, "timestamp": 10.0, "received_at": 10.5, "a": 1.0})
+        self.recorder.record_data({"seq": 2, "timestamp": 10.1, "a": 2.0})
+        self.recorder.record_block(SampleBlock([10.2, 10.3], {"a": [3.0, 4.0], "b": [7.0, 8.0]}, [3, 4]))
+        self.recorder.stop()
+
+        meta = session_format.read_meta(self.recorder.session_path)
+        self.assertEqual(list(meta["channels"]), ["a", "b"])
+        np.testing.assert_allclose(self.read_column(meta["columns"]["timestamp"]), [10.0, 10.1, 10.2, 10.3])
+        np.testing.assert_array_equal(self.read_column(meta["columns"]["seq"]), [1, 2, 3, 4])
+        np.testing.assert_allclose(self.read_column(meta["channels"]["a"]), [1.0, 2.0, 3.0, 4.0])
+        b = self.read_column(meta["channels"]["b"])
+        self.assertTrue(np.isnan(b[:2]).all())
+        np.testing.assert_allclose(b[2:], [7.0, 8.0])
+
+    def test_no_session_without_data(self):
+        """
+        Nenhum diretório de sessão deve ser criado se nada for recebido.
+        """
+        self.recorder.start()
+        self.recorder.stop()
+        self.assertIsNone(self.recorder.session_path)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()